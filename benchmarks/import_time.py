@@ -0,0 +1,111 @@
+"""
+Import-time benchmark for the solver entry points.
+
+Usage (from project root):
+
+    python -m benchmarks.import_time [--repeat N]
+
+Every sample runs a snippet in a fresh interpreter and times it from
+outside. Reported times are the median over `repeat` runs minus the
+median of an empty interpreter, so they are what the snippet itself
+adds to start-up. Cases marked with a budget fail the run (exit code 1)
+when they exceed it, and every case lists the heavy optional modules
+(NumPy, matplotlib) it ended up importing.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+HEAVY = ("numpy", "matplotlib")
+
+# name -> (snippet, budget in ms or None)
+CASES: Dict[str, Tuple[str, Optional[float]]] = {
+    "bare solve (IDDFS)": (
+        "from src.cube.cube_state import CubeState\n"
+        "from src.cube.move_generator import apply_move_sequence\n"
+        "from src.solvers import IDDFSSolver\n"
+        "cube = CubeState.solved()\n"
+        "apply_move_sequence(cube, ['R', 'U'])\n"
+        "IDDFSSolver(max_depth=4).solve(cube)\n",
+        100.0,
+    ),
+    "bare solve (IDA*)": (
+        "from src.cube import CubeState, apply_move_sequence\n"
+        "from src.solvers import IDAStarSolver\n"
+        "cube = CubeState.solved()\n"
+        "apply_move_sequence(cube, ['R', 'U'])\n"
+        "IDAStarSolver(heuristic=lambda s: 0, tt_bytes=1 << 16).solve(cube)\n",
+        100.0,
+    ),
+    "import src": ("import src", 100.0),
+    "import src.solvers": ("import src.solvers", 100.0),
+    "import src.visualization": ("import src.visualization", 100.0),
+    "import src.heuristics": ("import src.heuristics", None),
+    "korf_heuristic()": (
+        "from src.heuristics.combined import korf_heuristic\nkorf_heuristic()",
+        None,
+    ),
+    "import demos.demo": ("import demos.demo", None),
+}
+
+_REPORT = "\nimport json, sys\nprint(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+
+
+def _sample(code: str) -> Tuple[float, List[str]]:
+    """(wall time in ms, heavy modules imported) of one fresh run."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [os.getcwd(), env.get("PYTHONPATH")])
+    )
+    t0 = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", code + _REPORT.format(heavy=HEAVY)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    elapsed = (time.perf_counter() - t0) * 1000
+    return elapsed, json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(code: str, repeat: int) -> Tuple[float, List[str]]:
+    samples = [_sample(code) for _ in range(repeat)]
+    return statistics.median(t for t, _ in samples), samples[-1][1]
+
+
+def run_benchmark(repeat: int = 7) -> bool:
+    baseline, _ = measure("pass", repeat)
+    print(f"Interpreter start-up: {baseline:.1f} ms (subtracted below)\n")
+    print(f"{'case':28s} {'ms':>8s} {'budget':>8s}  heavy imports")
+    ok = True
+    for name, (code, budget) in CASES.items():
+        elapsed, heavy = measure(code, repeat)
+        elapsed -= baseline
+        over = budget is not None and elapsed > budget
+        ok &= not over
+        print(
+            f"{name:28s} {elapsed:8.1f} "
+            f"{'-' if budget is None else f'{budget:.0f}':>8s}  "
+            f"{', '.join(heavy) or '-'}{'  OVER BUDGET' if over else ''}"
+        )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    sys.exit(0 if run_benchmark(args.repeat) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Micro-benchmarks of the cube primitives.
+
+Usage (from project root):
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --repr packed --filter apply_move
+    python -m benchmarks.micro --target-ms 50 --repeat 11 -o micro.json
+
+Every case is one primitive: `apply_move` per move type (each type is
+cycled over the six faces), `copy`, `to_string`, `hash`, `is_solved`,
+`EdgeOrientPDB.encode`, the `h()` of every heuristic, and
+`is_redundant`. State cases run once per registered state
+representation (`REPRESENTATIONS`: the mutable `CubeState`, the packed
+bytes state and the cubie-level cube); a representation that lacks a
+primitive simply skips that case. Register a new engine with
+`register_representation` and the same cases measure it too.
+
+Timing is calibrated like `timeit`'s autorange: the number of loops per
+sample grows (at least doubling) until a sample takes `target_ms`, then
+`repeat` samples are taken. Reported ns/op is per primitive call (loop
+overhead included), as median with standard deviation and coefficient
+of variation across samples. Every case gets its own freshly scrambled
+state, so in-place moves never leak into the cases measured after them.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import statistics
+import timeit
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.cube.cube_state import CubeState
+from src.cube.cubie import CubieCube
+from src.cube.move_generator import apply_move
+from src.cube.packed_state import PackedCubeState
+from src.utils.move_pruning import is_redundant
+
+
+# Applied to solved to get the state measured by every case.
+SCRAMBLE = "R U F' L2 D B' R2 U' F D2 L B2"
+
+MOVE_TYPES: Dict[str, List[str]] = {
+    "cw": ["U", "R", "F", "D", "L", "B"],
+    "ccw": ["U'", "R'", "F'", "D'", "L'", "B'"],
+    "half": ["U2", "R2", "F2", "D2", "L2", "B2"],
+}
+
+
+@dataclass(frozen=True)
+class Representation:
+    solved: Callable[[], Any]
+    # (state, move) -> resulting state; may mutate and return `state`.
+    apply_move: Callable[[Any, str], Any]
+
+
+def _apply_in_place(state: CubeState, move: str) -> CubeState:
+    apply_move(state, move)
+    return state
+
+
+REPRESENTATIONS: Dict[str, Representation] = {
+    "cube_state": Representation(CubeState.solved, _apply_in_place),
+    "packed": Representation(PackedCubeState.solved, PackedCubeState.moved),
+    "cubie": Representation(CubieCube.solved, CubieCube.moved),
+}
+
+
+def register_representation(
+    name: str, solved: Callable[[], Any], apply: Callable[[Any, str], Any]
+) -> None:
+    """Measure another state engine with the same cases."""
+    REPRESENTATIONS[name] = Representation(solved, apply)
+
+
+@dataclass
+class Case:
+    name: str
+    stmt: str
+    namespace: Dict[str, Any]
+    setup: str = "pass"
+    # Primitive calls per execution of `stmt`.
+    ops: int = 1
+
+
+@dataclass
+class Result:
+    case: str
+    representation: Optional[str]
+    ns_per_op: float
+    stdev_ns: float
+    min_ns: float
+    loops: int
+    samples: List[float] = field(repr=False, default_factory=list)
+
+    @property
+    def cv(self) -> float:
+        return self.stdev_ns / self.ns_per_op if self.ns_per_op else 0.0
+
+
+def _heuristics() -> Dict[str, Callable[[Any], int]]:
+    from src.heuristics.combined import korf_heuristic
+    from src.heuristics.corner_orient_pdb import CornerOrientPDB
+    from src.heuristics.corner_pdb import CornerPDB
+    from src.heuristics.corner_perm_pdb import CornerPermPDB
+    from src.heuristics.edge_orient_pdb import EdgeOrientPDB
+    from src.heuristics.edge_subset_pdb import EdgeSubsetPDB
+
+    found: Dict[str, Callable[[Any], int]] = {}
+    for pdb in (
+        CornerOrientPDB(),
+        CornerPermPDB(),
+        EdgeOrientPDB(),
+        CornerPDB(),
+        EdgeSubsetPDB(),
+    ):
+        name = type(pdb).__name__
+        if getattr(pdb, "db_path", None) is not None and not pdb.loaded:
+            name += " (fallback)"
+        found[name] = pdb.h
+    found["korf_heuristic"] = korf_heuristic()
+    return found
+
+
+def state_cases(rep: Representation) -> List[Case]:
+    """Cases measuring one representation."""
+
+    def ns(**extra: Any) -> Dict[str, Any]:
+        # A state of its own per case: apply_move may mutate it.
+        start = rep.solved()
+        for m in SCRAMBLE.split():
+            start = rep.apply_move(start, m)
+        return dict(extra, start=start, apply=rep.apply_move)
+
+    cases = []
+    for kind, moves in MOVE_TYPES.items():
+        cases.append(
+            Case(
+                f"apply_move/{kind}",
+                "for m in moves: s = apply(s, m)",
+                ns(moves=moves),
+                setup="s = start",
+                ops=len(moves),
+            )
+        )
+    sample = rep.solved()
+    for method, stmt in (
+        ("copy", "start.copy()"),
+        ("to_string", "start.to_string()"),
+        ("is_solved", "start.is_solved()"),
+    ):
+        if hasattr(sample, method):
+            cases.append(Case(method, stmt, ns()))
+    if type(sample).__hash__ is not None:
+        cases.append(Case("hash", "hash(start)", ns()))
+
+    if hasattr(sample, "to_string"):
+        from src.heuristics.edge_orient_pdb import EdgeOrientPDB
+
+        encode = EdgeOrientPDB().encode
+        cases.append(Case("EdgeOrientPDB.encode", "encode(start)", ns(encode=encode)))
+        for hname, h in _heuristics().items():
+            cases.append(Case(f"h/{hname}", "h(start)", ns(h=h)))
+    return cases
+
+
+def global_cases() -> List[Case]:
+    """Cases that do not depend on the state representation."""
+    pairs = [("R", "R2"), ("R", "L"), ("L", "R"), ("U", "F")]
+    return [
+        Case(
+            "is_redundant",
+            "for a, b in pairs: is_redundant(a, b)",
+            {"pairs": pairs, "is_redundant": is_redundant},
+            ops=len(pairs),
+        )
+    ]
+
+
+def measure(
+    case: Case,
+    representation: Optional[str] = None,
+    target_ms: float = 20.0,
+    repeat: int = 7,
+) -> Result:
+    timer = timeit.Timer(case.stmt, setup=case.setup, globals=case.namespace)
+    target = target_ms / 1000
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= target:
+            break
+        # Jump close to the target, but at least double.
+        guess = int(loops * target / elapsed) if elapsed > 0 else loops * 10
+        loops = max(2 * loops, min(guess, 10 * loops))
+
+    per_op = [t / (loops * case.ops) * 1e9 for t in timer.repeat(repeat, loops)]
+    return Result(
+        case=case.name,
+        representation=representation,
+        ns_per_op=statistics.median(per_op),
+        stdev_ns=statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        min_ns=min(per_op),
+        loops=loops,
+        samples=per_op,
+    )
+
+
+def run(
+    representations: Optional[Sequence[str]] = None,
+    name_filter: str = "",
+    target_ms: float = 20.0,
+    repeat: int = 7,
+    verbose: bool = True,
+) -> List[Result]:
+    plan = [(None, c) for c in global_cases()]
+    for rep_name in representations or REPRESENTATIONS:
+        plan += [(rep_name, c) for c in state_cases(REPRESENTATIONS[rep_name])]
+
+    results = []
+    if verbose:
+        print(f"{'case':36s} {'repr':12s} {'ns/op':>10s} {'stdev':>9s} {'cv':>6s}")
+    for rep_name, case in plan:
+        if name_filter not in case.name:
+            continue
+        r = measure(case, rep_name, target_ms=target_ms, repeat=repeat)
+        results.append(r)
+        if verbose:
+            print(
+                f"{r.case:36s} {rep_name or '-':12s} {r.ns_per_op:10.1f} "
+                f"{r.stdev_ns:9.1f} {r.cv:6.1%}"
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repr", help="comma-separated representations (default: all)")
+    parser.add_argument("--filter", default="", help="only cases containing this")
+    parser.add_argument("--target-ms", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    results = run(
+        representations=args.repr.split(",") if args.repr else None,
+        name_filter=args.filter,
+        target_ms=args.target_ms,
+        repeat=args.repeat,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,28 +3,35 @@ Simple performance test harness.
 
 Usage:
     python -m benchmarks.performance_tests
+
+Solves the first scrambles of one depth bucket of the fixed benchmark
+corpus (see `benchmarks.suite`, which runs every solver and records
+percentiles), so the numbers are comparable between runs.
 """
 
 from __future__ import annotations
 import time
 from typing import List
 from src.cube.cube_state import CubeState
-from src.cube.scrambler import apply_random_scramble
+from src.cube.move_generator import apply_move_sequence
 from src.solvers.ida_star_solver import IDAStarSolver
-from src.heuristics.corner_perm_pdb import CornerPermPDB
+from src.heuristics.combined import korf_heuristic
 from src.utils.validator import validate_solution
 
+from benchmarks.suite import load_corpus
+
 
 def run_benchmark(num_scrambles: int = 5, scramble_length: int = 8) -> None:
-    heuristic = CornerPermPDB()
-    solver = IDAStarSolver(heuristic=heuristic.h, max_depth=30)
+    heuristic = korf_heuristic()
+    solver = IDAStarSolver(heuristic=heuristic, max_depth=30)
+    scrambles = load_corpus()["buckets"][str(scramble_length)][:num_scrambles]
 
     times: List[float] = []
     lengths: List[int] = []
 
-    for i in range(num_scrambles):
+    for i, scramble in enumerate(scrambles):
         cube = CubeState.solved()
-        apply_random_scramble(cube, length=scramble_length)
+        apply_move_sequence(cube, scramble.split())
 
         start = time.time()
         solution = solver.solve(cube)
@@ -0,0 +1,511 @@
+"""
+Reproducible end-to-end solver benchmarks.
+
+Usage (from project root):
+
+    # Run every registered combination on the committed corpus
+    python -m benchmarks.suite run -o results.json
+
+    # Only some combinations / depths, 3 scrambles per bucket
+    python -m benchmarks.suite run --solvers ida/korf,two_phase --depths 6,8 --limit 3
+
+    # Profile the timed solves of each combination into profiles/
+    # (<combo>.prof for snakeviz, .folded for flame graphs, see
+    # src.utils.profiling); timings of a profiled run are not comparable
+    python -m benchmarks.suite run --solvers ida/korf --limit 3 --profile profiles
+
+    # Compare two result files; exit code 1 on regressions beyond 10%
+    python -m benchmarks.suite compare old.json new.json --threshold 0.1
+
+    # Write a new corpus version (never edit a published one)
+    python -m benchmarks.suite corpus --version 2 --seed 7
+
+Scrambles come from a fixed, versioned corpus under benchmarks/corpora:
+for every depth bucket, a list of scrambles (move strings) of exactly
+that many moves with no redundant consecutive moves, generated once
+from a seed and then committed, so every run solves the same cubes. A
+bucket's depth is the scramble length, an upper bound on the optimal
+distance.
+
+Every combination in `COMBOS` (a solver plus, for IDA*, its heuristic)
+runs all buckets up to its own `max_depth`, after one untimed warm-up
+solve that loads its tables. Per solve we record wall time, nodes
+expanded over the whole solve (`solver.stats.nodes`, every deepening
+iteration included), nodes per second, peak RSS (reset before each
+solve where /proc/self/clear_refs allows it, otherwise the process
+high-water mark) and solution length; the JSON output keeps percentiles
+of each per bucket together with the corpus checksum and the
+environment.
+"""
+
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.cube.cube_state import CubeState
+from src.cube.move_generator import apply_move_sequence
+from src.solvers.base_solver import BaseSolver
+from src.solvers.batch import iter_solve_many
+from src.utils.move_pruning import ALLOWED_AFTER
+from src.utils.profiling import SolveProfiler
+from src.utils.validator import validate_solution
+
+
+# 2: "nodes" is the whole solve (every iteration), not the last one.
+RESULTS_VERSION = 2
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpora")
+DEFAULT_CORPUS = os.path.join(CORPUS_DIR, "scrambles_v1.json")
+DEFAULT_DEPTHS = (4, 6, 8, 10, 12, 16, 20)
+
+
+# ---------------------------------------------------------------------------
+# Corpora
+
+
+def generate_corpus(
+    version: int,
+    seed: int,
+    depths: Sequence[int] = DEFAULT_DEPTHS,
+    per_bucket: int = 10,
+) -> Dict:
+    rng = random.Random(seed)
+    buckets: Dict[str, List[str]] = {}
+    for depth in depths:
+        scrambles = []
+        for _ in range(per_bucket):
+            moves: List[str] = []
+            while len(moves) < depth:
+                moves.append(rng.choice(ALLOWED_AFTER[moves[-1] if moves else None]))
+            scrambles.append(" ".join(moves))
+        buckets[str(depth)] = scrambles
+    return {"version": version, "seed": seed, "buckets": buckets}
+
+
+def corpus_checksum(corpus: Dict) -> str:
+    blob = json.dumps(corpus["buckets"], sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def load_corpus(path: str = DEFAULT_CORPUS) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+# ---------------------------------------------------------------------------
+# Solver / heuristic combinations
+
+
+@dataclass(frozen=True)
+class Combo:
+    factory: Callable[[], BaseSolver]
+    # Deepest bucket worth running (deeper ones would only time out).
+    max_depth: int
+
+
+def _iddfs() -> BaseSolver:
+    from src.solvers.iddfs_solver import IDDFSSolver
+
+    return IDDFSSolver(max_depth=8)
+
+
+def _ida_edge_orient() -> BaseSolver:
+    from src.heuristics.edge_orient_pdb import EdgeOrientPDB
+    from src.solvers.ida_star_solver import IDAStarSolver
+
+    return IDAStarSolver(heuristic=EdgeOrientPDB().h, max_depth=20)
+
+
+def _ida_korf() -> BaseSolver:
+    from src.heuristics.combined import korf_heuristic
+    from src.solvers.ida_star_solver import IDAStarSolver
+
+    return IDAStarSolver(heuristic=korf_heuristic(), max_depth=20)
+
+
+def _parallel_ida_korf() -> BaseSolver:
+    from src.heuristics.combined import korf_heuristic
+    from src.solvers.parallel_ida_star_solver import ParallelIDAStarSolver
+
+    return ParallelIDAStarSolver(korf_heuristic, max_depth=20)
+
+
+def _bidirectional() -> BaseSolver:
+    from src.solvers.bidirectional_solver import BidirectionalSolver
+
+    return BidirectionalSolver()
+
+
+def _two_phase() -> BaseSolver:
+    from src.solvers.two_phase_solver import TwoPhaseSolver
+
+    return TwoPhaseSolver()
+
+
+def _thistlethwaite() -> BaseSolver:
+    from src.solvers.thistlethwaite_solver import ThistlethwaiteSolver
+
+    return ThistlethwaiteSolver()
+
+
+COMBOS: Dict[str, Combo] = {
+    "iddfs": Combo(_iddfs, 4),
+    "ida/edge_orient": Combo(_ida_edge_orient, 6),
+    "ida/korf": Combo(_ida_korf, 10),
+    "parallel_ida/korf": Combo(_parallel_ida_korf, 10),
+    "bidirectional": Combo(_bidirectional, 8),
+    "two_phase": Combo(_two_phase, 20),
+    "thistlethwaite": Combo(_thistlethwaite, 20),
+}
+
+
+def register(name: str, factory: Callable[[], BaseSolver], max_depth: int) -> None:
+    """Add a combination to every subsequent run."""
+    COMBOS[name] = Combo(factory, max_depth)
+
+
+# ---------------------------------------------------------------------------
+# Measuring
+
+
+def _reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def percentiles(values: Sequence[float]) -> Optional[Dict[str, float]]:
+    """p50 / p90 / p99 (linear interpolation), mean, min and max."""
+    if not values:
+        return None
+    xs = sorted(values)
+
+    def pct(q: float) -> float:
+        pos = q * (len(xs) - 1)
+        lo = int(pos)
+        hi = min(lo + 1, len(xs) - 1)
+        return xs[lo] + (xs[hi] - xs[lo]) * (pos - lo)
+
+    return {
+        "p50": pct(0.5),
+        "p90": pct(0.9),
+        "p99": pct(0.99),
+        "mean": sum(xs) / len(xs),
+        "min": xs[0],
+        "max": xs[-1],
+    }
+
+
+def _state(scramble: str) -> CubeState:
+    cube = CubeState.solved()
+    apply_move_sequence(cube, scramble.split())
+    return cube
+
+
+def run_combo(
+    combo: Combo,
+    buckets: Dict[str, List[str]],
+    timeout: Optional[float] = None,
+    profiler: Optional[SolveProfiler] = None,
+) -> Dict[str, Dict]:
+    """Per-bucket summaries of one combination (in this process).
+
+    A `profiler` is started after the warm-up solve and stopped at the end.
+    """
+    items: List[Tuple[str, str]] = [
+        (depth, moves) for depth, scrambles in buckets.items() for moves in scrambles
+    ]
+    if not items:
+        return {}
+    # Solved first, untimed: loads tables, fills caches.
+    states = [_state(items[0][1])] + [_state(moves) for _, moves in items]
+
+    factory = combo.factory
+    if profiler is not None:
+
+        def factory() -> BaseSolver:
+            return profiler.watch(combo.factory())
+
+    samples: Dict[str, List[Dict]] = {depth: [] for depth in buckets}
+    results = iter_solve_many(states, factory, workers=1, timeout=timeout, ordered=True)
+    for i in range(len(states)):
+        _reset_peak_rss()
+        result = next(results)
+        if i == 0:
+            if profiler is not None:
+                profiler.start()
+            continue
+        depth, _ = items[i - 1]
+        ok = result.ok and validate_solution(states[i], result.solution)
+        samples[depth].append(
+            {
+                "ok": ok,
+                "error": result.error or (None if ok else "invalid solution"),
+                "time_s": result.elapsed,
+                "nodes": result.stats["nodes"] if result.stats else None,
+                "peak_rss_mb": _peak_rss_mb(),
+                "length": len(result.solution) if ok else None,
+            }
+        )
+    if profiler is not None:
+        profiler.stop()
+
+    summary: Dict[str, Dict] = {}
+    for depth, rows in samples.items():
+        good = [r for r in rows if r["ok"]]
+        with_nodes = [r for r in good if r["nodes"] is not None]
+        summary[depth] = {
+            "n": len(rows),
+            "solved": len(good),
+            "errors": sorted({r["error"] for r in rows if not r["ok"]}),
+            "time_s": percentiles([r["time_s"] for r in good]),
+            "nodes": percentiles([r["nodes"] for r in with_nodes]),
+            "nodes_per_s": percentiles(
+                [r["nodes"] / r["time_s"] for r in with_nodes if r["time_s"] > 0]
+            ),
+            "peak_rss_mb": percentiles([r["peak_rss_mb"] for r in rows]),
+            "length": percentiles([r["length"] for r in good]),
+        }
+    return summary
+
+
+def _environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def run_suite(
+    corpus: Dict,
+    solvers: Optional[Sequence[str]] = None,
+    depths: Optional[Sequence[int]] = None,
+    limit: Optional[int] = None,
+    timeout: Optional[float] = 60.0,
+    verbose: bool = True,
+    profile_dir: Optional[str] = None,
+    profile_memory: bool = False,
+) -> Dict:
+    names = list(solvers or COMBOS)
+    unknown = [n for n in names if n not in COMBOS]
+    if unknown:
+        raise ValueError(f"Unknown combinations: {', '.join(unknown)}")
+
+    results: Dict[str, Dict] = {}
+    for name in names:
+        combo = COMBOS[name]
+        buckets = {
+            depth: scrambles[:limit]
+            for depth, scrambles in corpus["buckets"].items()
+            if int(depth) <= combo.max_depth
+            and (depths is None or int(depth) in depths)
+        }
+        profiler = None
+        if profile_dir is not None:
+            prefix = os.path.join(profile_dir, name.replace("/", "_"))
+            profiler = SolveProfiler(prefix, memory=profile_memory)
+        t0 = time.perf_counter()
+        results[name] = run_combo(combo, buckets, timeout=timeout, profiler=profiler)
+        if verbose:
+            print(f"{name}: {time.perf_counter() - t0:.1f}s")
+            if profiler is not None and profiler.files:
+                print(f"  profile: {profiler.files['prof']}")
+            for depth, s in results[name].items():
+                p50 = s["time_s"]["p50"] if s["time_s"] else float("nan")
+                print(
+                    f"  depth {depth:>2s}: {s['solved']}/{s['n']} solved, "
+                    f"p50 {p50:.4f}s"
+                )
+
+    return {
+        "results_version": RESULTS_VERSION,
+        "corpus": {
+            "version": corpus["version"],
+            "checksum": corpus_checksum(corpus),
+        },
+        "settings": {
+            "limit": limit,
+            "timeout": timeout,
+            "profiled": profile_dir is not None,
+        },
+        "environment": _environment(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Comparing
+
+# metric -> True if larger is better
+METRICS: Dict[str, bool] = {
+    "time_s": False,
+    "nodes": False,
+    "nodes_per_s": True,
+    "peak_rss_mb": False,
+    "length": False,
+}
+
+
+def compare(
+    old: Dict,
+    new: Dict,
+    threshold: float = 0.1,
+    stats: Sequence[str] = ("p50", "p90"),
+    min_time: float = 0.001,
+) -> List[str]:
+    """Regressions of `new` against `old` beyond `threshold` (relative).
+
+    Time-based metrics of buckets whose old p50 time is below `min_time`
+    seconds are skipped as noise.
+    """
+    regressions: List[str] = []
+    if old.get("results_version") != new.get("results_version"):
+        regressions.append(
+            f"results version differs: {old.get('results_version')} vs "
+            f"{new.get('results_version')} (rerun the old revision)"
+        )
+        return regressions
+    if old["corpus"] != new["corpus"]:
+        regressions.append(f"corpus differs: {old['corpus']} vs {new['corpus']}")
+        return regressions
+
+    for name, buckets in new["results"].items():
+        for depth, cur in buckets.items():
+            ref = old["results"].get(name, {}).get(depth)
+            if ref is None:
+                continue
+            where = f"{name} depth {depth}"
+            if cur["solved"] < ref["solved"]:
+                regressions.append(
+                    f"{where}: solved {ref['solved']} -> {cur['solved']}"
+                )
+            tiny = ref["time_s"] is None or ref["time_s"]["p50"] < min_time
+            for metric, higher_better in METRICS.items():
+                if tiny and metric in ("time_s", "nodes_per_s"):
+                    continue
+                a, b = ref[metric], cur[metric]
+                if a is None or b is None:
+                    continue
+                for stat in stats:
+                    if a[stat] <= 0:
+                        continue
+                    change = (b[stat] - a[stat]) / a[stat]
+                    if (-change if higher_better else change) > threshold:
+                        regressions.append(
+                            f"{where}: {metric} {stat} {a[stat]:.4g} -> "
+                            f"{b[stat]:.4g} ({change:+.1%})"
+                        )
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Command line
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite")
+    run.add_argument("--corpus", default=DEFAULT_CORPUS)
+    run.add_argument("--solvers", help="comma-separated names (default: all)")
+    run.add_argument("--depths", help="comma-separated bucket depths (default: all)")
+    run.add_argument("--limit", type=int, help="scrambles per bucket")
+    run.add_argument("--timeout", type=float, default=60.0, help="seconds per solve")
+    run.add_argument("-o", "--output", help="write results JSON here")
+    run.add_argument("--profile", metavar="DIR", help="write per-combination profiles")
+    run.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="with --profile, also trace allocations",
+    )
+
+    cmp_ = sub.add_parser("compare", help="compare two result files")
+    cmp_.add_argument("old")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--threshold", type=float, default=0.1)
+
+    gen = sub.add_parser("corpus", help="write a new corpus version")
+    gen.add_argument("--version", type=int, required=True)
+    gen.add_argument("--seed", type=int, required=True)
+    gen.add_argument("--per-bucket", type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run_suite(
+            load_corpus(args.corpus),
+            solvers=args.solvers.split(",") if args.solvers else None,
+            depths=[int(d) for d in args.depths.split(",")] if args.depths else None,
+            limit=args.limit,
+            timeout=args.timeout,
+            profile_dir=args.profile,
+            profile_memory=args.profile_memory,
+        )
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"Results written to {args.output}")
+
+    elif args.command == "compare":
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = compare(old, new, threshold=args.threshold)
+        for line in regressions:
+            print("REGRESSION", line)
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1 if regressions else 0)
+
+    else:
+        path = os.path.join(CORPUS_DIR, f"scrambles_v{args.version}.json")
+        if os.path.exists(path):
+            raise SystemExit(f"{path} exists; corpus versions are immutable")
+        corpus = generate_corpus(args.version, args.seed, per_bucket=args.per_bucket)
+        os.makedirs(CORPUS_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(corpus, f, indent=1)
+            f.write("\n")
+        print(f"Corpus written to {path} (checksum {corpus_checksum(corpus)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,10 @@ Usage (from project root):
 
     # IDDFS baseline on short scrambles
     python -m demos.demo --solver iddfs --length 4
+
+    # Profile the solve: profiles/demo.prof (snakeviz), .folded (flame
+    # graph), .timeline.csv and a .txt report with the top allocators
+    python -m demos.demo --profile profiles/demo --profile-memory
 """
 
 from __future__ import annotations
@@ -27,12 +31,10 @@ from src.cube.cube_state import CubeState
 from src.cube.scrambler import apply_random_scramble
 from src.solvers.iddfs_solver import IDDFSSolver
 from src.solvers.ida_star_solver import IDAStarSolver
-from src.heuristics.corner_perm_pdb import CornerPermPDB
-from src.heuristics.edge_orient_pdb import EdgeOrientPDB
 from src.utils.validator import validate_solution
-from src.visualization.cube_viewer import plot_cube
-from src.visualization.cube_viewer_3d import animate_cube_3d
-from src.visualization.animator import animate_solution
+
+# Heuristic tables (NumPy) and the matplotlib viewers are imported where
+# they are used, so a headless IDDFS run starts without either.
 
 
 def parse_args() -> argparse.Namespace:
@@ -70,6 +72,16 @@ def parse_args() -> argparse.Namespace:
         default=42,
         help="Random seed for reproducible scrambles (default: 42).",
     )
+    parser.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        help="Profile the solve and write PREFIX.prof/.folded/.timeline.csv/.txt.",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also report the top tracemalloc allocators.",
+    )
     return parser.parse_args()
 
 
@@ -79,20 +91,34 @@ def build_solver(name: str):
         return IDDFSSolver(max_depth=12)
 
     elif name == "ida":
-        # Use a combined heuristic:
+        from src.heuristics.combined import MaxHeuristic
+        from src.heuristics.corner_pdb import CornerPDB
+        from src.heuristics.edge_orient_pdb import EdgeOrientPDB
+        from src.heuristics.edge_subset_pdb import (
+            EDGE_SET_A,
+            EDGE_SET_B,
+            EdgeSubsetPDB,
+        )
+
+        # Use a combined heuristic (max of admissible lower bounds):
         # - EdgeOrientPDB: PDB-based lower bound if table is built.
-        # - CornerPermPDB: Hamming-like lower bound on corner permutations.
+        # - CornerPDB: Korf corner PDB (exact corner distances).
+        # - EdgeSubsetPDB x2: disjoint 6-edge PDBs.
         edge_pdb = EdgeOrientPDB()
-        corner_pdb = CornerPermPDB()
+        corner_pdb = CornerPDB()
+        edge_a = EdgeSubsetPDB(EDGE_SET_A)
+        edge_b = EdgeSubsetPDB(EDGE_SET_B)
+        combined_h = MaxHeuristic(edge_pdb, corner_pdb, edge_a, edge_b)
 
-        def combined_h(state):
-            return max(edge_pdb.h(state), corner_pdb.h(state))
+        def status(pdb) -> str:
+            return "loaded" if pdb.loaded else "not built, using fallback"
 
         print(
             "[Solver] Using IDA* with combined heuristic:\n"
-            f"          - EdgeOrientPDB (entries: {len(edge_pdb.table)})\n"
-            "          - CornerPermPDB\n"
-            "          Heuristic = max(edge_h, corner_h)"
+            f"          - EdgeOrientPDB ({status(edge_pdb)})\n"
+            f"          - CornerPDB ({status(corner_pdb)})\n"
+            f"          - EdgeSubsetPDB A/B ({status(edge_a)} / {status(edge_b)})\n"
+            "          Heuristic = max(edge_h, corner_h, edge_a_h, edge_b_h)"
         )
         return IDAStarSolver(heuristic=combined_h, max_depth=30)
 
@@ -119,6 +145,8 @@ def main() -> None:
 
     # 2D static view of scrambled cube
     if args.plot:
+        from src.visualization.cube_viewer import plot_cube
+
         print("Showing scrambled cube (2D net)...")
         plot_cube(start)
 
@@ -128,7 +156,13 @@ def main() -> None:
 
     # Solve
     t0 = time.time()
-    solution = solver.solve(start)
+    if args.profile:
+        from src.utils.profiling import SolveProfiler
+
+        with SolveProfiler(args.profile, solver, memory=args.profile_memory) as prof:
+            solution = solver.solve(start)
+    else:
+        solution = solver.solve(start)
     elapsed = time.time() - t0
 
     print("\nSolution found!")
@@ -136,6 +170,8 @@ def main() -> None:
     print("Solution moves:", " ".join(solution))
     print(f"Solve time: {elapsed:.3f} seconds")
     print("Solution valid?", validate_solution(start, solution))
+    if args.profile:
+        print("Profile written to:", ", ".join(prof.files.values()))
 
     # 2D static view of solved cube
     if args.plot:
@@ -147,6 +183,8 @@ def main() -> None:
 
     # Animations: always do 2D if requested, and 3D as an extra if plot3d is set
     if args.animate:
+        from src.visualization.animator import animate_solution
+
         full_sequence = scramble + solution
 
         # 2D live animation
@@ -160,6 +198,8 @@ def main() -> None:
 
         # 3D live animation (optional)
         if args.plot3d:
+            from src.visualization.cube_viewer_3d import animate_cube_3d
+
             print("\nAnimating scramble + solution from solved state (3D)...")
             animate_cube_3d(
                 start=CubeState.solved(),
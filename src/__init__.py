@@ -1,7 +1,14 @@
 """
 Top-level package for Rubik's Cube solver.
+
+Subpackages are imported on first attribute access (`src.solvers`
+etc.), so `import src` stays cheap.
 """
 
-__all__ = ["cube", "solvers", "heuristics", "visualization", "utils"]
+from .utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__, {}, ["cube", "solvers", "heuristics", "visualization", "utils"]
+)
 
 __version__ = "0.1.0"
@@ -1,5 +1,13 @@
-from .cube_state import CubeState
-from .scrambler import random_scramble
-from .move_generator import MOVE_NAMES, apply_move_sequence
+from ..utils.lazy import attach
 
-__all__ = ["CubeState", "random_scramble", "MOVE_NAMES", "apply_move_sequence"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "CubeState": ".cube_state",
+        "PackedCubeState": ".packed_state",
+        "CubieCube": ".cubie",
+        "random_scramble": ".scrambler",
+        "MOVE_NAMES": ".move_generator",
+        "apply_move_sequence": ".move_generator",
+    },
+)
@@ -0,0 +1,170 @@
+"""
+Vectorised cube engine: N cubes as one (N, 54) uint8 array.
+
+Row i holds the 54 facelets of cube i in the usual U R F D L B order,
+each sticker stored as its face index (U=0 ... B=5). A move is a fixed
+permutation of the 54 positions, so it is applied to every cube at once
+with one fancy-indexing gather; `expand_batch` produces all 18 children
+of every row in a single (N, 18, 54) gather.
+
+For deduplication, `pack_rows` squeezes the 48 non-centre stickers of a
+row into 18 bytes (3 bits each) viewed as one opaque `np.void` item, so
+`np.unique` / `np.isin` sort and compare whole cubes cheaply.
+"""
+
+from __future__ import annotations
+from typing import Iterable, List, Sequence, Union
+
+import numpy as np
+
+from .cube_state import CubeState, FACE_ORDER
+from .move_generator import FACELET_PERMS, MOVE_NAMES
+from .packed_state import PackedCubeState
+
+
+MOVE_INDEX = {m: i for i, m in enumerate(MOVE_NAMES)}
+
+# Row k: facelet gather of move k; row 18 is the identity ("no move"),
+# used to pad move sequences of different lengths.
+MOVE_PERMS = np.array(
+    [FACELET_PERMS[m] for m in MOVE_NAMES] + [list(range(54))], dtype=np.intp
+)
+NO_MOVE = len(MOVE_NAMES)
+
+SOLVED_ROW = np.repeat(np.arange(6, dtype=np.uint8), 9)
+
+CENTERS = np.arange(4, 54, 9)
+NON_CENTERS = np.array([i for i in range(54) if i % 9 != 4])
+
+# Facelets of the EdgeOrientPDB mask: U and D without their centres.
+EDGE_MASK_POSITIONS = np.array(
+    [p for p in range(9) if p != 4] + [27 + p for p in range(9) if p != 4]
+)
+_EDGE_MASK_CENTERS = np.repeat([4, 31], 8)
+_EDGE_MASK_WEIGHTS = (1 << np.arange(16)).astype(np.int64)
+
+_TO_CODES = bytes.maketrans("".join(FACE_ORDER).encode("ascii"), bytes(range(6)))
+_FROM_CODES = bytes.maketrans(bytes(range(6)), "".join(FACE_ORDER).encode("ascii"))
+
+StateLike = Union[CubeState, PackedCubeState]
+MoveLike = Union[str, int, np.ndarray, Sequence[int]]
+
+
+def states_to_array(states: Iterable[StateLike]) -> np.ndarray:
+    """Stack cube states into an (N, 54) uint8 array of face indices."""
+    data = b"".join(
+        PackedCubeState.from_cube_state(s).data.translate(_TO_CODES) for s in states
+    )
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, 54).copy()
+
+
+def array_to_states(cubes: np.ndarray) -> List[PackedCubeState]:
+    raw = np.ascontiguousarray(cubes, dtype=np.uint8).tobytes().translate(_FROM_CODES)
+    return [
+        PackedCubeState._from_bytes(raw[i : i + 54]) for i in range(0, len(raw), 54)
+    ]
+
+
+def solved_batch(n: int) -> np.ndarray:
+    return np.tile(SOLVED_ROW, (n, 1))
+
+
+def _move_rows(move: MoveLike) -> np.ndarray:
+    if isinstance(move, str):
+        return MOVE_PERMS[MOVE_INDEX[move]]
+    return MOVE_PERMS[np.asarray(move)]
+
+
+def apply_move_batch(cubes: np.ndarray, move: MoveLike) -> np.ndarray:
+    """Apply `move` to every row and return the new array.
+
+    `move` is a move name or index (same move for all rows), or an array
+    of N move indices (one per row; `NO_MOVE` leaves a row unchanged).
+    """
+    perm = _move_rows(move)
+    if perm.ndim == 1:
+        return cubes[:, perm]
+    return np.take_along_axis(cubes, perm, axis=1)
+
+
+def apply_moves_batch(cubes: np.ndarray, moves: Sequence[str]) -> np.ndarray:
+    """Apply the same move sequence to every row."""
+    for m in moves:
+        cubes = apply_move_batch(cubes, m)
+    return cubes
+
+
+def expand_batch(cubes: np.ndarray, moves: Sequence[int] | None = None) -> np.ndarray:
+    """All children of every row: shape (N, len(moves), 54)."""
+    perms = MOVE_PERMS[:NO_MOVE] if moves is None else MOVE_PERMS[np.asarray(moves)]
+    return cubes[:, perms]
+
+
+def is_solved_batch(cubes: np.ndarray) -> np.ndarray:
+    """Boolean array: which rows are solved."""
+    return (cubes == SOLVED_ROW).all(axis=1)
+
+
+def validate_solution_batch(
+    starts: Union[np.ndarray, Sequence[StateLike]],
+    solutions: Sequence[Sequence[str]],
+) -> np.ndarray:
+    """Boolean array: does solutions[i] solve starts[i]?
+
+    Invalid move names make that row's result False.
+    """
+    cubes = starts if isinstance(starts, np.ndarray) else states_to_array(starts)
+    if len(cubes) != len(solutions):
+        raise ValueError("Need exactly one solution per start state")
+    ok = np.ones(len(solutions), dtype=bool)
+    longest = max((len(s) for s in solutions), default=0)
+    steps = np.full((len(solutions), longest), NO_MOVE, dtype=np.intp)
+    for i, solution in enumerate(solutions):
+        for j, m in enumerate(solution):
+            k = MOVE_INDEX.get(m)
+            if k is None:
+                ok[i] = False
+                break
+            steps[i, j] = k
+    for j in range(longest):
+        cubes = apply_move_batch(cubes, steps[:, j])
+    return ok & is_solved_batch(cubes)
+
+
+def edge_mask_batch(cubes: np.ndarray) -> np.ndarray:
+    """`EdgeOrientPDB.encode` of every row (16-bit masks)."""
+    wrong = cubes[:, EDGE_MASK_POSITIONS] != cubes[:, _EDGE_MASK_CENTERS]
+    return wrong.astype(np.int64) @ _EDGE_MASK_WEIGHTS
+
+
+_ROW_DTYPE = np.dtype((np.void, 18))
+_SHIFTS = (3 * np.arange(8)).astype(np.uint32)
+
+
+def pack_rows(cubes: np.ndarray) -> np.ndarray:
+    """One 18-byte `np.void` per row, for sorting and set operations.
+
+    Only the 48 non-centre stickers are kept (centres never move).
+    """
+    stickers = cubes[:, NON_CENTERS].reshape(-1, 6, 8).astype(np.uint32)
+    words = (stickers << _SHIFTS).sum(axis=2, dtype=np.uint32)  # 24 bits each
+    raw = np.ascontiguousarray(words, dtype="<u4").view(np.uint8)
+    raw = raw.reshape(-1, 6, 4)[:, :, :3]
+    return np.ascontiguousarray(raw).reshape(-1, 18).view(_ROW_DTYPE).ravel()
+
+
+def unpack_rows(packed: np.ndarray) -> np.ndarray:
+    """Inverse of `pack_rows`."""
+    raw = np.ascontiguousarray(packed).view(np.uint8).reshape(-1, 6, 3)
+    words = np.zeros((len(raw), 6, 4), dtype=np.uint8)
+    words[:, :, :3] = raw
+    words = words.view("<u4").reshape(-1, 6, 1)
+    stickers = ((words >> _SHIFTS) & 7).astype(np.uint8).reshape(-1, 48)
+    cubes = solved_batch(len(stickers))
+    cubes[:, NON_CENTERS] = stickers
+    return cubes
+
+
+def unique_rows(cubes: np.ndarray) -> np.ndarray:
+    """Distinct rows of `cubes` (sorted by their packed form)."""
+    return unpack_rows(np.unique(pack_rows(cubes)))
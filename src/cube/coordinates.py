@@ -0,0 +1,485 @@
+"""
+Integer coordinates of the cube and their move tables.
+
+A coordinate maps one aspect of a `CubieCube` (corner twists, edge flips,
+corner permutation, positions of some edges, ...) to an integer in
+`range(size)`. Its move table is a NumPy array of shape (size, 18):
+
+    table[c, MOVE_INDEX[m]] == coordinate of (cube with coordinate c) + m
+
+so a search can advance a node with one array lookup per coordinate.
+Coordinates that are only meaningful inside a subgroup (the phase-2
+coordinates of the two-phase solver) restrict `moves`; their tables have
+one column per allowed move instead (see `Coordinate.column`).
+
+Tables are built with vectorised NumPy on first use, saved as `.npy`
+files under `data/move_tables/`, and memory-mapped on every later load,
+including from other processes.
+"""
+
+from __future__ import annotations
+import itertools
+import math
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cubie import CubieCube, MOVE_CUBES
+from .move_generator import MOVE_NAMES
+from ..utils.atomic import atomic_write
+
+
+MOVE_INDEX: Dict[str, int] = {m: i for i, m in enumerate(MOVE_NAMES)}
+
+# Moves that keep a cube inside G1 = <U, D, R2, L2, F2, B2>.
+PHASE2_MOVES: Tuple[str, ...] = (
+    "U", "U2", "U'", "D", "D2", "D'", "R2", "L2", "F2", "B2",
+)
+
+# Generators of the squares group <U2, D2, R2, L2, F2, B2>.
+SQUARE_MOVES: Tuple[str, ...] = ("U2", "D2", "R2", "L2", "F2", "B2")
+
+
+def _default_table_dir() -> str:
+    here = os.path.dirname(__file__)
+    project_root = os.path.abspath(os.path.join(here, "..", ".."))
+    return os.path.join(project_root, "data", "move_tables")
+
+
+def _partial_perm_rank(arr: np.ndarray, n: int) -> np.ndarray:
+    """Lexicographic rank of each row of `arr` among k-permutations of n.
+
+    Matches the order of `itertools.permutations(range(n), k)`.
+    """
+    k = arr.shape[1]
+    rank = np.zeros(arr.shape[0], dtype=np.int64)
+    for i in range(k):
+        smaller_before = (arr[:, :i] < arr[:, i : i + 1]).sum(axis=1)
+        weight = math.perm(n - 1 - i, k - 1 - i)
+        rank += (arr[:, i] - smaller_before) * weight
+    return rank
+
+
+class Coordinate(ABC):
+    """One integer coordinate with a cached, memory-mapped move table."""
+
+    name: str
+    size: int
+    moves: Tuple[str, ...] = tuple(MOVE_NAMES)
+
+    def __init__(self) -> None:
+        self._table: Optional[np.ndarray] = None
+        self._solved: Optional[int] = None
+
+    @abstractmethod
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        """The piece of `cube` this coordinate describes."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _decode_all(self) -> np.ndarray:
+        """Array of shape (size, k): the part for every coordinate value."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        """Coordinate values for an (N, k) array of parts."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        """Parts after applying `move` (an (N, k) array)."""
+        raise NotImplementedError
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.uint16 if self.size <= 0xFFFF else np.uint32)
+
+    @property
+    def solved(self) -> int:
+        """Coordinate value of the solved cube."""
+        if self._solved is None:
+            self._solved = self.from_cubie(CubieCube.solved())
+        return self._solved
+
+    def column(self, move: str) -> int:
+        """Move-table column of `move`."""
+        return self.moves.index(move)
+
+    def from_cubie(self, cube: CubieCube) -> int:
+        parts = np.array([self._part(cube)], dtype=np.int64)
+        return int(self._encode(parts)[0])
+
+    def build_move_table(self) -> np.ndarray:
+        parts = self._decode_all()
+        table = np.empty((self.size, len(self.moves)), dtype=self.dtype)
+        for j, m in enumerate(self.moves):
+            table[:, j] = self._encode(self._apply(parts, MOVE_CUBES[m]))
+        return table
+
+    def move_table(self, table_dir: str | None = None) -> np.ndarray:
+        """Load (memory-mapped) or build-and-save the move table."""
+        if self._table is None:
+            if table_dir is None:
+                table_dir = _default_table_dir()
+            path = os.path.join(table_dir, f"{self.name}.npy")
+            if not os.path.exists(path):
+                save_atomic(path, self.build_move_table())
+            self._table = np.load(path, mmap_mode="r")
+        return self._table
+
+
+def save_atomic(path: str, array: np.ndarray) -> None:
+    """Write `array` so concurrent readers never see a partial file."""
+    with atomic_write(path, suffix=".npy.tmp") as f:
+        np.save(f, array)
+
+
+class CornerOrientation(Coordinate):
+    """Twists of corners 0..6 in base 3 (corner 7's twist is implied)."""
+
+    name = "corner_orient"
+    size = 3 ** 7
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        return cube.co
+
+    def _decode_all(self) -> np.ndarray:
+        first = np.array(list(itertools.product(range(3), repeat=7)), dtype=np.int64)
+        last = (-first.sum(axis=1)) % 3
+        return np.column_stack([first, last])
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        weights = 3 ** np.arange(6, -1, -1, dtype=np.int64)
+        return parts[:, :7] @ weights
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        return (parts[:, list(move.cp)] + np.array(move.co)) % 3
+
+
+class EdgeOrientation(Coordinate):
+    """Flips of edges 0..10 in base 2 (edge 11's flip is implied)."""
+
+    name = "edge_orient"
+    size = 2 ** 11
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        return cube.eo
+
+    def _decode_all(self) -> np.ndarray:
+        first = np.array(list(itertools.product(range(2), repeat=11)), dtype=np.int64)
+        last = first.sum(axis=1) % 2
+        return np.column_stack([first, last])
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        weights = 2 ** np.arange(10, -1, -1, dtype=np.int64)
+        return parts[:, :11] @ weights
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        return (parts[:, list(move.ep)] + np.array(move.eo)) % 2
+
+
+class CornerPermutation(Coordinate):
+    """Lexicographic rank of the corner permutation (8! values)."""
+
+    name = "corner_perm"
+    size = math.factorial(8)
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        return cube.cp
+
+    def _decode_all(self) -> np.ndarray:
+        return np.array(list(itertools.permutations(range(8))), dtype=np.int64)
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        return _partial_perm_rank(parts, 8)
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        return parts[:, list(move.cp)]
+
+
+def _edge_positions(cube: CubieCube, edges: Sequence[int]) -> Tuple[int, ...]:
+    where = {e: i for i, e in enumerate(cube.ep)}
+    return tuple(where[e] for e in edges)
+
+
+def _moved_positions(parts: np.ndarray, move: CubieCube) -> np.ndarray:
+    # The edge at position move.ep[q] moves to position q.
+    dest = np.empty(12, dtype=np.int64)
+    dest[list(move.ep)] = np.arange(12)
+    return dest[parts]
+
+
+class EdgeSubset(Coordinate):
+    """Ordered positions of a subset of edges (12!/(12-k)! values).
+
+    `EdgeSubset((8, 9, 10, 11))` is the sorted UD-slice coordinate.
+    """
+
+    def __init__(self, edges: Sequence[int], name: str | None = None):
+        super().__init__()
+        self.edges = tuple(edges)
+        self.size = math.perm(12, len(self.edges))
+        self.name = name or "edges_" + "_".join(map(str, self.edges))
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        return _edge_positions(cube, self.edges)
+
+    def _decode_all(self) -> np.ndarray:
+        k = len(self.edges)
+        return np.array(list(itertools.permutations(range(12), k)), dtype=np.int64)
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        return _partial_perm_rank(parts, 12)
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        return _moved_positions(parts, move)
+
+    def flip_table(self) -> np.ndarray:
+        """(size, 18) uint8 masks of which tracked edges each move flips.
+
+        Bit k-1-i is set when edge `edges[i]` changes orientation, so the
+        mask can be XOR-ed into the edges' packed flips (edges[0] is the
+        most significant bit).
+        """
+        parts = self._decode_all()
+        k = len(self.edges)
+        weights = 1 << np.arange(k - 1, -1, -1, dtype=np.int64)
+        table = np.empty((self.size, len(self.moves)), dtype=np.uint8)
+        for j, m in enumerate(self.moves):
+            move = MOVE_CUBES[m]
+            flips = np.array(move.eo)[_moved_positions(parts, move)]
+            table[:, j] = flips @ weights
+        return table
+
+
+class EdgeCombination(Coordinate):
+    """Which 4 positions hold a set of 4 edges, ignoring order (495)."""
+
+    size = math.comb(12, 4)
+
+    def __init__(self, edges: Sequence[int], name: str | None = None):
+        super().__init__()
+        if len(edges) != 4:
+            raise ValueError("EdgeCombination tracks exactly 4 edges")
+        self.edges = tuple(edges)
+        self.name = name or "edge_comb_" + "_".join(map(str, self.edges))
+        combos = list(itertools.combinations(range(12), 4))
+        self._combos = np.array(combos, dtype=np.int64)
+        self._rank_by_mask = np.full(1 << 12, -1, dtype=np.int64)
+        masks = (1 << self._combos).sum(axis=1)
+        self._rank_by_mask[masks] = np.arange(len(combos))
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        return _edge_positions(cube, self.edges)
+
+    def _decode_all(self) -> np.ndarray:
+        return self._combos
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        return self._rank_by_mask[(1 << parts).sum(axis=1)]
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        return _moved_positions(parts, move)
+
+
+class UDSlice(EdgeCombination):
+    """Which 4 positions hold the UD-slice edges, ignoring order (495)."""
+
+    def __init__(self) -> None:
+        super().__init__((8, 9, 10, 11), name="ud_slice")
+
+
+class UDEdgePermutation(Coordinate):
+    """Permutation of the 8 U/D-layer edges (8! values). G1 moves only."""
+
+    name = "ud_edge_perm"
+    size = math.factorial(8)
+    moves = PHASE2_MOVES
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        return cube.ep[:8]
+
+    def _decode_all(self) -> np.ndarray:
+        return np.array(list(itertools.permutations(range(8))), dtype=np.int64)
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        return _partial_perm_rank(parts, 8)
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        return parts[:, list(move.ep[:8])]
+
+
+class SlicePermutation(Coordinate):
+    """Permutation of the 4 UD-slice edges (24 values). G1 moves only."""
+
+    name = "slice_perm"
+    size = math.factorial(4)
+    moves = PHASE2_MOVES
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        return tuple(e - 8 for e in cube.ep[8:])
+
+    def _decode_all(self) -> np.ndarray:
+        return np.array(list(itertools.permutations(range(4))), dtype=np.int64)
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        return _partial_perm_rank(parts, 4)
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        return parts[:, [e - 8 for e in move.ep[8:]]]
+
+
+# Squares-group coordinates (Thistlethwaite's last two phases).
+#
+# Square moves only permute the corners inside a group H of order 96, so
+# a corner permutation p can be brought into H exactly when its right
+# coset H*p is H itself.
+
+
+def _square_corner_group() -> np.ndarray:
+    """All corner permutations reachable with square moves, by rank."""
+    start = tuple(range(8))
+    seen = {start}
+    frontier = [start]
+    while frontier:
+        nxt = []
+        for cp in frontier:
+            for m in SQUARE_MOVES:
+                new = tuple(cp[j] for j in MOVE_CUBES[m].cp)
+                if new not in seen:
+                    seen.add(new)
+                    nxt.append(new)
+        frontier = nxt
+    return np.array(sorted(seen), dtype=np.int64)
+
+
+class CornerSquareCoset(Coordinate):
+    """Right coset H*p of the corner permutation p (420 values)."""
+
+    name = "corner_square_coset"
+    size = math.factorial(8) // 96
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._coset: Optional[np.ndarray] = None
+        self._reps: Optional[np.ndarray] = None
+
+    def _coset_by_rank(self) -> np.ndarray:
+        """Coset number of every corner permutation, indexed by rank.
+
+        Cosets are numbered in order of their smallest rank (`_reps`
+        holds that permutation of each). The smallest rank is found by
+        relabelling with the square moves' corner permutations, which
+        generate H, until no smaller rank turns up; this takes a few
+        vectorised passes instead of a pass per element of H.
+        """
+        if self._coset is None:
+            perms = np.array(list(itertools.permutations(range(8))), dtype=np.int64)
+            # Base-8 keys sort like ranks, so searchsorted ranks in bulk.
+            weights = 8 ** np.arange(7, -1, -1, dtype=np.int64)
+            keys = perms @ weights
+            neighbours = [
+                np.searchsorted(keys, np.array(MOVE_CUBES[m].cp)[perms] @ weights)
+                for m in SQUARE_MOVES
+            ]
+            smallest = np.arange(len(perms))
+            while True:
+                nxt = smallest.copy()
+                for n in neighbours:
+                    np.minimum(nxt, smallest[n], out=nxt)
+                if np.array_equal(nxt, smallest):
+                    break
+                smallest = nxt
+            ranks = np.unique(smallest)
+            self._reps = perms[ranks]
+            self._coset = np.searchsorted(ranks, smallest)
+        return self._coset
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        return cube.cp
+
+    def _decode_all(self) -> np.ndarray:
+        self._coset_by_rank()
+        return self._reps
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        return self._coset_by_rank()[_partial_perm_rank(parts, 8)]
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        return parts[:, list(move.cp)]
+
+
+class SquareCornerPermutation(Coordinate):
+    """Index of the corner permutation within H (96 values). G3 only."""
+
+    name = "square_corner_perm"
+    size = 96
+    moves = SQUARE_MOVES
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._ranks: Optional[np.ndarray] = None
+
+    def _group_ranks(self) -> np.ndarray:
+        if self._ranks is None:
+            self._ranks = _partial_perm_rank(_square_corner_group(), 8)
+        return self._ranks
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        return cube.cp
+
+    def _decode_all(self) -> np.ndarray:
+        return _square_corner_group()
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self._group_ranks(), _partial_perm_rank(parts, 8))
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        return parts[:, list(move.cp)]
+
+
+class SliceEdgePermutation(Coordinate):
+    """Permutation of 4 edges inside their own slice (24). G3 only."""
+
+    size = 24
+    moves = SQUARE_MOVES
+
+    def __init__(self, edges: Sequence[int], name: str):
+        super().__init__()
+        self.edges = tuple(edges)
+        self.name = name
+        self._slot = np.full(12, -1, dtype=np.int64)
+        self._slot[list(self.edges)] = np.arange(4)
+
+    def _part(self, cube: CubieCube) -> Tuple[int, ...]:
+        where = {e: i for i, e in enumerate(cube.ep)}
+        return tuple(int(self._slot[where[e]]) for e in self.edges)
+
+    def _decode_all(self) -> np.ndarray:
+        return np.array(list(itertools.permutations(range(4))), dtype=np.int64)
+
+    def _encode(self, parts: np.ndarray) -> np.ndarray:
+        return _partial_perm_rank(parts, 4)
+
+    def _apply(self, parts: np.ndarray, move: CubieCube) -> np.ndarray:
+        positions = np.array(self.edges)[parts]
+        return self._slot[_moved_positions(positions, move)]
+
+
+CORNER_ORIENT = CornerOrientation()
+EDGE_ORIENT = EdgeOrientation()
+CORNER_PERM = CornerPermutation()
+UD_SLICE = UDSlice()
+SLICE_SORTED = EdgeSubset((8, 9, 10, 11), name="slice_sorted")
+U_EDGES = EdgeSubset((0, 1, 2, 3), name="u_edges")
+D_EDGES = EdgeSubset((4, 5, 6, 7), name="d_edges")
+UD_EDGE_PERM = UDEdgePermutation()
+SLICE_PERM = SlicePermutation()
+
+ALL_COORDINATES: Tuple[Coordinate, ...] = (
+    CORNER_ORIENT, EDGE_ORIENT, CORNER_PERM, UD_SLICE,
+    SLICE_SORTED, U_EDGES, D_EDGES, UD_EDGE_PERM, SLICE_PERM,
+)
@@ -0,0 +1,214 @@
+"""
+Cubie-level cube representation.
+
+Instead of 54 stickers, a cube is described by where each of the 8 corner
+and 12 edge cubies sits and how it is twisted/flipped:
+
+    cp[i] : which corner cubie occupies corner position i
+    co[i] : its twist (0, 1, 2) at that position
+    ep[i] : which edge cubie occupies edge position i
+    eo[i] : its flip (0, 1) at that position
+
+Naming and orientation conventions follow Kociemba's:
+
+    corners: URF UFL ULB UBR DFR DLF DBL DRB
+    edges:   UR UF UL UB DR DF DL DB FR FL BL BR
+
+Orientation 0 means the U/D sticker of a corner (resp. the first listed
+sticker of an edge) lies on the U/D (first listed) face of the position.
+
+The 18 move cubes are parsed from `FACELET_PERMS`, so the cubie and
+facelet models always agree.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+from .cube_state import CubeState, FACE_ORDER
+from .move_generator import MOVE_NAMES, permute_facelets
+from .packed_state import PackedCubeState
+
+
+CORNER_NAMES: List[str] = ["URF", "UFL", "ULB", "UBR", "DFR", "DLF", "DBL", "DRB"]
+EDGE_NAMES: List[str] = [
+    "UR", "UF", "UL", "UB", "DR", "DF", "DL", "DB", "FR", "FL", "BL", "BR",
+]
+
+# Facelet indices (into the 54-char U R F D L B string) of each position,
+# listed clockwise starting with the U/D facelet.
+CORNER_FACELETS: List[Tuple[int, int, int]] = [
+    (8, 9, 20), (6, 18, 38), (0, 36, 47), (2, 45, 11),
+    (29, 26, 15), (27, 44, 24), (33, 53, 42), (35, 17, 51),
+]
+EDGE_FACELETS: List[Tuple[int, int]] = [
+    (5, 10), (7, 19), (3, 37), (1, 46), (32, 16), (28, 25),
+    (30, 43), (34, 52), (23, 12), (21, 41), (50, 39), (48, 14),
+]
+
+# Face letters of each cubie, in the same order as the facelets above.
+CORNER_COLORS: List[Tuple[str, str, str]] = [tuple(n) for n in CORNER_NAMES]
+EDGE_COLORS: List[Tuple[str, str]] = [tuple(n) for n in EDGE_NAMES]
+
+_CORNER_LOOKUP: Dict[Tuple[str, str], int] = {
+    (c[1], c[2]): j for j, c in enumerate(CORNER_COLORS)
+}
+_EDGE_LOOKUP: Dict[Tuple[str, str], Tuple[int, int]] = {}
+for _j, (_a, _b) in enumerate(EDGE_COLORS):
+    _EDGE_LOOKUP[(_a, _b)] = (_j, 0)
+    _EDGE_LOOKUP[(_b, _a)] = (_j, 1)
+
+
+def _parity(perm: Tuple[int, ...]) -> int:
+    """0 for an even permutation, 1 for an odd one."""
+    n = len(perm)
+    inversions = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if perm[i] > perm[j]:
+                inversions += 1
+    return inversions & 1
+
+
+@dataclass(frozen=True)
+class CubieCube:
+    """Immutable cubie-level cube (see module docstring)."""
+
+    cp: Tuple[int, ...]
+    co: Tuple[int, ...]
+    ep: Tuple[int, ...]
+    eo: Tuple[int, ...]
+
+    @classmethod
+    def solved(cls) -> "CubieCube":
+        return _SOLVED
+
+    @classmethod
+    def from_facelets(
+        cls, state: Union[CubeState, PackedCubeState, str]
+    ) -> "CubieCube":
+        """Parse a facelet cube. Raises ValueError if it is not a real cube.
+
+        Sticker colours are matched against the centres, so any six
+        distinct colour letters work.
+        """
+        s = state if isinstance(state, str) else state.to_string()
+        if len(s) != 54:
+            raise ValueError(f"Expected 54 facelets, got {len(s)}")
+        centers = {s[9 * k + 4]: f for k, f in enumerate(FACE_ORDER)}
+        if len(centers) != 6:
+            raise ValueError("Centres must have six distinct colours")
+        try:
+            faces = [centers[c] for c in s]
+        except KeyError as exc:
+            raise ValueError(f"Sticker colour {exc} matches no centre") from None
+
+        cp: List[int] = []
+        co: List[int] = []
+        for facelets in CORNER_FACELETS:
+            for ori in range(3):
+                if faces[facelets[ori]] in ("U", "D"):
+                    break
+            else:
+                raise ValueError("Corner without a U/D sticker")
+            key = (faces[facelets[(ori + 1) % 3]], faces[facelets[(ori + 2) % 3]])
+            if key not in _CORNER_LOOKUP:
+                raise ValueError(f"Invalid corner colours {key}")
+            cp.append(_CORNER_LOOKUP[key])
+            co.append(ori)
+
+        ep: List[int] = []
+        eo: List[int] = []
+        for a, b in EDGE_FACELETS:
+            key = (faces[a], faces[b])
+            if key not in _EDGE_LOOKUP:
+                raise ValueError(f"Invalid edge colours {key}")
+            j, ori = _EDGE_LOOKUP[key]
+            ep.append(j)
+            eo.append(ori)
+
+        cube = cls(tuple(cp), tuple(co), tuple(ep), tuple(eo))
+        cube.verify()
+        return cube
+
+    def to_string(self) -> str:
+        """Facelet string (same layout as `CubeState.to_string`)."""
+        s = [f for f in FACE_ORDER for _ in range(9)]
+        for i, facelets in enumerate(CORNER_FACELETS):
+            colors = CORNER_COLORS[self.cp[i]]
+            ori = self.co[i]
+            for n in range(3):
+                s[facelets[(n + ori) % 3]] = colors[n]
+        for i, facelets in enumerate(EDGE_FACELETS):
+            colors = EDGE_COLORS[self.ep[i]]
+            ori = self.eo[i]
+            for n in range(2):
+                s[facelets[(n + ori) % 2]] = colors[n]
+        return "".join(s)
+
+    def to_cube_state(self) -> CubeState:
+        return CubeState.from_string(self.to_string())
+
+    def verify(self) -> None:
+        """Raise ValueError unless this is a solvable cube."""
+        if sorted(self.cp) != list(range(8)):
+            raise ValueError("Corner permutation is not a permutation")
+        if sorted(self.ep) != list(range(12)):
+            raise ValueError("Edge permutation is not a permutation")
+        if sum(self.co) % 3 != 0:
+            raise ValueError("Total corner twist is not a multiple of 3")
+        if sum(self.eo) % 2 != 0:
+            raise ValueError("Total edge flip is odd")
+        if _parity(self.cp) != _parity(self.ep):
+            raise ValueError("Corner and edge permutation parities differ")
+
+    def is_solved(self) -> bool:
+        return self == _SOLVED
+
+    def multiply(self, other: "CubieCube") -> "CubieCube":
+        """Return `self` followed by `other`."""
+        cp, co, ep, eo = self.cp, self.co, self.ep, self.eo
+        return CubieCube(
+            tuple(cp[j] for j in other.cp),
+            tuple((co[j] + t) % 3 for j, t in zip(other.cp, other.co)),
+            tuple(ep[j] for j in other.ep),
+            tuple((eo[j] + f) & 1 for j, f in zip(other.ep, other.eo)),
+        )
+
+    def inverse(self) -> "CubieCube":
+        cp = [0] * 8
+        co = [0] * 8
+        ep = [0] * 12
+        eo = [0] * 12
+        for i, j in enumerate(self.cp):
+            cp[j] = i
+            co[j] = (3 - self.co[i]) % 3
+        for i, j in enumerate(self.ep):
+            ep[j] = i
+            eo[j] = self.eo[i]
+        return CubieCube(tuple(cp), tuple(co), tuple(ep), tuple(eo))
+
+    def moved(self, move: str) -> "CubieCube":
+        """Return the cube after applying `move`."""
+        m = MOVE_CUBES.get(move)
+        if m is None:
+            raise ValueError(f"Unknown move: {move}")
+        return self.multiply(m)
+
+    def corner_parity(self) -> int:
+        return _parity(self.cp)
+
+    def edge_parity(self) -> int:
+        return _parity(self.ep)
+
+
+_SOLVED = CubieCube(
+    tuple(range(8)), (0,) * 8, tuple(range(12)), (0,) * 12
+)
+
+# move name -> cubie cube of that move applied to the solved cube
+MOVE_CUBES: Dict[str, CubieCube] = {
+    m: CubieCube.from_facelets(
+        "".join(permute_facelets(_SOLVED.to_string(), m))
+    )
+    for m in MOVE_NAMES
+}
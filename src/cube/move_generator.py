@@ -3,11 +3,17 @@ Move definitions for the facelet-based cube.
 
 We implement 6 base face turns (U, R, F, D, L, B) clockwise,
 and derive U2, U', etc. by composition.
+
+The clockwise definitions are only run once, at import time, on a cube
+whose stickers are their own facelet indices. That yields one 54-element
+permutation per move (`FACELET_PERMS`), so applying any of the 18 moves
+is a single gather over the flattened facelets.
 """
 
 from __future__ import annotations
-from typing import Dict, Callable, List
-from .cube_state import CubeState
+from operator import itemgetter
+from typing import Dict, Callable, List, Sequence
+from .cube_state import CubeState, FACE_ORDER
 
 # Move names in quarter-turn metric
 MOVE_NAMES: List[str] = [
@@ -44,24 +50,25 @@ def _rotate_face_180(face: List[str]) -> List[str]:
 def _move_U_cw(cube: CubeState) -> None:
     f = cube.faces
     f["U"] = _rotate_face_cw(f["U"])
-    # Cycle top rows of F, R, B, L
+    # Cycle top rows F -> L -> B -> R -> F
     F, R, B, L = f["F"], f["R"], f["B"], f["L"]
     tmp = F[0:3]
-    F[0:3] = L[0:3]
-    L[0:3] = B[0:3]
-    B[0:3] = R[0:3]
-    R[0:3] = tmp
+    F[0:3] = R[0:3]
+    R[0:3] = B[0:3]
+    B[0:3] = L[0:3]
+    L[0:3] = tmp
 
 
 def _move_D_cw(cube: CubeState) -> None:
     f = cube.faces
     f["D"] = _rotate_face_cw(f["D"])
+    # Cycle bottom rows F -> R -> B -> L -> F
     F, R, B, L = f["F"], f["R"], f["B"], f["L"]
     tmp = F[6:9]
-    F[6:9] = R[6:9]
-    R[6:9] = B[6:9]
-    B[6:9] = L[6:9]
-    L[6:9] = tmp
+    F[6:9] = L[6:9]
+    L[6:9] = B[6:9]
+    B[6:9] = R[6:9]
+    R[6:9] = tmp
 
 
 def _move_R_cw(cube: CubeState) -> None:
@@ -122,8 +129,14 @@ _BASE_CW: Dict[str, Callable[[CubeState], None]] = {
 }
 
 
-def apply_move(cube: CubeState, move: str) -> None:
-    """Apply a single move in-place."""
+def _apply_move_reference(cube: CubeState, move: str) -> None:
+    """Apply a single move in-place by repeating the clockwise turn.
+
+    This is the slice-based reference implementation, with the U/D side
+    row cycles corrected (the original turned them the wrong way). It is
+    kept as the source of truth for `FACELET_PERMS` and for
+    cross-checking in tests.
+    """
     if move not in MOVE_NAMES:
         raise ValueError(f"Unknown move: {move}")
 
@@ -145,6 +158,50 @@ def apply_move(cube: CubeState, move: str) -> None:
         raise ValueError(f"Invalid move syntax: {move}")
 
 
+# Facelet permutation tables
+
+
+def _facelet_perm(move: str) -> List[int]:
+    """Permutation `p` such that new_facelets[i] == old_facelets[p[i]]."""
+    labelled = CubeState(
+        {f: list(range(9 * k, 9 * k + 9)) for k, f in enumerate(FACE_ORDER)}
+    )
+    _apply_move_reference(labelled, move)
+    return [i for f in FACE_ORDER for i in labelled.faces[f]]
+
+
+# move name -> 54-element facelet permutation (U R F D L B order)
+FACELET_PERMS: Dict[str, List[int]] = {m: _facelet_perm(m) for m in MOVE_NAMES}
+
+_GATHERS: Dict[str, Callable[[Sequence], tuple]] = {
+    m: itemgetter(*perm) for m, perm in FACELET_PERMS.items()
+}
+
+
+def permute_facelets(facelets: Sequence, move: str) -> tuple:
+    """Return the 54 facelets of `facelets` after `move` (one gather)."""
+    gather = _GATHERS.get(move)
+    if gather is None:
+        raise ValueError(f"Unknown move: {move}")
+    return gather(facelets)
+
+
+def apply_move(cube: CubeState, move: str) -> None:
+    """Apply a single move in-place."""
+    gather = _GATHERS.get(move)
+    if gather is None:
+        raise ValueError(f"Unknown move: {move}")
+
+    f = cube.faces
+    new = gather(f["U"] + f["R"] + f["F"] + f["D"] + f["L"] + f["B"])
+    f["U"] = list(new[0:9])
+    f["R"] = list(new[9:18])
+    f["F"] = list(new[18:27])
+    f["D"] = list(new[27:36])
+    f["L"] = list(new[36:45])
+    f["B"] = list(new[45:54])
+
+
 def apply_move_sequence(cube: CubeState, moves: List[str]) -> None:
     """Apply a sequence of moves in-place."""
     for m in moves:
@@ -0,0 +1,113 @@
+"""
+Compact, immutable cube state backed by 54 bytes.
+
+`PackedCubeState` stores the same facelets as `CubeState.to_string()`
+(U R F D L B, 9 stickers each) as ASCII bytes. It is hashable with a
+cached hash, compares in O(1) for the common unequal case, and `copy()`
+is free because the state never changes. Moves return a new state.
+
+Use it in hot loops (search, PDB construction) and convert to/from the
+dict-of-faces `CubeState` at the edges.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Union
+from .cube_state import CubeState, FACE_ORDER
+from .move_generator import permute_facelets
+
+
+_SOLVED_DATA = "".join(f * 9 for f in FACE_ORDER).encode("ascii")
+
+_new = object.__new__
+_set = object.__setattr__
+
+
+def facelets_solved(data: Union[bytes, bytearray]) -> bool:
+    """Is every face of these 54 facelets a single colour?"""
+    if data == _SOLVED_DATA:
+        return True
+    # Almost every unsolved state already fails on U.
+    return data.count(data[4], 0, 9) == 9 and all(
+        data.count(data[i + 4], i, i + 9) == 9 for i in range(9, 54, 9)
+    )
+
+
+class PackedCubeState:
+    """Immutable 54-byte facelet cube."""
+
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, data: bytes):
+        if len(data) != 54:
+            raise ValueError(f"Packed state needs 54 facelets, got {len(data)}")
+        _set(self, "_data", bytes(data))
+        _set(self, "_hash", hash(self._data))
+
+    @classmethod
+    def _from_bytes(cls, data: bytes) -> "PackedCubeState":
+        # Trusted fast path: skips validation and the bytes() copy.
+        obj = _new(cls)
+        _set(obj, "_data", data)
+        _set(obj, "_hash", hash(data))
+        return obj
+
+    @classmethod
+    def solved(cls) -> "PackedCubeState":
+        return cls._from_bytes(_SOLVED_DATA)
+
+    @classmethod
+    def from_string(cls, s: str) -> "PackedCubeState":
+        return cls(s.encode("ascii"))
+
+    @classmethod
+    def from_cube_state(
+        cls, state: Union[CubeState, "PackedCubeState"]
+    ) -> "PackedCubeState":
+        """Pack a `CubeState` (packed states are returned unchanged)."""
+        if isinstance(state, PackedCubeState):
+            return state
+        return cls.from_string(state.to_string())
+
+    def to_cube_state(self) -> CubeState:
+        return CubeState.from_string(self.to_string())
+
+    @property
+    def data(self) -> bytes:
+        return self._data
+
+    @property
+    def faces(self) -> Dict[str, List[str]]:
+        """Dict-of-faces snapshot, for code written against `CubeState`."""
+        s = self.to_string()
+        return {f: list(s[9 * k : 9 * k + 9]) for k, f in enumerate(FACE_ORDER)}
+
+    def to_string(self) -> str:
+        return self._data.decode("ascii")
+
+    def copy(self) -> "PackedCubeState":
+        return self
+
+    def is_solved(self) -> bool:
+        """Is every face a single colour? (Any letters, as `CubeState`.)"""
+        return facelets_solved(self._data)
+
+    def moved(self, move: str) -> "PackedCubeState":
+        """Return the state after applying `move`."""
+        return PackedCubeState._from_bytes(bytes(permute_facelets(self._data, move)))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("PackedCubeState is immutable")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackedCubeState):
+            return NotImplemented
+        return self._hash == other._hash and self._data == other._data
+
+    def __repr__(self) -> str:
+        return f"PackedCubeState({self.to_string()!r})"
+
+    def __reduce__(self):
+        return (PackedCubeState, (self._data,))
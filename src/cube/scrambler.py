@@ -11,14 +11,14 @@ from .move_generator import MOVE_NAMES, apply_move
 
 def random_scramble(length: int = 20, forbid_redundant: bool = True) -> List[str]:
     """Generate a random scramble as a move sequence."""
-    from ..utils.move_pruning import is_redundant
+    from ..utils.move_pruning import ALLOWED_AFTER
 
     moves: List[str] = []
     while len(moves) < length:
-        m = random.choice(MOVE_NAMES)
-        if forbid_redundant and moves:
-            if is_redundant(moves[-1], m):
-                continue
+        if forbid_redundant:
+            m = random.choice(ALLOWED_AFTER[moves[-1] if moves else None])
+        else:
+            m = random.choice(MOVE_NAMES)
         moves.append(m)
     return moves
 
@@ -0,0 +1,229 @@
+"""
+The 48 symmetries of the cube (24 rotations, each optionally mirrored).
+
+A symmetry is a signed 3x3 permutation matrix M acting on space (x
+towards R, y towards U, z towards F). It moves every facelet position
+to another one and every face to another face, so a cube state can be
+*conjugated* by it: the sticker at position p moves to M(p) and is
+recoloured with the face M sends its colour to. The result is again a
+legal state at the same distance from solved, because conjugation maps
+every move to a move (`Symmetry.move_map`; mirrors reverse the turn
+direction).
+
+States in one symmetry class therefore share every distance that does
+not care about orientation in space. `canonical` picks one
+representative per class (the smallest facelet string), so tables and
+caches can store a single entry per class; `conjugate_moves` maps a
+solution of the representative back to the original state.
+
+For abstractions that are only invariant under some symmetries (e.g. a
+pattern that looks at the U and D faces), use a subgroup such as
+`UD_SYMMETRIES`. `bit_permutation_table` gives the conjugation table of
+a sticker-mask coordinate, for canonicalising without touching a state.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from itertools import permutations, product
+from operator import itemgetter
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .cube_state import CubeState, FACE_ORDER
+from .move_generator import MOVE_NAMES
+from .packed_state import PackedCubeState
+
+
+Vector = Tuple[int, int, int]
+
+_NORMALS: Dict[str, Vector] = {
+    "U": (0, 1, 0),
+    "R": (1, 0, 0),
+    "F": (0, 0, 1),
+    "D": (0, -1, 0),
+    "L": (-1, 0, 0),
+    "B": (0, 0, -1),
+}
+
+
+def _cubie_position(face: str, r: int, c: int) -> Vector:
+    """Position (in {-1,0,1}^3) of the cubie under sticker (r, c) of `face`."""
+    return {
+        "U": (c - 1, 1, r - 1),
+        "R": (1, 1 - r, 1 - c),
+        "F": (c - 1, 1 - r, 1),
+        "D": (c - 1, -1, 1 - r),
+        "L": (-1, 1 - r, c - 1),
+        "B": (1 - c, 1 - r, -1),
+    }[face]
+
+
+# Facelet index -> 2 * cubie position + face normal (unique per facelet).
+_POINTS: List[Vector] = []
+for _face in FACE_ORDER:
+    _n = _NORMALS[_face]
+    for _r in range(3):
+        for _c in range(3):
+            _p = _cubie_position(_face, _r, _c)
+            _POINTS.append(tuple(2 * a + b for a, b in zip(_p, _n)))
+_POINT_INDEX: Dict[Vector, int] = {p: i for i, p in enumerate(_POINTS)}
+
+
+Matrix = Tuple[Vector, Vector, Vector]
+
+
+def _det(m: Matrix) -> int:
+    return (
+        m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1])
+        - m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0])
+        + m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0])
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class Symmetry:
+    index: int
+    matrix: Matrix
+    mirror: bool
+    # Conjugation as a gather: new[j] = recolour(old[gather[j]]).
+    gather: Tuple[int, ...]
+    # Face letter -> face letter it is sent to.
+    face_map: Dict[str, str]
+    # Move -> conjugated move.
+    move_map: Dict[str, str]
+
+    def __post_init__(self) -> None:
+        table = bytes.maketrans(
+            "".join(self.face_map).encode("ascii"),
+            "".join(self.face_map.values()).encode("ascii"),
+        )
+        object.__setattr__(self, "_getter", itemgetter(*self.gather))
+        object.__setattr__(self, "_recolour", table)
+
+    def apply(self, data: bytes) -> bytes:
+        """Conjugate 54 facelet bytes."""
+        return bytes(self._getter(data)).translate(self._recolour)
+
+    def __repr__(self) -> str:
+        kind = "mirror" if self.mirror else "rotation"
+        return f"Symmetry({self.index}, {kind})"
+
+
+def _build_symmetries() -> List[Symmetry]:
+    matrices: List[Matrix] = []
+    for perm in permutations(range(3)):
+        for signs in product((1, -1), repeat=3):
+            m = [[0, 0, 0] for _ in range(3)]
+            for i in range(3):
+                m[i][perm[i]] = signs[i]
+            matrices.append(tuple(tuple(row) for row in m))
+    identity = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+    # Identity first, then the other rotations, then the mirrors.
+    matrices.sort(key=lambda m: (m != identity, _det(m) < 0))
+
+    solved = PackedCubeState.solved()
+    image = {solved.moved(mv).data: mv for mv in MOVE_NAMES}
+    syms: List[Symmetry] = []
+    for index, m in enumerate(matrices):
+        images = (np.array(_POINTS) @ np.array(m).T).tolist()
+        scatter = [_POINT_INDEX[tuple(p)] for p in images]
+        gather = [0] * 54
+        for i, j in enumerate(scatter):
+            gather[j] = i
+        face_map = {
+            f: FACE_ORDER[scatter[9 * k + 4] // 9] for k, f in enumerate(FACE_ORDER)
+        }
+        sym = Symmetry(index, m, _det(m) < 0, tuple(gather), face_map, {})
+
+        # Conjugation fixes solved and sends each move to a move.
+        sym.move_map.update(
+            {mv: image[sym.apply(solved.moved(mv).data)] for mv in MOVE_NAMES}
+        )
+        syms.append(sym)
+    return syms
+
+
+SYMMETRIES: Tuple[Symmetry, ...] = tuple(_build_symmetries())
+ROTATIONS: Tuple[Symmetry, ...] = SYMMETRIES[:24]
+# Symmetries keeping the U-D axis (the U and D faces swap or stay).
+UD_SYMMETRIES: Tuple[Symmetry, ...] = tuple(
+    s for s in SYMMETRIES if s.face_map["U"] in "UD"
+)
+
+_MATRICES = np.array([s.matrix for s in SYMMETRIES])
+
+
+def _indices(matrices: np.ndarray) -> np.ndarray:
+    """Symmetry index of each signed permutation matrix in `matrices`."""
+    codes = (matrices.reshape(*matrices.shape[:-2], 9) + 1) @ (3 ** np.arange(9))
+    by_code = np.full(3**9, -1)
+    by_code[(_MATRICES.reshape(-1, 9) + 1) @ (3 ** np.arange(9))] = np.arange(48)
+    return by_code[codes]
+
+
+# INVERSE[i]: conjugating by i then INVERSE[i] is the identity.
+INVERSE: Tuple[int, ...] = tuple(_indices(_MATRICES.transpose(0, 2, 1)).tolist())
+
+# SYM_MULT[a][b]: conjugating by a, then by b (matrix M_b @ M_a).
+SYM_MULT: Tuple[Tuple[int, ...], ...] = tuple(
+    map(tuple, _indices(_MATRICES[None, :] @ _MATRICES[:, None]).tolist())
+)
+
+
+StateLike = Union[CubeState, PackedCubeState]
+
+
+def conjugate(state: StateLike, sym: Symmetry) -> PackedCubeState:
+    """The state `state` looks like after applying symmetry `sym`."""
+    packed = PackedCubeState.from_cube_state(state)
+    return PackedCubeState._from_bytes(sym.apply(packed.data))
+
+
+def canonical(
+    state: StateLike, symmetries: Sequence[Symmetry] = SYMMETRIES
+) -> Tuple[PackedCubeState, Symmetry]:
+    """(representative, symmetry taking `state` to it) of the class of `state`.
+
+    The representative is the conjugate with the smallest facelet string.
+    """
+    data = PackedCubeState.from_cube_state(state).data
+    best, best_sym = None, None
+    for sym in symmetries:
+        img = sym.apply(data)
+        if best is None or img < best:
+            best, best_sym = img, sym
+    return PackedCubeState._from_bytes(best), best_sym
+
+
+def conjugate_moves(moves: Sequence[str], sym: Symmetry) -> List[str]:
+    """Map a move sequence through `sym`.
+
+    If `moves` solves `state`, `conjugate_moves(moves, sym)` solves
+    `conjugate(state, sym)`; use `SYMMETRIES[INVERSE[sym.index]]` to map
+    a solution of a canonical representative back.
+    """
+    return [sym.move_map[m] for m in moves]
+
+
+def bit_permutation_table(
+    positions: Sequence[int], symmetries: Sequence[Symmetry]
+) -> np.ndarray:
+    """Conjugation table of a mask over facelet `positions`.
+
+    Bit b of a mask refers to facelet `positions[b]` (e.g. "this sticker
+    is wrong"). Returns `table[s, mask]`, the mask after conjugating by
+    `symmetries[s]`; every symmetry must map `positions` onto itself.
+    """
+    k = len(positions)
+    where = {p: b for b, p in enumerate(positions)}
+    masks = np.arange(1 << k, dtype=np.int64)
+    table = np.zeros((len(symmetries), 1 << k), dtype=np.int64)
+    for s, sym in enumerate(symmetries):
+        scatter = {i: j for j, i in enumerate(sym.gather)}
+        for b, p in enumerate(positions):
+            dest = where.get(scatter[p])
+            if dest is None:
+                raise ValueError(f"{sym!r} moves facelet {p} out of the mask")
+            table[s] |= ((masks >> b) & 1) << dest
+    return table
@@ -1,6 +1,15 @@
-from .pattern_database import PatternDatabase
-from .corner_orient_pdb import CornerOrientPDB
-from .edge_orient_pdb import EdgeOrientPDB
-from .corner_perm_pdb import CornerPermPDB
+from ..utils.lazy import attach
 
-__all__ = ["PatternDatabase", "CornerOrientPDB", "EdgeOrientPDB", "CornerPermPDB"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "PatternDatabase": ".pattern_database",
+        "CornerOrientPDB": ".corner_orient_pdb",
+        "EdgeOrientPDB": ".edge_orient_pdb",
+        "CornerPermPDB": ".corner_perm_pdb",
+        "CornerPDB": ".corner_pdb",
+        "EdgeSubsetPDB": ".edge_subset_pdb",
+        "MaxHeuristic": ".combined",
+        "korf_heuristic": ".combined",
+    },
+)
@@ -3,94 +3,106 @@ Build a small edge-orientation-ish pattern database.
 
 Usage (from project root):
 
-    python -m src.heuristics.build_edge_orient_pdb
+    python -m src.heuristics.build_edge_orient_pdb [--depth N]
 
 This will:
-  - BFS from the solved cube up to MAX_DEPTH moves.
-  - For each visited state, compute the EdgeOrientPDB pattern key.
+  - BFS from the solved cube up to MAX_DEPTH moves, one whole layer at
+    a time as an (N, 54) array with the batch engine
+    (`src.cube.batch_engine`), deduplicated with `np.unique`.
+  - For each new layer, compute the EdgeOrientPDB pattern keys
+    (canonical under the U-D axis symmetries).
   - Store the minimum depth (in quarter-turn metric) for each pattern.
-  - Save to data/pattern_dbs/edge_orient_pdb.pkl.
+  - Save to data/pattern_dbs/edge_orient_pdb.pdb (see `pdb_format`).
 
 The resulting PDB is not complete for the full cube state space,
 but it gives a meaningful, precomputed lower bound for many patterns.
 """
 
 from __future__ import annotations
-from collections import deque
+import argparse
 import time
-from typing import Dict, Tuple
+import numpy as np
 
-from src.cube.cube_state import CubeState
-from src.cube.move_generator import MOVE_NAMES, apply_move
-from src.utils.move_pruning import is_redundant
-from src.heuristics.edge_orient_pdb import EdgeOrientPDB
+from src.cube.batch_engine import (
+    SOLVED_ROW,
+    edge_mask_batch,
+    expand_batch,
+    pack_rows,
+    unpack_rows,
+)
+from src.heuristics.edge_orient_pdb import EdgeOrientPDB, canonical_mask
 
 
-# You can increase this to 6 if you have a powerful machine / time.
-MAX_DEPTH = 5
+MAX_DEPTH = 6
 
+# Frontier rows expanded at once (x18 children, 54 bytes each).
+CHUNK = 1 << 17
 
-def build_edge_orient_pdb() -> EdgeOrientPDB:
-    pdb = EdgeOrientPDB()
-    table: Dict[int, int] = {}
 
-    start_state = CubeState.solved()
-    start_key = pdb.encode(start_state)
-    table[start_key] = 0
+def _next_layer(frontier: np.ndarray, seen: np.ndarray) -> np.ndarray:
+    """Packed rows one move from `frontier` that are not in `seen`."""
+    parts = []
+    for start in range(0, len(frontier), CHUNK):
+        cubes = unpack_rows(frontier[start : start + CHUNK])
+        children = expand_batch(cubes).reshape(-1, 54)
+        parts.append(np.unique(pack_rows(children)))
+    layer = np.unique(np.concatenate(parts))
+    return layer[~np.isin(layer, seen)]
 
-    # BFS queue: (state, depth, last_move)
-    queue = deque([(start_state, 0, None)])
-    visited = {start_state.to_string()}
 
-    num_expanded = 0
-    t0 = time.time()
+def build_edge_orient_pdb(max_depth: int = MAX_DEPTH) -> EdgeOrientPDB:
+    pdb = EdgeOrientPDB()
+    table = np.full(pdb.size, pdb.unknown, dtype=np.uint8)
+    canonical = np.array([canonical_mask(m) for m in range(1 << 16)])
 
-    while queue:
-        state, depth, last_move = queue.popleft()
-        num_expanded += 1
-
-        if num_expanded % 10000 == 0:
-            elapsed = time.time() - t0
-            print(
-                f"Expanded {num_expanded} states, "
-                f"current depth={depth}, "
-                f"unique patterns={len(table)}, "
-                f"time={elapsed:.1f}s"
-            )
-
-        # Record pattern for this state
-        key = pdb.encode(state)
-        if key not in table:
-            table[key] = depth
-
-        if depth >= MAX_DEPTH:
-            continue
-
-        for move in MOVE_NAMES:
-            if last_move is not None and is_redundant(last_move, move):
-                continue
-
-            new_state = state.copy()
-            apply_move(new_state, move)
-            s_str = new_state.to_string()
-            if s_str in visited:
-                continue
-            visited.add(s_str)
-            queue.append((new_state, depth + 1, move))
+    # Neighbours of layer d lie in layers d-1, d and d+1, so only the
+    # last two layers are needed to recognise old states.
+    previous = np.empty(0, dtype=pack_rows(SOLVED_ROW[None]).dtype)
+    frontier = pack_rows(SOLVED_ROW[None])
+    table[canonical[edge_mask_batch(SOLVED_ROW[None])]] = 0
+
+    patterns = 1
+    num_states = 1
+    t0 = time.time()
+    for depth in range(1, max_depth + 1):
+        layer = _next_layer(frontier, np.concatenate([previous, frontier]))
+        previous, frontier = frontier, layer
+        num_states += len(layer)
+
+        for start in range(0, len(layer), CHUNK):
+            masks = edge_mask_batch(unpack_rows(layer[start : start + CHUNK]))
+            keys = np.unique(canonical[masks])
+            keys = keys[table[keys] == pdb.unknown]
+            table[keys] = depth
+        patterns = int(np.count_nonzero(table != pdb.unknown))
+
+        elapsed = time.time() - t0
+        print(
+            f"depth={depth}, new states={len(layer)}, "
+            f"unique patterns={patterns}, "
+            f"time={elapsed:.1f}s"
+        )
 
     elapsed = time.time() - t0
     print(
-        f"\nFinished BFS up to depth {MAX_DEPTH}. "
-        f"Expanded {num_expanded} states, "
-        f"unique patterns={len(table)}, "
+        f"\nFinished BFS up to depth {max_depth}. "
+        f"Visited {num_states} states, "
+        f"unique patterns={patterns}, "
         f"elapsed={elapsed:.1f}s"
     )
 
     pdb.table = table
-    pdb.save()
+    pdb.save(params={"builder": "batch_bfs", "moves": "htm", "max_depth": max_depth})
     print(f"PDB saved to: {pdb.db_path}")
     return pdb
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--depth", type=int, default=MAX_DEPTH)
+    args = parser.parse_args()
+    build_edge_orient_pdb(args.depth)
+
+
 if __name__ == "__main__":
-    build_edge_orient_pdb()
+    main()
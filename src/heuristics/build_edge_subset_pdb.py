@@ -0,0 +1,81 @@
+"""
+Build the two disjoint 6-edge pattern databases.
+
+Usage (from project root):
+
+    python -m src.heuristics.build_edge_subset_pdb          # both sets
+    python -m src.heuristics.build_edge_subset_pdb --set a  # one set
+
+This will:
+  - BFS over all 42,577,920 (positions, flips) states of the 6 tracked
+    edges, expanding each depth layer with the coordinate move tables
+    (`EdgeSubsetPDB.build`, see `src.heuristics.pdb_builder`).
+  - Checkpoint after every layer, so an interrupted build resumes
+    (pass --fresh to start over).
+  - With --workers N, share every layer out to N processes.
+  - Store the exact distance of every state as a 4-bit nibble.
+  - Save to data/pattern_dbs/edge_subset_<edges>.pdb (~21 MB each).
+"""
+
+from __future__ import annotations
+import argparse
+import time
+from typing import List, Sequence
+
+from src.heuristics.edge_subset_pdb import EDGE_SET_A, EDGE_SET_B, EdgeSubsetPDB
+from src.heuristics.pattern_database import unpack_nibbles
+
+
+def build_edge_subset_pdb(
+    edges: Sequence[int] = EDGE_SET_A,
+    resume: bool = True,
+    workers: int | None = 1,
+) -> EdgeSubsetPDB:
+    pdb = EdgeSubsetPDB(edges)
+    print(f"Building edge-subset PDB for edges {pdb.edges} ({pdb.size} states)")
+
+    t0 = time.time()
+    pdb.build(resume=resume, workers=workers)
+
+    dist = unpack_nibbles(pdb.table, pdb.size)
+    print(
+        f"\nFinished BFS. States={dist.size}, "
+        f"max depth={int(dist.max())}, "
+        f"elapsed={time.time() - t0:.1f}s"
+    )
+    print(f"PDB saved to: {pdb.db_path}")
+    return pdb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build edge-subset PDBs")
+    parser.add_argument(
+        "--set",
+        choices=["a", "b", "both"],
+        default="both",
+        help="Which edge set to build (default: both)",
+    )
+    parser.add_argument(
+        "--fresh", action="store_true", help="Ignore any saved checkpoint"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes per BFS layer (0: every core)",
+    )
+    args = parser.parse_args()
+
+    sets: List[Sequence[int]] = []
+    if args.set in ("a", "both"):
+        sets.append(EDGE_SET_A)
+    if args.set in ("b", "both"):
+        sets.append(EDGE_SET_B)
+    for edges in sets:
+        build_edge_subset_pdb(
+            edges, resume=not args.fresh, workers=args.workers or None
+        )
+
+
+if __name__ == "__main__":
+    main()
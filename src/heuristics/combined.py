@@ -0,0 +1,52 @@
+"""
+Combining several admissible heuristics.
+
+The max of admissible heuristics is admissible, so `MaxHeuristic` lets
+IDA* use the corner PDB and the edge-subset PDBs together:
+
+    h = MaxHeuristic(CornerPDB(), EdgeSubsetPDB(EDGE_SET_A),
+                     EdgeSubsetPDB(EDGE_SET_B))
+    solver = IDAStarSolver(heuristic=h, max_depth=20)
+"""
+
+from __future__ import annotations
+from typing import Callable, List, Union
+
+from .corner_pdb import CornerPDB
+from .edge_subset_pdb import EDGE_SET_A, EDGE_SET_B, EdgeSubsetPDB
+from .pattern_database import PatternDatabase
+from ..cube.cube_state import CubeState
+
+
+Heuristic = Callable[[CubeState], int]
+
+
+class MaxHeuristic:
+    """Callable heuristic returning the max over its parts."""
+
+    def __init__(self, *parts: Union[PatternDatabase, Heuristic]):
+        if not parts:
+            raise ValueError("MaxHeuristic needs at least one heuristic")
+        self.parts = parts
+        self._fns: List[Heuristic] = [
+            p.h if isinstance(p, PatternDatabase) else p for p in parts
+        ]
+
+    def h(self, state: CubeState) -> int:
+        best = 0
+        for fn in self._fns:
+            v = fn(state)
+            if v > best:
+                best = v
+        return best
+
+    __call__ = h
+
+
+def korf_heuristic() -> MaxHeuristic:
+    """Corner PDB + both disjoint 6-edge PDBs, combined with max."""
+    return MaxHeuristic(
+        CornerPDB(),
+        EdgeSubsetPDB(EDGE_SET_A),
+        EdgeSubsetPDB(EDGE_SET_B),
+    )
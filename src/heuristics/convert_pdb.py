@@ -0,0 +1,126 @@
+"""
+Convert pattern databases saved in the old formats to `.pdb` files.
+
+Usage (from project root):
+
+    python -m src.heuristics.convert_pdb [--remove] [path ...]
+
+Old formats:
+  - edge_orient_pdb.pkl: a pickled {mask: depth} dict. Pickles from
+    before the symmetry reduction are keyed by every reached mask; they
+    are folded onto canonical masks, which needs every mask of a
+    symmetry class to have the same depth. A pickle that is not such a
+    dict (with depth 0 for the solved mask 0) is rejected.
+    Unpickling can run arbitrary code, so only convert files you trust;
+    this script is the only place that still reads pickles.
+  - corner_pdb.npy, edge_subset_<edges>.npy: nibble-packed `.npy` arrays.
+
+Without paths, every old-format file in data/pattern_dbs is converted.
+Each new file is written next to the old one with a `.pdb` suffix and
+its checksum verified; --remove deletes the old file afterwards.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import pickle
+from typing import List
+
+import numpy as np
+
+from src.heuristics.corner_pdb import CornerPDB
+from src.heuristics.edge_orient_pdb import EdgeOrientPDB, canonical_mask
+from src.heuristics.edge_subset_pdb import EdgeSubsetPDB
+from src.heuristics.pattern_database import PatternDatabase
+from src.heuristics.pdb_format import verify_pdb
+
+
+DB_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "pattern_dbs")
+)
+
+
+def _target(path: str) -> PatternDatabase:
+    """The database an old file holds, pointed at its new path."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    new_path = os.path.splitext(path)[0] + ".pdb"
+    if stem == "edge_orient_pdb":
+        return EdgeOrientPDB(db_path=new_path)
+    if stem == "corner_pdb":
+        return CornerPDB(db_path=new_path)
+    if stem.startswith("edge_subset_"):
+        edges = [int(e) for e in stem[len("edge_subset_") :].split("_")]
+        return EdgeSubsetPDB(edges, db_path=new_path)
+    raise ValueError(f"Don't know which database {path} holds")
+
+
+def _mask_table(path: str, pdb: PatternDatabase, entries: object) -> np.ndarray:
+    """Dense canonical-mask table from a pickled {mask: depth} dict."""
+    if not isinstance(entries, dict):
+        raise ValueError(f"{path}: expected a dict, got {type(entries).__name__}")
+    if entries.get(0) != 0:
+        raise ValueError(f"{path}: the solved mask 0 must have depth 0")
+    table = np.full(pdb.size, pdb.unknown, dtype=np.uint8)
+    for key, dist in entries.items():
+        if not isinstance(key, (int, np.integer)) or not 0 <= key < pdb.size:
+            raise ValueError(f"{path}: key {key!r} is not a mask below {pdb.size}")
+        if not isinstance(dist, (int, np.integer)) or not 0 <= dist < pdb.unknown:
+            raise ValueError(f"{path}: depth {dist!r} of mask {key} is out of range")
+        canon = canonical_mask(int(key))
+        if table[canon] not in (pdb.unknown, dist):
+            raise ValueError(
+                f"{path}: masks {key} and {canon} are symmetric but have "
+                f"depths {dist} and {table[canon]}; not an edge orientation PDB"
+            )
+        table[canon] = dist
+    return table
+
+
+def convert(path: str) -> PatternDatabase:
+    """Convert one old file; returns the database, saved as `.pdb`."""
+    pdb = _target(path)
+    if path.endswith(".pkl"):
+        if not isinstance(pdb, EdgeOrientPDB):
+            raise ValueError(f"{path}: only the edge orientation PDB was pickled")
+        with open(path, "rb") as f:
+            entries = pickle.load(f)
+        table = _mask_table(path, pdb, entries)
+        max_depth = max(entries.values())
+    else:
+        table = np.load(path, allow_pickle=False)
+        max_depth = None
+    pdb.table = table
+    params = {"converted_from": os.path.basename(path)}
+    if max_depth is not None:
+        params["max_depth"] = int(max_depth)
+    pdb.save(params=params)
+    if not verify_pdb(pdb.db_path):
+        raise RuntimeError(f"Checksum mismatch after writing {pdb.db_path}")
+    return pdb
+
+
+def _old_files() -> List[str]:
+    return sorted(
+        os.path.join(DB_DIR, name)
+        for name in os.listdir(DB_DIR)
+        if name.endswith((".pkl", ".npy")) and ".partial." not in name
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "paths", nargs="*", help="old files (default: all in data/pattern_dbs)"
+    )
+    parser.add_argument("--remove", action="store_true", help="delete converted files")
+    args = parser.parse_args()
+
+    for path in args.paths or _old_files():
+        pdb = convert(path)
+        print(f"{path} -> {pdb.db_path} ({pdb.header.nbytes} bytes)")
+        if args.remove:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
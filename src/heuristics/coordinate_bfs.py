@@ -0,0 +1,247 @@
+"""
+Breadth-first search over integer-indexed cube abstractions.
+
+A `SearchSpace` numbers the states of some abstraction of the cube
+(e.g. all corner arrangements) as `range(size)` and can compute, for a
+whole NumPy array of indices at once, the indices after one move. The
+BFS expands each depth layer in vectorised chunks, so it never touches a
+`CubeState`.
+
+`CoordinateProduct` is the common case: a tuple of coordinates from
+`src.cube.coordinates` packed into one mixed-radix index
+((c0 * size1 + c1) * size2 + c2) ... , advanced with their move tables.
+
+The result is a dense uint8 distance array with `NIBBLE_UNKNOWN` for
+unreached entries, ready for `pack_nibbles`. `cached_distances` keeps
+such an array (with the byte-wide `BYTE_UNKNOWN` sentinel, so depths
+past 14 survive) as a memory-mapped `.npy` file, for small pruning
+tables that are not worth a `PatternDatabase` subclass.
+"""
+
+from __future__ import annotations
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import List, Sequence, Union
+
+import numpy as np
+
+from ..cube.coordinates import Coordinate, save_atomic
+from ..cube.move_generator import MOVE_NAMES
+from .pattern_database import NIBBLE_UNKNOWN
+
+
+BYTE_UNKNOWN = 0xFF
+
+
+class SearchSpace(ABC):
+    """An abstraction of the cube whose states are numbered 0..size-1."""
+
+    size: int
+    num_moves: int = len(MOVE_NAMES)
+
+    @property
+    @abstractmethod
+    def solved(self) -> int:
+        """Index of the solved state."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def successors(self, index: np.ndarray, move: int) -> np.ndarray:
+        """Indices after applying move number `move` to every state."""
+        raise NotImplementedError
+
+
+class CoordinateProduct(SearchSpace):
+    """Several coordinates packed into one mixed-radix index.
+
+    `moves` defaults to all 18 moves; pass a subset (e.g. `PHASE2_MOVES`)
+    to search a subgroup, which every coordinate must support.
+    """
+
+    def __init__(
+        self,
+        coords: Sequence[Coordinate],
+        moves: Sequence[str] | None = None,
+    ):
+        self.coords = tuple(coords)
+        self.moves = tuple(MOVE_NAMES if moves is None else moves)
+        self.num_moves = len(self.moves)
+        self.size = 1
+        for c in self.coords:
+            self.size *= c.size
+        self._columns = [
+            np.array([c.column(m) for m in self.moves]) for c in self.coords
+        ]
+        self._tables: List[np.ndarray] | None = None
+
+    @property
+    def solved(self) -> int:
+        index = 0
+        for c in self.coords:
+            index = index * c.size + c.solved
+        return index
+
+    def split(self, index: np.ndarray) -> List[np.ndarray]:
+        """Inverse of the mixed-radix packing, for an array of indices."""
+        parts: List[np.ndarray] = []
+        for c in reversed(self.coords):
+            index, part = np.divmod(index, c.size)
+            parts.append(part)
+        return parts[::-1]
+
+    def successors(self, index: np.ndarray, move: int) -> np.ndarray:
+        if self._tables is None:
+            self._tables = [
+                np.asarray(c.move_table(), dtype=np.int64) for c in self.coords
+            ]
+        out = np.zeros(index.shape, dtype=np.int64)
+        parts = self.split(index)
+        for c, table, cols, part in zip(
+            self.coords, self._tables, self._columns, parts
+        ):
+            out *= c.size
+            out += table[part, cols[move]]
+        return out
+
+
+def as_space(space: Union[SearchSpace, Sequence[Coordinate]]) -> SearchSpace:
+    if isinstance(space, SearchSpace):
+        return space
+    return CoordinateProduct(space)
+
+
+def forward_step(
+    space: SearchSpace,
+    dist: np.ndarray,
+    depth: int,
+    unknown: int,
+    chunk_size: int = 1 << 22,
+    lo: int = 0,
+    hi: int | None = None,
+) -> None:
+    """Top-down: give every unknown successor of layer `depth` depth+1.
+
+    Only frontier states with index in [lo, hi) are expanded, so several
+    processes can share one layer. Every writer stores the same value,
+    so concurrent writes to a shared `dist` need no locking.
+    """
+    frontier = np.flatnonzero(dist[lo:hi] == depth) + lo
+    for start in range(0, frontier.size, chunk_size):
+        chunk = frontier[start : start + chunk_size]
+        for move in range(space.num_moves):
+            nxt = space.successors(chunk, move)
+            dist[nxt[dist[nxt] == unknown]] = depth + 1
+
+
+def backward_step(
+    space: SearchSpace,
+    dist: np.ndarray,
+    depth: int,
+    unknown: int,
+    chunk_size: int = 1 << 22,
+    lo: int = 0,
+    hi: int | None = None,
+) -> None:
+    """Bottom-up: give every unknown state with a neighbour at `depth` depth+1.
+
+    Relies on the move set being closed under inverses (true for all
+    the move sets used here), so successors are also predecessors.
+    Only states with index in [lo, hi) are checked and written.
+    """
+    todo = np.flatnonzero(dist[lo:hi] == unknown) + lo
+    for start in range(0, todo.size, chunk_size):
+        chunk = todo[start : start + chunk_size]
+        for move in range(space.num_moves):
+            if chunk.size == 0:
+                break
+            hit = dist[space.successors(chunk, move)] == depth
+            dist[chunk[hit]] = depth + 1
+            chunk = chunk[~hit]
+
+
+def bfs_layer(
+    space: SearchSpace,
+    dist: np.ndarray,
+    depth: int,
+    unknown: int,
+    chunk_size: int = 1 << 22,
+) -> int:
+    """Fill in layer depth+1 from layer `depth`; returns its size."""
+    step = choose_step(dist, depth, unknown)
+    if step is None:
+        return 0
+    step(space, dist, depth, unknown, chunk_size)
+    return int(np.count_nonzero(dist == depth + 1))
+
+
+def choose_step(dist: np.ndarray, depth: int, unknown: int):
+    """`forward_step` or `backward_step` for the next layer (None: done).
+
+    Expands the frontier forwards while it is smaller than the set of
+    unreached states and switches to the backward check after that,
+    which is much cheaper for the last few, nearly complete layers.
+    """
+    frontier = int(np.count_nonzero(dist == depth))
+    if frontier == 0:
+        return None
+    remaining = int(np.count_nonzero(dist == unknown))
+    return backward_step if frontier > remaining else forward_step
+
+
+def bfs_distances(
+    space: Union[SearchSpace, Sequence[Coordinate]],
+    max_depth: int | None = None,
+    chunk_size: int = 1 << 22,
+    verbose: bool = False,
+    unknown: int = NIBBLE_UNKNOWN,
+) -> np.ndarray:
+    """Distance from solved of every state in `space`.
+
+    A list of coordinates is accepted as shorthand for their product.
+    Unreached entries (and anything deeper than `max_depth`, which
+    defaults to `unknown - 1`) are set to `unknown`.
+    """
+    space = as_space(space)
+    if max_depth is None:
+        max_depth = unknown - 1
+
+    dist = np.full(space.size, unknown, dtype=np.uint8)
+    dist[space.solved] = 0
+
+    t0 = time.time()
+    depth = 0
+    while depth < max_depth:
+        reached = bfs_layer(space, dist, depth, unknown, chunk_size)
+        if reached == 0:
+            break
+        depth += 1
+        if verbose:
+            print(
+                f"depth={depth}, new states={reached}, "
+                f"time={time.time() - t0:.1f}s"
+            )
+    return dist
+
+
+def _default_pruning_dir() -> str:
+    here = os.path.dirname(__file__)
+    project_root = os.path.abspath(os.path.join(here, "..", ".."))
+    return os.path.join(project_root, "data", "pruning_tables")
+
+
+def cached_distances(
+    name: str,
+    space: Union[SearchSpace, Sequence[Coordinate]],
+    table_dir: str | None = None,
+) -> np.ndarray:
+    """`bfs_distances` of `space`, built once and memory-mapped after.
+
+    Unreached entries are `BYTE_UNKNOWN`.
+    """
+    if table_dir is None:
+        table_dir = _default_pruning_dir()
+    path = os.path.join(table_dir, f"{name}.npy")
+    if not os.path.exists(path):
+        save_atomic(path, bfs_distances(space, unknown=BYTE_UNKNOWN))
+    return np.load(path, mmap_mode="r")
@@ -18,11 +18,10 @@ class CornerOrientPDB(PatternDatabase):
         return (state.to_string(),)
 
     def h(self, state: CubeState) -> int:
-        faces = state.faces
+        s = state.to_string()
         count = 0
-        for face_name in ["U", "D"]:
-            face = faces[face_name]
-            center = face[4]
-            count += sum(1 for i in range(9) if i != 4 and face[i] != center)
+        for offset in (0, 27):  # U and D faces
+            center = s[offset + 4]
+            count += sum(1 for c in s[offset : offset + 9] if c != center)
         # Very conservative scaling to keep admissible-ish
         return count // 8
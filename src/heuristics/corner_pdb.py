@@ -0,0 +1,107 @@
+"""
+Korf's corner pattern database.
+
+Covers every arrangement of the 8 corners: 8! permutations x 3^7
+orientations = 88,179,840 states. The exact distance to solved of each
+one is stored as a 4-bit nibble (~44 MB), indexed by
+
+    corner_perm * 2187 + corner_orient
+
+using the coordinates from `src.cube.coordinates`.
+
+Build it once with:
+
+    python -m src.heuristics.build_corner_pdb
+
+Without the built table, `h` falls back to max(orientation-only,
+permutation-only) corner distances, which are tiny and computed on
+first use.
+"""
+
+from __future__ import annotations
+import itertools
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .coordinate_bfs import CoordinateProduct, bfs_distances
+from .pattern_database import NibblePatternDatabase
+from ..cube.coordinates import CORNER_ORIENT, CORNER_PERM
+from ..cube.cube_state import CubeState
+from ..cube.cubie import CORNER_COLORS, CORNER_FACELETS
+
+
+def _default_db_path() -> str:
+    here = os.path.dirname(__file__)
+    project_root = os.path.abspath(os.path.join(here, "..", ".."))
+    return os.path.join(project_root, "data", "pattern_dbs", "corner_pdb.pdb")
+
+
+# "".join of a corner position's three stickers -> (cubie, twist)
+_CORNER_KEYS: Dict[str, Tuple[int, int]] = {}
+for _j, _colors in enumerate(CORNER_COLORS):
+    for _ori in range(3):
+        _key = "".join(_colors[(k - _ori) % 3] for k in range(3))
+        _CORNER_KEYS[_key] = (_j, _ori)
+
+# corner permutation tuple -> lexicographic rank (the CORNER_PERM coordinate)
+_CP_RANK: Dict[Tuple[int, ...], int] = {
+    p: i for i, p in enumerate(itertools.permutations(range(8)))
+}
+
+
+def corner_coordinates(state: CubeState) -> Tuple[int, int]:
+    """(corner_perm, corner_orient) straight from the facelets.
+
+    Assumes stickers are face letters, as for any state reached from
+    `CubeState.solved()`.
+    """
+    s = state.to_string()
+    cp = []
+    co = 0
+    for a, b, c in CORNER_FACELETS:
+        j, ori = _CORNER_KEYS[s[a] + s[b] + s[c]]
+        cp.append(j)
+        co = co * 3 + ori
+    # Drop corner 7's twist, which is implied by the other seven.
+    return _CP_RANK[tuple(cp)], co // 3
+
+
+class CornerPDB(NibblePatternDatabase):
+    size = CORNER_PERM.size * CORNER_ORIENT.size
+    encoding = "corner_perm*corner_orient"
+
+    def __init__(self, db_path: str | None = None):
+        if db_path is None:
+            db_path = _default_db_path()
+        self._co_dist: Optional[np.ndarray] = None
+        self._cp_dist: Optional[np.ndarray] = None
+        super().__init__(db_path=db_path)
+
+    def space(self) -> CoordinateProduct:
+        return CoordinateProduct([CORNER_PERM, CORNER_ORIENT])
+
+    def encode(self, state: CubeState) -> int:
+        cp, co = corner_coordinates(state)
+        return cp * CORNER_ORIENT.size + co
+
+    def h_coords(self, cp: int, co: int) -> int:
+        """Heuristic from (corner_perm, corner_orient) coordinates."""
+        if self.table is None:
+            self._ensure_fallback()
+            return max(int(self._cp_dist[cp]), int(self._co_dist[co]))
+        return self.lookup(cp * CORNER_ORIENT.size + co)
+
+    def h(self, state: CubeState) -> int:
+        return self.h_coords(*corner_coordinates(state))
+
+    def fallback(self, state: CubeState) -> int:
+        self._ensure_fallback()
+        cp, co = corner_coordinates(state)
+        return max(int(self._cp_dist[cp]), int(self._co_dist[co]))
+
+    def _ensure_fallback(self) -> None:
+        if self._co_dist is None:
+            self._co_dist = bfs_distances([CORNER_ORIENT])
+            self._cp_dist = bfs_distances([CORNER_PERM])
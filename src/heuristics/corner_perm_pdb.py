@@ -11,16 +11,17 @@ from .pattern_database import PatternDatabase
 from ..cube.cube_state import CubeState, FACE_ORDER
 
 
+_SOLVED_STRING = "".join(f * 9 for f in FACE_ORDER)
+
+
 class CornerPermPDB(PatternDatabase):
     def encode(self, state: CubeState) -> Tuple:
         return (state.to_string(),)
 
     def h(self, state: CubeState) -> int:
-        count = 0
         # compare against solved
-        for f in FACE_ORDER:
-            face = state.faces[f]
-            center = f
-            count += sum(1 for s in face if s != center)
+        count = sum(
+            1 for s, solved in zip(state.to_string(), _SOLVED_STRING) if s != solved
+        )
         # Each move can affect at most 8 stickers -> divide generously
         return count // 8
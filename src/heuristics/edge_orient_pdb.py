@@ -8,6 +8,12 @@ We build a small PDB over a coarse pattern:
 
 During precomputation, we BFS from the solved cube up to some depth
 and store the minimum number of moves needed to reach each pattern.
+The pattern only looks at the U and D faces, so it is invariant under
+the 16 symmetries that keep the U-D axis: the table stores one entry
+per symmetry class, keyed by the smallest symmetric mask.
+
+The table is a dense byte per 16-bit mask (64 KB); masks that are not
+class representatives, or were not reached, hold 0xFF.
 
 At solve time, we look up the pattern's cost in the table. If there is
 no table (or the pattern wasn't seen), we fall back to a simple
@@ -16,9 +22,26 @@ misplaced-sticker count, scaled down to stay admissible-ish.
 
 from __future__ import annotations
 import os
-from typing import Tuple
+from typing import List, Optional
+
 from .pattern_database import PatternDatabase
 from ..cube.cube_state import CubeState
+from ..cube.symmetry import UD_SYMMETRIES, bit_permutation_table
+
+
+# Facelets behind the mask bits: U and D without their centres.
+MASK_POSITIONS = [p for p in range(9) if p != 4] + [27 + p for p in range(9) if p != 4]
+
+_CANONICAL_MASK: Optional[List[int]] = None
+
+
+def canonical_mask(mask: int) -> int:
+    """Smallest mask in the UD-symmetry class of `mask`."""
+    global _CANONICAL_MASK
+    if _CANONICAL_MASK is None:
+        table = bit_permutation_table(MASK_POSITIONS, UD_SYMMETRIES)
+        _CANONICAL_MASK = table.min(axis=0).tolist()
+    return _CANONICAL_MASK[mask]
 
 
 def _default_db_path() -> str:
@@ -26,10 +49,14 @@ def _default_db_path() -> str:
     here = os.path.dirname(__file__)
     # project_root = .../src/..
     project_root = os.path.abspath(os.path.join(here, "..", ".."))
-    return os.path.join(project_root, "data", "pattern_dbs", "edge_orient_pdb.pkl")
+    return os.path.join(project_root, "data", "pattern_dbs", "edge_orient_pdb.pdb")
 
 
 class EdgeOrientPDB(PatternDatabase):
+    symmetries = UD_SYMMETRIES
+    encoding = "edge_orient:ud_canonical_mask"
+    size = 1 << 16
+
     def __init__(self, db_path: str | None = None):
         if db_path is None:
             db_path = _default_db_path()
@@ -44,22 +71,24 @@ class EdgeOrientPDB(PatternDatabase):
 
         A bit is 1 if the sticker != center color for that face.
         """
-        faces = state.faces
+        s = state.to_string()
         mask = 0
         bit_index = 0
 
-        for face_name in ("U", "D"):
-            face = faces[face_name]
-            center = face[4]
+        for offset in (0, 27):  # U and D faces
+            center = s[offset + 4]
             for pos in range(9):
                 if pos == 4:
                     continue  # skip center
-                if face[pos] != center:
+                if s[offset + pos] != center:
                     mask |= (1 << bit_index)
                 bit_index += 1
 
         return mask
 
+    def canonical_key(self, state: CubeState) -> int:
+        return canonical_mask(self.encode(state))
+
     def h(self, state: CubeState) -> int:
         """
         Lookup heuristic:
@@ -70,22 +99,20 @@ class EdgeOrientPDB(PatternDatabase):
 
           (Very conservative so it's almost certainly admissible.)
         """
-        key = self.encode(state)
+        key = self.canonical_key(state)
 
         # If we have a PDB loaded and it has this pattern, use it.
-        if self.table:
-            if key in self.table:
-                return self.table[key]
+        table = self.table
+        if table is not None:
+            dist = int(table[key])
+            if dist != self.unknown:
+                return dist
             # If not seen during BFS, we don't know the true cost, so returning 0
             # is always safe (admissible). But we can also fall back to the
             # cheap heuristic for a bit more guidance while still being
             # conservative.
-            # Comment one of these out depending on how conservative you want:
-            # return 0
-            # Fallback:
-            return self._fallback_heuristic_from_mask(key)
 
-        # No table loaded at all: just use the cheap heuristic.
+        # No table loaded (or unseen pattern): use the cheap heuristic.
         return self._fallback_heuristic_from_mask(key)
 
     @staticmethod
@@ -0,0 +1,149 @@
+"""
+Edge-subset pattern databases (Korf-style).
+
+Tracks the positions *and* flips of a fixed subset of k edges and ignores
+everything else. A state is indexed as
+
+    position_rank * 2^k + flips
+
+where `position_rank` is the `EdgeSubset` coordinate of the tracked edges'
+ordered positions and `flips` packs their orientations (edges[0] is the
+most significant bit). With k = 6 that is 665,280 * 64 = 42,577,920
+states, ~21 MB as nibbles.
+
+The default pair of subsets, `EDGE_SET_A` (UR UF UL UB DR DF) and
+`EDGE_SET_B` (DL DB FR FL BL BR), are disjoint and together cover all
+12 edges. Build them with:
+
+    python -m src.heuristics.build_edge_subset_pdb
+
+Without a built table, `h` falls back to the max of two tiny BFS tables
+over each half of the subset.
+"""
+
+from __future__ import annotations
+import math
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .coordinate_bfs import SearchSpace, bfs_distances
+from .pattern_database import NibblePatternDatabase
+from ..cube.coordinates import EdgeSubset
+from ..cube.cube_state import CubeState
+from ..cube.cubie import EDGE_COLORS, EDGE_FACELETS
+
+
+EDGE_SET_A: Tuple[int, ...] = (0, 1, 2, 3, 4, 5)
+EDGE_SET_B: Tuple[int, ...] = (6, 7, 8, 9, 10, 11)
+
+
+def _default_db_path(edges: Sequence[int]) -> str:
+    here = os.path.dirname(__file__)
+    project_root = os.path.abspath(os.path.join(here, "..", ".."))
+    name = "edge_subset_" + "_".join(map(str, edges)) + ".pdb"
+    return os.path.join(project_root, "data", "pattern_dbs", name)
+
+
+# "".join of an edge position's two stickers -> (cubie, flip)
+_EDGE_KEYS: Dict[str, Tuple[int, int]] = {}
+for _j, (_a, _b) in enumerate(EDGE_COLORS):
+    _EDGE_KEYS[_a + _b] = (_j, 0)
+    _EDGE_KEYS[_b + _a] = (_j, 1)
+
+
+def edge_cubies(state: CubeState) -> Tuple[List[int], List[int]]:
+    """(position, flip) of every edge cubie, read from the facelets.
+
+    Assumes stickers are face letters, as for any state reached from
+    `CubeState.solved()`.
+    """
+    s = state.to_string()
+    where = [0] * 12
+    flips = [0] * 12
+    for pos, (a, b) in enumerate(EDGE_FACELETS):
+        j, ori = _EDGE_KEYS[s[a] + s[b]]
+        where[j] = pos
+        flips[j] = ori
+    return where, flips
+
+
+def subset_index(
+    edges: Sequence[int], where: Sequence[int], flips: Sequence[int]
+) -> int:
+    """`EdgeSubsetSpace` index from per-edge positions and flips."""
+    k = len(edges)
+    rank = 0
+    ori = 0
+    seen: List[int] = []
+    for i, e in enumerate(edges):
+        p = where[e]
+        rank += (p - sum(1 for q in seen if q < p)) * math.perm(11 - i, k - 1 - i)
+        seen.append(p)
+        ori = (ori << 1) | flips[e]
+    return (rank << k) | ori
+
+
+class EdgeSubsetSpace(SearchSpace):
+    """BFS space of (ordered positions, flips) of a set of edges."""
+
+    def __init__(self, edges: Sequence[int]):
+        self.edges = tuple(edges)
+        self.k = len(self.edges)
+        self.positions = EdgeSubset(self.edges)
+        self.size = self.positions.size << self.k
+        self._pos_table: Optional[np.ndarray] = None
+        self._flip_table: Optional[np.ndarray] = None
+
+    @property
+    def solved(self) -> int:
+        return self.positions.solved << self.k
+
+    def successors(self, index: np.ndarray, move: int) -> np.ndarray:
+        if self._pos_table is None:
+            self._pos_table = np.asarray(self.positions.move_table(), dtype=np.int64)
+            self._flip_table = self.positions.flip_table().astype(np.int64)
+        pos = index >> self.k
+        flips = index & ((1 << self.k) - 1)
+        return (self._pos_table[pos, move] << self.k) | (
+            flips ^ self._flip_table[pos, move]
+        )
+
+
+class EdgeSubsetPDB(NibblePatternDatabase):
+    def __init__(
+        self,
+        edges: Sequence[int] = EDGE_SET_A,
+        db_path: str | None = None,
+    ):
+        self.edges = tuple(edges)
+        self.k = len(self.edges)
+        self.size = math.perm(12, self.k) << self.k
+        self.encoding = "edge_subset:" + ",".join(map(str, self.edges))
+        self._fallback_parts: Optional[List[Tuple[Tuple[int, ...], np.ndarray]]] = None
+        if db_path is None:
+            db_path = _default_db_path(self.edges)
+        super().__init__(db_path=db_path)
+
+    def space(self) -> EdgeSubsetSpace:
+        return EdgeSubsetSpace(self.edges)
+
+    def encode(self, state: CubeState) -> int:
+        where, flips = edge_cubies(state)
+        return subset_index(self.edges, where, flips)
+
+    def fallback(self, state: CubeState) -> int:
+        if self.k < 2:
+            return 0
+        if self._fallback_parts is None:
+            half = self.k // 2
+            self._fallback_parts = []
+            for sub in (self.edges[:half], self.edges[half:]):
+                dist = bfs_distances(EdgeSubsetSpace(sub))
+                self._fallback_parts.append((sub, dist))
+        where, flips = edge_cubies(state)
+        return max(
+            int(dist[subset_index(sub, where, flips)])
+            for sub, dist in self._fallback_parts
+        )
@@ -1,50 +1,241 @@
 """
 Pattern Database (PDB) base class.
 
-This file provides the interface and simple on-disk caching helpers.
-You can plug in more sophisticated PDB construction later.
+This file provides the interface and the on-disk loading/saving glue;
+the file layout itself lives in `pdb_format`.
 """
 
 from __future__ import annotations
 import os
-import pickle
 from abc import ABC, abstractmethod
-from typing import Dict, Tuple
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from .pdb_format import PDBHeader, open_pdb, write_pdb
 from ..cube.cube_state import CubeState
+from ..cube.symmetry import Symmetry, canonical
 
 
 class PatternDatabase(ABC):
     """
     Base class for pattern databases.
 
-    For now:
-    - `table` maps compressed state -> distance
-    - `h(state)` falls back to 0 if table is empty.
+    - `encode(state)` maps a state to an index in `range(size)`.
+    - `table` is the packed distance array (`entry_width` bits per
+      entry, `unknown` for patterns never reached). It is memory-mapped
+      from `db_path` on first use, normally the first `h` call, so
+      creating a PDB costs nothing.
+    - `h(state)` returns `fallback(state)` (0 unless overridden) when
+      there is no table or the entry is unknown.
+
+    `encoding` names the index scheme and is stored in the file header;
+    a file written for a different scheme is rejected on load, and so is
+    one whose payload fails its checksum unless `verify_on_load` is
+    turned off.
+
+    A `pdb_registry.PDBRegistry` can publish the table to other
+    processes; pickling a database then sends a reference (`shared`)
+    instead of the table. A table mapped from `db_path` is never pickled
+    either: the receiving process maps the file itself.
+
+    If the pattern is invariant under some cube symmetries, subclasses
+    set `symmetries` and the table holds one entry per symmetry class,
+    keyed by `canonical_key`.
     """
 
+    symmetries: Optional[Sequence[Symmetry]] = None
+    entry_width: int = 8
+    verify_on_load: bool = True
+    encoding: str = ""
+    size: int = 0
+
     def __init__(self, db_path: str | None = None):
-        self.table: Dict[Tuple, int] = {}
         self.db_path = db_path
-        if db_path is not None and os.path.exists(db_path):
-            self._load()
+        self.header: Optional[PDBHeader] = None
+        # Reference to the published table (see `pdb_registry`)
+        self.shared = None
+        self._table: Optional[np.ndarray] = None
+        self._opened = False
+
+    @property
+    def table(self) -> Optional[np.ndarray]:
+        if not self._opened:
+            self._opened = True
+            if self.shared is not None:
+                self._table = self.shared.attach()
+            elif self.db_path is not None and os.path.exists(self.db_path):
+                self._load()
+        return self._table
+
+    @table.setter
+    def table(self, table: Optional[np.ndarray]) -> None:
+        self._table = table
+        self._opened = True
+        self.shared = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        if self.shared is not None or isinstance(self._table, np.memmap):
+            # Attached or mapped again on first use, not copied.
+            state["_table"] = None
+            state["_opened"] = False
+        return state
+
+    @property
+    def loaded(self) -> bool:
+        return self.table is not None
+
+    @property
+    def unknown(self) -> int:
+        return (1 << self.entry_width) - 1
 
     @abstractmethod
-    def encode(self, state: CubeState) -> Tuple:
-        """Encode a cube state into a compact key."""
+    def encode(self, state: CubeState) -> int:
+        """Encode a cube state into a table index."""
         raise NotImplementedError
 
+    def canonical_key(self, state: CubeState) -> int:
+        """`encode` of the symmetry-class representative of `state`."""
+        if self.symmetries is None:
+            return self.encode(state)
+        rep, _ = canonical(state, self.symmetries)
+        return self.encode(rep)
+
+    def lookup(self, index: int) -> int:
+        """Entry at `index` (table must be loaded)."""
+        return int(self.table[index])
+
+    def fallback(self, state: CubeState) -> int:
+        return 0
+
     def h(self, state: CubeState) -> int:
-        """Lookup heuristic value. Defaults to 0 if not found."""
-        key = self.encode(state)
-        return self.table.get(key, 0)
+        """Lookup heuristic value; `fallback` if not found."""
+        if self.table is None:
+            return self.fallback(state)
+        dist = self.lookup(self.canonical_key(state))
+        return self.fallback(state) if dist == self.unknown else dist
+
+    def space(self):
+        """The `SearchSpace` whose indices `encode` returns.
+
+        Databases over integer coordinates implement this so they can be
+        built by `pdb_builder.PDBBuilder`.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not index a coordinate space"
+        )
 
     def _load(self) -> None:
-        with open(self.db_path, "rb") as f:
-            self.table = pickle.load(f)
+        header, table = open_pdb(self.db_path, verify=self.verify_on_load)
+        expected = (self.encoding, self.entry_width, self.size)
+        found = (header.encoding, header.entry_width, header.count)
+        if found != expected:
+            raise ValueError(
+                f"{self.db_path} holds {found} (encoding, entry width, count), "
+                f"expected {expected}"
+            )
+        self.header = header
+        self._table = table
 
-    def save(self) -> None:
+    def save(self, params: Dict[str, Any] | None = None) -> None:
+        """Write `table` to `db_path`; `params` records how it was generated."""
         if self.db_path is None:
             raise ValueError("db_path is not set")
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        with open(self.db_path, "wb") as f:
-            pickle.dump(self.table, f)
+        if self.table is None:
+            raise ValueError("No table to save")
+        self.header = write_pdb(
+            self.db_path,
+            self.table,
+            encoding=self.encoding,
+            entry_width=self.entry_width,
+            count=self.size,
+            params=params,
+        )
+
+
+# Nibble-packed tables
+#
+# Large PDBs are dense arrays of small distances indexed by an integer
+# coordinate. Two 4-bit distances share a byte: entry i lives in the low
+# nibble of byte i // 2 when i is even and in the high nibble when odd.
+# 0xF marks an entry that has not been reached.
+
+NIBBLE_UNKNOWN = 0xF
+
+
+def pack_nibbles(dist: np.ndarray) -> np.ndarray:
+    """Pack a uint8 array of distances (< 16) into half as many bytes."""
+    dist = np.asarray(dist, dtype=np.uint8)
+    if dist.size % 2:
+        dist = np.append(dist, np.uint8(NIBBLE_UNKNOWN))
+    return (dist[0::2] & 0xF) | ((dist[1::2] & 0xF) << 4)
+
+
+def unpack_nibbles(packed: np.ndarray, size: int) -> np.ndarray:
+    """Inverse of `pack_nibbles`."""
+    packed = np.asarray(packed, dtype=np.uint8)
+    dist = np.empty(packed.size * 2, dtype=np.uint8)
+    dist[0::2] = packed & 0xF
+    dist[1::2] = packed >> 4
+    return dist[:size]
+
+
+class NibblePatternDatabase(PatternDatabase):
+    """
+    Pattern database backed by a nibble-packed array.
+
+    `encode` returns an index in `range(size)`. Tables built here are
+    complete, so `h` never sees an unknown entry. Without a table, `h`
+    returns `fallback(state)`, which subclasses can make stronger than 0.
+    """
+
+    entry_width = 4
+
+    @abstractmethod
+    def encode(self, state: CubeState) -> int:
+        raise NotImplementedError
+
+    def lookup(self, index: int) -> int:
+        """Distance stored at `index` (table must be loaded)."""
+        byte = int(self.table[index >> 1])
+        return byte >> 4 if index & 1 else byte & 0xF
+
+    def h(self, state: CubeState) -> int:
+        if self.table is None:
+            return self.fallback(state)
+        return self.lookup(self.encode(state))
+
+    def build(
+        self, resume: bool = True, verbose: bool = True, workers: int | None = 1
+    ) -> None:
+        """BFS the whole `space()` and save the table.
+
+        With `resume`, progress is checkpointed next to `db_path` after
+        every layer and an interrupted build continues from there.
+        `workers` > 1 (or None for every core) shares each layer out to
+        a process pool.
+        """
+        from .pdb_builder import PDBBuilder
+
+        builder = PDBBuilder(
+            self.space(),
+            checkpoint_path=self.db_path if resume else None,
+            verbose=verbose,
+            workers=workers,
+        )
+        dist = builder.run()
+        unreached = int(np.count_nonzero(dist == NIBBLE_UNKNOWN))
+        if unreached:
+            raise RuntimeError(f"{unreached} states were not reached")
+        self.set_distances(dist)
+        self.save(
+            params={"builder": "bfs", "moves": "htm", "max_depth": int(dist.max())}
+        )
+        builder.remove_checkpoint()
+
+    def set_distances(self, dist: np.ndarray) -> None:
+        """Install an unpacked distance array of length `size`."""
+        if dist.shape != (self.size,):
+            raise ValueError(f"Expected {self.size} distances, got {dist.shape}")
+        self.table = pack_nibbles(dist)
@@ -0,0 +1,206 @@
+"""
+Resumable layered BFS for coordinate pattern databases.
+
+`PDBBuilder` runs the same layer-by-layer BFS as `bfs_distances`
+(forward expansion while the frontier is small, the backward check once
+it is larger than the unreached set), but keeps the byte-per-state
+working array in a memory-mapped checkpoint file next to the database:
+
+    <db_path>.partial.npy    working distances (unknown = NIBBLE_UNKNOWN)
+    <db_path>.partial.json   {"size": ..., "depth": last finished layer}
+
+After each layer the array is flushed and the JSON rewritten atomically,
+so a killed build resumes from the last finished layer. Entries of a
+half-finished layer are already correct (they only ever get depth+1
+from a depth neighbour), so redoing that layer simply completes it.
+
+Any `NibblePatternDatabase` that implements `space()` builds through
+this with `pdb.build()`; the result is nibble-packed and saved with
+`pdb.save()`, and the checkpoint is removed.
+
+With `workers > 1` every layer is split into index ranges handled by a
+process pool. The working array is a file-backed shared mapping (the
+checkpoint file, or a scratch file in /dev/shm when not checkpointing)
+that every worker maps read-write. A layer only ever writes the value
+depth+1 into unknown entries, so concurrent writes need no locking and
+the result is byte-identical to a serial build.
+"""
+
+from __future__ import annotations
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .coordinate_bfs import SearchSpace, backward_step, choose_step, forward_step
+from .pattern_database import NIBBLE_UNKNOWN
+
+
+# Per-process worker state, set by _init_worker.
+_SPACE: Optional[SearchSpace] = None
+_DIST: Optional[np.ndarray] = None
+
+
+def _init_worker(space: SearchSpace, array_path: str) -> None:
+    global _SPACE, _DIST
+    _SPACE = space
+    _DIST = np.load(array_path, mmap_mode="r+")
+
+
+def _run_shard(task: Tuple[bool, int, int, int, int, int]) -> None:
+    backward, depth, unknown, chunk_size, lo, hi = task
+    step = backward_step if backward else forward_step
+    step(_SPACE, _DIST, depth, unknown, chunk_size, lo, hi)
+
+
+def _scratch_dir() -> str | None:
+    """tmpfs when available, so the shared array never touches disk."""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class PDBBuilder:
+    def __init__(
+        self,
+        space: SearchSpace,
+        checkpoint_path: str | None = None,
+        unknown: int = NIBBLE_UNKNOWN,
+        chunk_size: int = 1 << 22,
+        verbose: bool = True,
+        workers: int | None = 1,
+    ):
+        """
+        checkpoint_path : prefix of the checkpoint files (None: in memory,
+                          not resumable).
+        workers         : processes per layer (None: every core).
+        """
+        self.space = space
+        self.checkpoint_path = checkpoint_path
+        self.unknown = unknown
+        self.chunk_size = chunk_size
+        self.verbose = verbose
+        self.workers = workers or os.cpu_count() or 1
+        self._scratch: str | None = None
+
+    @property
+    def _array_path(self) -> str:
+        if self._scratch is not None:
+            return os.path.join(self._scratch, "dist.npy")
+        return self.checkpoint_path + ".partial.npy"
+
+    @property
+    def _meta_path(self) -> str:
+        return self.checkpoint_path + ".partial.json"
+
+    def _log(self, msg: str) -> None:
+        if self.verbose:
+            print(msg)
+
+    def _resume(self) -> Optional[tuple]:
+        if self.checkpoint_path is None or not os.path.exists(self._meta_path):
+            return None
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        if meta.get("size") != self.space.size or meta.get("unknown") != self.unknown:
+            self._log("Ignoring checkpoint for a different table")
+            return None
+        dist = np.load(self._array_path, mmap_mode="r+")
+        return dist, int(meta["depth"])
+
+    def _start(self) -> tuple:
+        resumed = self._resume()
+        if resumed is not None:
+            self._log(f"Resuming after depth {resumed[1]}")
+            return resumed
+
+        if self.checkpoint_path is None and self.workers > 1:
+            self._scratch = tempfile.mkdtemp(prefix="pdb_build_", dir=_scratch_dir())
+        if self.checkpoint_path is None and self._scratch is None:
+            dist = np.full(self.space.size, self.unknown, dtype=np.uint8)
+        else:
+            os.makedirs(os.path.dirname(self._array_path) or ".", exist_ok=True)
+            dist = np.lib.format.open_memmap(
+                self._array_path, mode="w+", dtype=np.uint8, shape=(self.space.size,)
+            )
+            dist[:] = self.unknown
+        dist[self.space.solved] = 0
+        self._checkpoint(dist, 0)
+        return dist, 0
+
+    def _checkpoint(self, dist: np.ndarray, depth: int) -> None:
+        if self.checkpoint_path is None:
+            return
+        dist.flush()
+        meta = {"size": self.space.size, "unknown": self.unknown, "depth": depth}
+        tmp = self._meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._meta_path)
+
+    def run(self, max_depth: int | None = None) -> np.ndarray:
+        """Distances of every state (in memory), resuming if possible."""
+        if max_depth is None:
+            max_depth = self.unknown - 1
+        dist, depth = self._start()
+
+        pool = None
+        if self.workers > 1:
+            dist.flush()
+            pool = multiprocessing.Pool(
+                self.workers,
+                initializer=_init_worker,
+                initargs=(self.space, self._array_path),
+            )
+        try:
+            t0 = time.time()
+            while depth < max_depth:
+                reached = self._layer(dist, depth, pool)
+                if reached == 0:
+                    break
+                depth += 1
+                self._checkpoint(dist, depth)
+                self._log(
+                    f"depth={depth}, new states={reached}, "
+                    f"time={time.time() - t0:.1f}s"
+                )
+            return np.array(dist)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            if self._scratch is not None:
+                del dist
+                shutil.rmtree(self._scratch, ignore_errors=True)
+                self._scratch = None
+
+    def _layer(self, dist: np.ndarray, depth: int, pool) -> int:
+        """Fill in layer depth+1; returns its size."""
+        step = choose_step(dist, depth, self.unknown)
+        if step is None:
+            return 0
+        if pool is None:
+            step(self.space, dist, depth, self.unknown, self.chunk_size)
+        else:
+            # More shards than workers evens out dense and sparse ranges.
+            bounds = np.linspace(0, dist.size, 4 * self.workers + 1).astype(int)
+            backward = step is backward_step
+            pool.map(
+                _run_shard,
+                [
+                    (backward, depth, self.unknown, self.chunk_size, lo, hi)
+                    for lo, hi in zip(bounds[:-1], bounds[1:])
+                ],
+                chunksize=1,
+            )
+        return int(np.count_nonzero(dist == depth + 1))
+
+    def remove_checkpoint(self) -> None:
+        if self.checkpoint_path is None:
+            return
+        for path in (self._meta_path, self._array_path):
+            if os.path.exists(path):
+                os.remove(path)
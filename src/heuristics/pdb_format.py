@@ -0,0 +1,178 @@
+"""
+On-disk format of pattern databases.
+
+A PDB file is a fixed little-endian header, the generator parameters as
+JSON, zero padding up to a 64-byte boundary, and then the table itself
+as a raw packed array:
+
+    offset  size    field
+    0       8       magic        MAGIC
+    8       2       version      FORMAT_VERSION (newer files are rejected)
+    10      1       entry_width  bits per entry: 4 or 8
+    11      1       reserved     0
+    12      32      encoding     ASCII id of the index scheme, NUL padded
+    44      8       count        number of entries
+    52      8       nbytes       payload size in bytes
+    60      4       crc32        zlib.crc32 of the payload
+    64      4       params_len   length of the JSON parameters
+    68      ...     params       UTF-8 JSON: how the table was generated
+    ...             padding      zeros up to `offset` (next multiple of 64)
+    offset  nbytes  payload
+
+Entry i of an 8-bit table is byte i. In a 4-bit table it is the low
+nibble of byte i // 2 for even i and the high nibble for odd i (see
+`pack_nibbles`). The all-ones value (0xF / 0xFF) marks unreached entries.
+
+The encoding id names what the entries are indexed by (e.g. which edges
+an edge-subset PDB tracks), so a database refuses a file built for a
+different abstraction instead of returning nonsense distances.
+
+`open_pdb` memory-maps the payload read-only and by default checks it
+against its checksum once, which reads the whole payload (about 50 ms
+for the 44 MB corner table). Callers that map a file someone already
+verified pass `verify=False` and only pay for the entries they touch.
+The file size must always match the header exactly.
+"""
+
+from __future__ import annotations
+import json
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from ..utils.atomic import atomic_write
+
+
+MAGIC = b"\x89RCPDB\r\n"
+FORMAT_VERSION = 1
+ENTRY_WIDTHS = (4, 8)
+
+_HEADER = struct.Struct("<8sHBx32sQQII")
+_ALIGN = 64
+_CRC_CHUNK = 1 << 24
+
+
+@dataclass(frozen=True)
+class PDBHeader:
+    version: int
+    entry_width: int
+    encoding: str
+    count: int
+    nbytes: int
+    crc32: int
+    params: Dict[str, Any] = field(default_factory=dict)
+    # Byte offset of the payload.
+    offset: int = 0
+
+
+def packed_size(count: int, entry_width: int) -> int:
+    """Bytes needed for `count` entries of `entry_width` bits."""
+    if entry_width not in ENTRY_WIDTHS:
+        raise ValueError(f"Unsupported entry width: {entry_width}")
+    return (count * entry_width + 7) // 8
+
+
+def _crc32(data: memoryview) -> int:
+    crc = 0
+    for start in range(0, len(data), _CRC_CHUNK):
+        crc = zlib.crc32(data[start : start + _CRC_CHUNK], crc)
+    return crc
+
+
+def write_pdb(
+    path: str,
+    table: np.ndarray,
+    encoding: str,
+    entry_width: int,
+    count: int,
+    params: Dict[str, Any] | None = None,
+) -> PDBHeader:
+    """Write a packed table atomically; returns the header written."""
+    payload = np.ascontiguousarray(table, dtype=np.uint8).reshape(-1)
+    if payload.size != packed_size(count, entry_width):
+        raise ValueError(
+            f"{count} entries of {entry_width} bits need "
+            f"{packed_size(count, entry_width)} bytes, got {payload.size}"
+        )
+    name = encoding.encode("ascii")
+    if len(name) > 32:
+        raise ValueError(f"Encoding id longer than 32 bytes: {encoding!r}")
+    params = dict(params or {})
+    meta = json.dumps(params, sort_keys=True).encode("utf-8")
+    offset = -(-(_HEADER.size + len(meta)) // _ALIGN) * _ALIGN
+
+    data = memoryview(payload)
+    header = PDBHeader(
+        FORMAT_VERSION, entry_width, encoding, count, payload.size,
+        _crc32(data), params, offset,
+    )
+    fixed = _HEADER.pack(
+        MAGIC, header.version, entry_width, name, count,
+        header.nbytes, header.crc32, len(meta),
+    )
+
+    with atomic_write(path, suffix=".pdb.tmp") as f:
+        f.write(fixed)
+        f.write(meta)
+        f.write(bytes(offset - len(fixed) - len(meta)))
+        f.write(data)
+    return header
+
+
+def read_header(path: str) -> PDBHeader:
+    """Parse and sanity-check the header of a PDB file."""
+    with open(path, "rb") as f:
+        fixed = f.read(_HEADER.size)
+        if len(fixed) < _HEADER.size or not fixed.startswith(MAGIC):
+            raise ValueError(
+                f"{path} is not a PDB file "
+                "(old files convert with `python -m src.heuristics.convert_pdb`)"
+            )
+        _, version, width, name, count, nbytes, crc, params_len = _HEADER.unpack(fixed)
+        if version > FORMAT_VERSION:
+            raise ValueError(
+                f"{path} has format version {version}, newer than this code"
+            )
+        meta = f.read(params_len)
+        if len(meta) < params_len:
+            raise ValueError(f"{path} is truncated")
+
+    if nbytes != packed_size(count, width):
+        raise ValueError(f"{path}: payload size does not match {count} entries")
+    offset = -(-(_HEADER.size + params_len) // _ALIGN) * _ALIGN
+    size = os.path.getsize(path)
+    if size < offset + nbytes:
+        raise ValueError(f"{path} is truncated")
+    if size > offset + nbytes:
+        raise ValueError(f"{path} has {size - offset - nbytes} bytes past its payload")
+    return PDBHeader(
+        version, width, name.rstrip(b"\0").decode("ascii"), count, nbytes,
+        crc, json.loads(meta.decode("utf-8")), offset,
+    )
+
+
+def open_pdb(path: str, verify: bool = True) -> Tuple[PDBHeader, np.ndarray]:
+    """(header, read-only memory-mapped payload) of a PDB file.
+
+    `verify=False` skips the checksum, for files already verified.
+    """
+    header = read_header(path)
+    if header.nbytes == 0:
+        table = np.zeros(0, dtype=np.uint8)
+    else:
+        table = np.memmap(
+            path, dtype=np.uint8, mode="r", offset=header.offset, shape=(header.nbytes,)
+        )
+    if verify and _crc32(memoryview(table)) != header.crc32:
+        raise ValueError(f"{path}: checksum mismatch")
+    return header, table
+
+
+def verify_pdb(path: str) -> bool:
+    """Does the payload of `path` match its checksum?"""
+    header, table = open_pdb(path, verify=False)
+    return _crc32(memoryview(table)) == header.crc32
@@ -0,0 +1,135 @@
+"""
+Sharing pattern database tables between worker processes.
+
+Every process that loads a `PatternDatabase` normally holds its own copy
+of the table. A `PDBRegistry` publishes each table once:
+
+  - tables read from a `.pdb` file are already a read-only shared
+    mapping of that file, so only its path and offset are published and
+    every process maps the same page-cache pages;
+  - tables built in memory are copied once into a
+    `multiprocessing.shared_memory` segment.
+
+Either way the database is left holding a `SharedTable` reference, and
+pickling it (e.g. inside a `solver_factory` for `solve_many`, or a
+`functools.partial(IDAStarSolver, heuristic=pdb.h)`) sends only that
+reference. The receiving process attaches by name on first lookup,
+without copying:
+
+    with PDBRegistry() as registry:
+        registry.publish(corner_pdb, edge_a, edge_b)
+        results = solve_many(states, partial(IDAStarSolver, heuristic=h),
+                             workers=os.cpu_count())
+
+Segments are owned by the registry: `close()` (or leaving the `with`
+block, or interpreter exit) unlinks them. Workers must be done with the
+tables by then; mappings that are still open stay valid until released,
+but no new process can attach.
+"""
+
+from __future__ import annotations
+import weakref
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List
+
+import numpy as np
+
+from .pattern_database import PatternDatabase
+
+
+@dataclass(frozen=True)
+class SharedTable:
+    """Picklable reference to a published table."""
+
+    kind: str  # "file" or "shm"
+    name: str  # file path or shared memory segment name
+    offset: int
+    nbytes: int
+
+    def attach(self) -> np.ndarray:
+        """Read-only view of the table, mapped into this process."""
+        if self.kind == "file":
+            # Verified when the publishing process loaded it.
+            return np.memmap(
+                self.name,
+                dtype=np.uint8,
+                mode="r",
+                offset=self.offset,
+                shape=(self.nbytes,),
+            )
+        shm = _ATTACHED.get(self.name)
+        if shm is None:
+            shm = _ATTACHED[self.name] = shared_memory.SharedMemory(name=self.name)
+        table = np.ndarray(
+            (self.nbytes,), dtype=np.uint8, buffer=shm.buf, offset=self.offset
+        )
+        table.flags.writeable = False
+        return table
+
+
+# Segments this process has attached to, kept open for the life of the
+# process (the arrays returned by `attach` point into them).
+_ATTACHED: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _release(segments: List[shared_memory.SharedMemory]) -> None:
+    for shm in segments:
+        try:
+            shm.close()
+        except BufferError:
+            # Arrays in this process still view it; unmapped once they go.
+            pass
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    segments.clear()
+
+
+class PDBRegistry:
+    """Publishes PDB tables once for any number of worker processes."""
+
+    def __init__(self):
+        self.tables: Dict[str, SharedTable] = {}
+        self._segments: List[shared_memory.SharedMemory] = []
+        self._finalizer = weakref.finalize(self, _release, self._segments)
+
+    def publish(self, *pdbs: PatternDatabase) -> List[SharedTable]:
+        """Share the (loaded) tables of `pdbs`; returns their references."""
+        refs = []
+        for pdb in pdbs:
+            ref = pdb.shared
+            if ref is None:
+                ref = self._share(pdb)
+                pdb.table = ref.attach()
+                pdb.shared = ref
+            self.tables[pdb.encoding] = ref
+            refs.append(ref)
+        return refs
+
+    def _share(self, pdb: PatternDatabase) -> SharedTable:
+        table = pdb.table
+        if table is None:
+            raise ValueError(f"{type(pdb).__name__} has no table to publish")
+        if isinstance(table, np.memmap) and pdb.header is not None:
+            header = pdb.header
+            return SharedTable("file", pdb.db_path, header.offset, header.nbytes)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(table.nbytes, 1))
+        self._segments.append(shm)
+        view = np.ndarray((table.nbytes,), dtype=np.uint8, buffer=shm.buf)
+        view[:] = np.asarray(table, dtype=np.uint8).reshape(-1)
+        del view
+        return SharedTable("shm", shm.name, 0, table.nbytes)
+
+    def close(self) -> None:
+        """Unlink every segment this registry created."""
+        self._finalizer()
+        self.tables.clear()
+
+    def __enter__(self) -> "PDBRegistry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
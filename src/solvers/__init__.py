@@ -1,5 +1,18 @@
-from .base_solver import BaseSolver
-from .iddfs_solver import IDDFSSolver
-from .ida_star_solver import IDAStarSolver
+from ..utils.lazy import attach
 
-__all__ = ["BaseSolver", "IDDFSSolver", "IDAStarSolver"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "BaseSolver": ".base_solver",
+        "SearchStats": ".search_stats",
+        "IDDFSSolver": ".iddfs_solver",
+        "IDAStarSolver": ".ida_star_solver",
+        "ParallelIDAStarSolver": ".parallel_ida_star_solver",
+        "TwoPhaseSolver": ".two_phase_solver",
+        "ThistlethwaiteSolver": ".thistlethwaite_solver",
+        "BidirectionalSolver": ".bidirectional_solver",
+        "SolveResult": ".batch",
+        "solve_many": ".batch",
+        "iter_solve_many": ".batch",
+    },
+)
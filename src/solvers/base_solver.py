@@ -4,13 +4,31 @@ Abstract solver interface.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
+from .search_stats import SearchStats
 from ..cube.cube_state import CubeState
 
 
 class BaseSolver(ABC):
     """Abstract base class for Rubik's Cube solvers."""
 
+    _stats: Optional[SearchStats] = None
+
+    @property
+    def stats(self) -> SearchStats:
+        """Statistics of the last `solve` (see `search_stats`).
+
+        Assign a configured `SearchStats` to collect per-node details or
+        install callbacks; `solve` resets it but keeps the configuration.
+        """
+        if self._stats is None:
+            self._stats = SearchStats()
+        return self._stats
+
+    @stats.setter
+    def stats(self, value: SearchStats) -> None:
+        self._stats = value
+
     @abstractmethod
     def solve(self, start: CubeState) -> List[str]:
         """Return a sequence of moves that solves the cube."""
@@ -0,0 +1,198 @@
+"""
+Batch solving across a process pool.
+
+    results = solve_many(states, make_solver, workers=8, timeout=5.0)
+
+`solver_factory` is called once per worker process, on its first item,
+so heuristic tables are loaded once per worker rather than once per
+cube. If it raises, every item of that worker fails with its error
+(workers never die in the pool's initializer, which would make the pool
+respawn them forever). It must be picklable (a module-level function, a
+class, or a `functools.partial` of one). Tables published with
+`heuristics.pdb_registry.PDBRegistry` before the call are attached by
+every worker instead of copied.
+
+Every item produces a `SolveResult` with its wall time, the nodes the
+whole solve expanded (`solver.stats.nodes`, every iteration included),
+the full `SearchStats.as_dict()` summary, and an error string instead
+of a solution when the solve failed. `timeout` bounds each item
+separately: a pathological state is abandoned with an error and the
+worker moves on to the next item. The per-item timeout uses SIGALRM and
+is therefore only enforced on Unix, from a process's main thread. With
+`workers=1` the items are solved in the calling process, so there the
+timeout temporarily installs a SIGALRM handler and an ITIMER_REAL timer
+of the caller's own (both restored after every item); do not combine
+it with other users of SIGALRM or `setitimer`.
+"""
+
+from __future__ import annotations
+import multiprocessing
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .base_solver import BaseSolver
+from ..cube.cube_state import CubeState
+from ..cube.packed_state import PackedCubeState
+
+
+SolverFactory = Callable[[], BaseSolver]
+StateLike = Union[CubeState, PackedCubeState, str]
+
+
+@dataclass
+class SolveResult:
+    index: int
+    solution: Optional[List[str]]
+    elapsed: float
+    # Whole solve, all iterations (SearchStats.nodes).
+    nodes_expanded: Optional[int] = None
+    error: Optional[str] = None
+    stats: Optional[Dict[str, Any]] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _ItemTimeout(BaseException):
+    # Not an Exception: a solver's own `except Exception` must not
+    # swallow it.
+    pass
+
+
+@contextmanager
+def _time_limit(seconds: Optional[float]):
+    usable = (
+        seconds is not None
+        and hasattr(signal, "SIGALRM")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if not usable:
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise _ItemTimeout
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        try:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        finally:
+            # Restored even if the alarm fires just before it is disarmed.
+            signal.signal(signal.SIGALRM, previous)
+
+
+# Per-process worker state, set by _init_worker; the solver is built by
+# _solver on the first item.
+_FACTORY: Optional[SolverFactory] = None
+_SOLVER: Optional[BaseSolver] = None
+_FACTORY_ERROR: Optional[str] = None
+_TIMEOUT: Optional[float] = None
+
+
+def _init_worker(solver_factory: SolverFactory, timeout: Optional[float]) -> None:
+    global _FACTORY, _SOLVER, _FACTORY_ERROR, _TIMEOUT
+    _FACTORY = solver_factory
+    _SOLVER = None
+    _FACTORY_ERROR = None
+    _TIMEOUT = timeout
+
+
+def _solver() -> Optional[BaseSolver]:
+    """This process's solver, built once; None if the factory failed."""
+    global _SOLVER, _FACTORY_ERROR
+    if _SOLVER is None and _FACTORY_ERROR is None:
+        try:
+            _SOLVER = _FACTORY()
+        except Exception as exc:
+            _FACTORY_ERROR = f"solver_factory failed: {type(exc).__name__}: {exc}"
+    return _SOLVER
+
+
+def _solve_one(task: Tuple[int, str]) -> SolveResult:
+    index, facelets = task
+    solver = _solver()
+    if solver is None:
+        return SolveResult(index, None, 0.0, error=_FACTORY_ERROR)
+    solution: Optional[List[str]] = None
+    error: Optional[str] = None
+
+    t0 = time.perf_counter()
+    try:
+        with _time_limit(_TIMEOUT):
+            solution = solver.solve(CubeState.from_string(facelets))
+    except _ItemTimeout:
+        error = f"timed out after {_TIMEOUT}s"
+    except Exception as exc:  # report, don't kill the batch
+        error = f"{type(exc).__name__}: {exc}"
+    elapsed = time.perf_counter() - t0
+
+    return SolveResult(
+        index=index,
+        solution=solution,
+        elapsed=elapsed,
+        nodes_expanded=solver.stats.nodes,
+        error=error,
+        stats=solver.stats.as_dict(),
+    )
+
+
+def _to_facelets(state: StateLike) -> str:
+    return state if isinstance(state, str) else state.to_string()
+
+
+def iter_solve_many(
+    states: Iterable[StateLike],
+    solver_factory: SolverFactory,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    ordered: bool = False,
+    chunksize: int = 1,
+) -> Iterator[SolveResult]:
+    """Yield a `SolveResult` per state, as completed unless `ordered`.
+
+    `workers=None` uses every core; `workers=1` solves in this process.
+    """
+    tasks = [(i, _to_facelets(s)) for i, s in enumerate(states)]
+
+    if workers == 1:
+        _init_worker(solver_factory, timeout)
+        for task in tasks:
+            yield _solve_one(task)
+        return
+
+    with multiprocessing.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(solver_factory, timeout),
+    ) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(_solve_one, tasks, chunksize)
+
+
+def solve_many(
+    states: Iterable[StateLike],
+    solver_factory: SolverFactory,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    chunksize: int = 1,
+) -> List[SolveResult]:
+    """Solve every state; results are returned in input order."""
+    return list(
+        iter_solve_many(
+            states,
+            solver_factory,
+            workers=workers,
+            timeout=timeout,
+            ordered=True,
+            chunksize=chunksize,
+        )
+    )
@@ -0,0 +1,277 @@
+"""
+Bidirectional breadth-first (meet-in-the-middle) solver.
+
+Two BFS trees grow layer by layer, one from the start state and one from
+the solved state, always expanding the side with the smaller frontier.
+A solution exists as soon as a newly generated state is already known
+to the other side; the shortest stitch found in that layer is optimal.
+For a d-move scramble each side only reaches depth ~d/2, so the search
+touches about the square root of the states a one-sided search would.
+
+Each side keeps one layer per BFS depth in flat NumPy arrays: the
+layer's sorted 64-bit state keys, and for each state the index of its
+parent in the previous layer and the move that led to it (13 bytes per
+remembered state). Membership tests are binary searches in those sorted
+keys, and a path is walked back through the parent indices. Only the
+newest layer also keeps its states, packed into 18 bytes each
+(`batch_engine.pack_rows`); it is expanded in chunks with the vectorised
+batch engine, so no per-state Python objects are built. The half from
+the solved side is reversed and inverted to finish the path.
+
+Stickers are numbered by the face whose centre has their colour, so a
+start with other letters (a recoloured cube) is searched as usual.
+
+Past `max_states` remembered states the search gives up and the cube is
+handed to IDA*.
+"""
+
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .base_solver import BaseSolver
+from .ida_star_solver import Heuristic, IDAStarSolver
+from .search_stats import SearchStats
+from ..cube.batch_engine import (
+    CENTERS,
+    MOVE_PERMS,
+    NO_MOVE,
+    NON_CENTERS,
+    SOLVED_ROW,
+    pack_rows,
+    unpack_rows,
+)
+from ..cube.cube_state import CubeState
+from ..cube.move_generator import MOVE_NAMES
+from ..cube.packed_state import PackedCubeState
+from ..utils.move_pruning import CANONICAL_NEXT, MOVE_FACE
+from ..utils.validator import validate_solution
+
+
+# Last move index (NO_MOVE at the root) -> may each move follow it?
+_ALLOWED = np.array(
+    [[m in CANONICAL_NEXT[state] for m in range(NO_MOVE)] for state in MOVE_FACE]
+    + [[True] * NO_MOVE]
+)
+
+# Frontier rows expanded at once.
+_CHUNK = 1 << 14
+
+# The 48 moving stickers as two exact base-6 halves (6**24 < 2**63),
+# folded into one 64-bit key.
+_POW6 = np.uint64(6) ** np.arange(24, dtype=np.uint64)
+_FOLD = np.uint64(0x9E3779B97F4A7C15)
+
+
+def inverse_move(move: str) -> str:
+    if move.endswith("2"):
+        return move
+    if move.endswith("'"):
+        return move[0]
+    return move + "'"
+
+
+def _to_row(state: PackedCubeState) -> Optional[np.ndarray]:
+    """Face-index row of `state`, colours numbered by their centre.
+
+    None if the centres do not carry six distinct colours that cover
+    every sticker.
+    """
+    data = state.data
+    centres = bytes(data[i] for i in CENTERS)
+    if len(set(centres)) != 6 or not set(data) <= set(centres):
+        return None
+    codes = data.translate(bytes.maketrans(centres, bytes(range(6))))
+    return np.frombuffer(codes, dtype=np.uint8).copy()
+
+
+def _keys(cubes: np.ndarray) -> np.ndarray:
+    """64-bit key of every row of an (N, 54) face-index array."""
+    stickers = cubes[:, NON_CENTERS].astype(np.uint64)
+    return (stickers[:, :24] @ _POW6) * _FOLD ^ (stickers[:, 24:] @ _POW6)
+
+
+def _member(keys: np.ndarray, layer: np.ndarray) -> np.ndarray:
+    """Which `keys` occur in the sorted array `layer`."""
+    if not len(layer):
+        return np.zeros(len(keys), dtype=bool)
+    i = np.searchsorted(layer, keys)
+    return layer[np.minimum(i, len(layer) - 1)] == keys
+
+
+class _Side:
+    """One BFS tree: per-depth layers of keys and parent links."""
+
+    def __init__(self, root: np.ndarray):
+        self.keys: List[np.ndarray] = [_keys(root[None])]
+        # Parent's index in the previous layer, and the move from it.
+        self.parents: List[np.ndarray] = [np.zeros(1, dtype=np.uint32)]
+        self.moves: List[np.ndarray] = [np.full(1, NO_MOVE, dtype=np.uint8)]
+        # Newest layer's states (`pack_rows`), in the order of its keys.
+        self.frontier: np.ndarray = pack_rows(root[None])
+
+    @property
+    def depth(self) -> int:
+        return len(self.keys) - 1
+
+    @property
+    def size(self) -> int:
+        return sum(len(k) for k in self.keys)
+
+    def find(self, key: np.uint64) -> Tuple[int, int]:
+        """(depth, index) of the shallowest state with `key`."""
+        for depth, keys in enumerate(self.keys):
+            i = int(np.searchsorted(keys, key))
+            if i < len(keys) and keys[i] == key:
+                return depth, i
+        raise KeyError(key)
+
+    def path_to(self, key: np.uint64) -> List[str]:
+        """Moves from this side's root to the state with `key`."""
+        depth, index = self.find(key)
+        moves: List[str] = []
+        for d in range(depth, 0, -1):
+            moves.append(MOVE_NAMES[self.moves[d][index]])
+            index = int(self.parents[d][index])
+        moves.reverse()
+        return moves
+
+
+class _MemoryCap(Exception):
+    pass
+
+
+class BidirectionalSolver(BaseSolver):
+    def __init__(
+        self,
+        max_states: int = 2_000_000,
+        max_depth: int = 14,
+        heuristic: Optional[Heuristic] = None,
+    ):
+        """
+        max_states : states both sides may remember before falling back.
+        max_depth  : longest solution searched for bidirectionally.
+        heuristic  : heuristic of the IDA* fallback (default: Korf's
+                     corner + edge PDB max, loaded on first fallback).
+        """
+        self.max_states = max_states
+        self.max_depth = max_depth
+        self.heuristic = heuristic
+
+        # For instrumentation (optional)
+        self.nodes_expanded: int = 0
+        self.used_fallback: bool = False
+
+    def solve(self, start: CubeState) -> List[str]:
+        self.nodes_expanded = 0
+        self.used_fallback = False
+        self.stats.reset()
+        root = PackedCubeState.from_cube_state(start)
+        if root.is_solved():
+            return []
+        row = _to_row(root)
+        if row is None:
+            return self._fallback(start)
+
+        forward = _Side(row)
+        backward = _Side(SOLVED_ROW)
+        try:
+            while forward.depth + backward.depth < self.max_depth:
+                if len(forward.frontier) <= len(backward.frontier):
+                    grow, other = forward, backward
+                else:
+                    grow, other = backward, forward
+                meet = self._layer(grow, other)
+                if meet is not None:
+                    solution = forward.path_to(meet) + [
+                        inverse_move(m) for m in reversed(backward.path_to(meet))
+                    ]
+                    # A 64-bit key collision could stitch two different
+                    # states; never return an unchecked path.
+                    if validate_solution(start, solution):
+                        return solution
+        except _MemoryCap:
+            pass
+        return self._fallback(start)
+
+    def _layer(self, grow: _Side, other: _Side) -> Optional[np.uint64]:
+        """`_expand` recorded as one iteration of `stats`.
+
+        Its bound is the combined depth of both trees after the layer;
+        nodes per depth count from the root of the side that grew.
+        """
+        stats = self.stats
+        depth = grow.depth
+        before = self.nodes_expanded
+        it = stats.start_iteration(grow.depth + other.depth + 1)
+        try:
+            return self._expand(grow, other)
+        finally:
+            it.nodes = self.nodes_expanded - before
+            if stats.detailed:
+                stats.nodes_per_depth[depth] += it.nodes
+            stats.end_iteration()
+            if stats.on_nodes and self.nodes_expanded >= stats.next_report:
+                stats.report(self.nodes_expanded)
+
+    def _expand(self, grow: _Side, other: _Side) -> Optional[np.uint64]:
+        """Grow `grow` by one layer; return the best meeting key, if any."""
+        cap = self.max_states - grow.size - other.size
+        frontier = grow.frontier
+        last = grow.moves[-1]
+        # A neighbour of a depth-d state has depth d - 1, d or d + 1.
+        recent = grow.keys[-2:]
+        keys: List[np.ndarray] = []
+        parents: List[np.ndarray] = []
+        moves: List[np.ndarray] = []
+        states: List[np.ndarray] = []
+        found = 0
+
+        for lo in range(0, len(frontier), _CHUNK):
+            cubes = unpack_rows(frontier[lo : lo + _CHUNK])
+            allowed = _ALLOWED[last[lo : lo + _CHUNK]]
+            for m in range(NO_MOVE):
+                rows = np.flatnonzero(allowed[:, m])
+                children = cubes[rows][:, MOVE_PERMS[m]]
+                child_keys = _keys(children)
+                new = np.ones(len(rows), dtype=bool)
+                for layer in recent:
+                    new &= ~_member(child_keys, layer)
+                keys.append(child_keys[new])
+                parents.append((rows[new] + lo).astype(np.uint32))
+                moves.append(np.full(int(new.sum()), m, dtype=np.uint8))
+                states.append(pack_rows(children[new]))
+                found += len(keys[-1])
+            self.nodes_expanded += len(cubes)
+            if found > cap:
+                raise _MemoryCap
+
+        # Sorted, and one copy of each state (with its first parent).
+        layer, first = np.unique(np.concatenate(keys), return_index=True)
+        grow.keys.append(layer)
+        grow.parents.append(np.concatenate(parents)[first])
+        grow.moves.append(np.concatenate(moves)[first])
+        grow.frontier = np.concatenate(states)[first]
+
+        # The shallowest meeting point on the other side is the shortest.
+        for known in other.keys:
+            hit = _member(layer, known)
+            if hit.any():
+                return layer[int(np.argmax(hit))]
+        return None
+
+    def _fallback(self, start: CubeState) -> List[str]:
+        self.used_fallback = True
+        heuristic = self.heuristic
+        if heuristic is None:
+            from ..heuristics.combined import korf_heuristic
+
+            heuristic = self.heuristic = korf_heuristic().h
+        solver = IDAStarSolver(heuristic=heuristic)
+        stats = self.stats
+        solver.stats = SearchStats(stats.detailed, stats.on_iteration, stats.on_bound)
+        try:
+            return solver.solve(start)
+        finally:
+            stats.merge(solver.stats)
@@ -3,88 +3,230 @@ Iterative Deepening A* (IDA*) solver.
 """
 
 from __future__ import annotations
-from typing import Callable, List, Optional, Dict
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple
 from .base_solver import BaseSolver
+from .search_stats import Iteration
+from .transposition import TranspositionTable
 from ..cube.cube_state import CubeState
-from ..cube.move_generator import MOVE_NAMES, apply_move
-from ..utils.move_pruning import is_redundant
+from ..cube.move_generator import FACELET_PERMS
+from ..cube.packed_state import PackedCubeState, facelets_solved
+from ..utils.move_pruning import ALLOWED_AFTER
 
 
 Heuristic = Callable[[CubeState], int]
 
 
+def _step(leave: Optional[str], enter: Optional[str]) -> Callable[[bytearray], tuple]:
+    """Gather that undoes move `leave`, then applies move `enter`."""
+    undo = list(range(54))
+    if leave is not None:
+        for i, j in enumerate(FACELET_PERMS[leave]):
+            undo[j] = i
+    enter_perm = FACELET_PERMS[enter] if enter is not None else range(54)
+    return itemgetter(*(undo[j] for j in enter_perm))
+
+
+# Last move (None at the root) -> one gather per child in ALLOWED_AFTER
+# order, each leaving the previous child for the next, plus a final one
+# that undoes the last child. Walking a node's children therefore costs
+# one in-place gather per child rather than an apply and an undo.
+_STEPS: Dict[Optional[str], Tuple[Callable[[bytearray], tuple], ...]] = {
+    last: tuple(_step(a, b) for a, b in zip((None,) + moves, moves + (None,)))
+    for last, moves in ALLOWED_AFTER.items()
+}
+
+
+class _FaceletView:
+    """The search buffer as the heuristic sees it (read-only).
+
+    Only valid during the heuristic call: the next move changes it.
+    """
+
+    __slots__ = ("_buf",)
+
+    def __init__(self, buf: bytearray):
+        self._buf = buf
+
+    @property
+    def data(self) -> bytes:
+        return bytes(self._buf)
+
+    def to_string(self) -> str:
+        return self._buf.decode("ascii")
+
+    def is_solved(self) -> bool:
+        return facelets_solved(self._buf)
+
+
 class IDAStarSolver(BaseSolver):
-    def __init__(self, heuristic: Heuristic, max_depth: int = 40):
+    def __init__(
+        self,
+        heuristic: Heuristic,
+        max_depth: int = 40,
+        tt_bytes: int = 16 << 20,
+    ):
+        """
+        heuristic : lower bound on the moves left. Below the root it gets
+                    a read-only view of the search buffer offering
+                    `to_string()`, `data` and `is_solved()`, valid only
+                    during the call.
+        tt_bytes : memory budget of the transposition table.
+        """
         self.heuristic = heuristic
         self.max_depth = max_depth
 
         # For instrumentation (optional)
         self.nodes_expanded: int = 0
 
-        # Transposition table: state_string -> best g so far
-        self.transposition: Dict[str, int] = {}
+        # Transposition table: state hash -> best g so far this iteration
+        self.transposition = TranspositionTable(tt_bytes)
 
     def solve(self, start: CubeState) -> List[str]:
+        self.stats.reset()
         if start.is_solved():
             self.nodes_expanded = 0
             self.transposition.clear()
             return []
 
         bound = self.heuristic(start)
-        path: List[str] = []
+        root = PackedCubeState.from_cube_state(start)
 
         while bound <= self.max_depth:
-            self.nodes_expanded = 0
-            self.transposition.clear()
-
-            t = self._search(start.copy(), path, 0, bound, None)
+            t = self.search_subtree(root, [], bound)
             if isinstance(t, list):  # found solution
                 return t
             if t == float("inf"):
                 break
+            self.stats.new_bound(bound, int(t))
             bound = int(t)
 
         raise RuntimeError("IDA* failed to find solution within depth bound")
 
+    def search_subtree(
+        self, node: PackedCubeState, prefix: List[str], bound: int
+    ) -> int | List[str]:
+        """One bounded iteration below `node`, reached from the root by `prefix`.
+
+        Returns the full solution path, or the smallest f that exceeded
+        `bound` (inf if the subtree is exhausted). Recorded as one
+        iteration of `stats`.
+        """
+        tt = self.transposition
+        tt.clear()
+        hits = tt.hits
+        it = self.stats.start_iteration(bound)
+        try:
+            return self._search(node, prefix, bound, it)
+        finally:
+            it.tt_hits += tt.hits - hits
+            self.nodes_expanded = it.nodes
+            self.stats.end_iteration()
+
     def _search(
-        self,
-        node: CubeState,
-        path: List[str],
-        g: int,
-        bound: int,
-        last_move: Optional[str],
+        self, root: PackedCubeState, prefix: List[str], bound: int, it: Iteration
     ) -> int | List[str]:
-        # Transposition table check
-        key = node.to_string()
-        best_g = self.transposition.get(key)
-        if best_g is not None and g >= best_g:
-            # We've already reached this state cheaper or equal -> prune
-            return float("inf")
-        # Record best g for this state
-        self.transposition[key] = g
-
-        self.nodes_expanded += 1
-
-        f = g + self.heuristic(node)
+        """Iterative depth-first search over one mutable facelet buffer.
+
+        `buf` holds the state at depth `g`. `options[d]` are the canonical
+        successor moves at depth d (see `move_pruning`), `steps[d]` the
+        in-place gathers that walk `buf` through them (see `_STEPS`),
+        `cursor[d]` the index of the next one and `mins[d]` the smallest
+        over-bound f among its children so far. Nothing is allocated per
+        node: moves are applied to `buf` and undone with their inverse
+        permutation, and the path lives in a buffer indexed by depth, so
+        only a solution is copied out.
+        """
+        heuristic = self.heuristic
+        check_and_store = self.transposition.check_and_store
+        inf = float("inf")
+
+        stats = self.stats
+        track = stats.tracking
+        per_depth = stats.nodes_per_depth
+        h_hist = stats.h_histogram
+        done = stats.nodes - it.nodes
+
+        size = max(self.max_depth, len(prefix)) + 1
+        path: List[Optional[str]] = [None] * size
+        options: List[Tuple[str, ...]] = [()] * size
+        steps: List[Tuple[Callable[[bytearray], tuple], ...]] = [()] * size
+        cursor = [0] * size
+        mins = [inf] * size
+
+        top = len(prefix)
+        path[:top] = prefix
+
+        # Already reached this iteration at equal or lower cost -> prune
+        if check_and_store(hash(root), top):
+            it.tt_prunes += 1
+            return inf
+        it.nodes += 1
+        h = heuristic(root)
+        if track:
+            per_depth[top] += 1
+            h_hist[h] += 1
+        f = top + h
         if f > bound:
+            it.bound_prunes += 1
             return f
-        if node.is_solved():
-            return list(path)
-
-        min_over = float("inf")
-
-        for move in MOVE_NAMES:
-            if last_move is not None and is_redundant(last_move, move):
-                continue
-
-            new_node = node.copy()
-            apply_move(new_node, move)
-            path.append(move)
-            t = self._search(new_node, path, g + 1, bound, move)
-            if isinstance(t, list):
-                return t
-            if t < min_over:
-                min_over = t
-            path.pop()
-
-        return min_over
+        if root.is_solved():
+            return list(prefix)
+
+        buf = bytearray(root.data)
+        view = _FaceletView(buf)
+        g = top
+        last = prefix[-1] if prefix else None
+        options[g] = ALLOWED_AFTER[last]
+        steps[g] = _STEPS[last]
+        expanded = tt_prunes = bound_prunes = 0
+        # `expanded` value at which stats.report fires next.
+        report_at = stats.next_report - done - it.nodes if stats.on_nodes else inf
+        try:
+            while True:
+                c = cursor[g]
+                moves = options[g]
+                # Leave the previous child (if any) and enter the next one,
+                # or, past the last child, return `buf` to this node.
+                buf[:] = steps[g][c](buf)
+                if c == len(moves):
+                    t = mins[g]
+                    if g == top:
+                        return t
+                    g -= 1
+                    if t < mins[g]:
+                        mins[g] = t
+                    continue
+                cursor[g] = c + 1
+
+                if check_and_store(hash(bytes(buf)), g + 1):
+                    tt_prunes += 1
+                    continue
+                expanded += 1
+                h = heuristic(view)
+                if track:
+                    per_depth[g + 1] += 1
+                    h_hist[h] += 1
+                    if expanded >= report_at:
+                        stats.report(done + it.nodes + expanded)
+                        report_at = stats.next_report - done - it.nodes
+                f = g + 1 + h
+                if f > bound:
+                    bound_prunes += 1
+                    if f < mins[g]:
+                        mins[g] = f
+                    continue
+                move = moves[c]
+                path[g] = move
+                if facelets_solved(buf):
+                    return path[: g + 1]
+
+                g += 1
+                options[g] = ALLOWED_AFTER[move]
+                steps[g] = _STEPS[move]
+                cursor[g] = 0
+                mins[g] = inf
+        finally:
+            it.nodes += expanded
+            it.tt_prunes += tt_prunes
+            it.bound_prunes += bound_prunes
@@ -5,9 +5,10 @@ Baseline Iterative Deepening Depth-First Search solver.
 from __future__ import annotations
 from typing import List, Optional
 from .base_solver import BaseSolver
+from .search_stats import Iteration
 from ..cube.cube_state import CubeState
-from ..cube.move_generator import MOVE_NAMES, apply_move
-from ..utils.move_pruning import is_redundant
+from ..cube.packed_state import PackedCubeState
+from ..utils.move_pruning import ALLOWED_AFTER
 
 
 class IDDFSSolver(BaseSolver):
@@ -15,11 +16,19 @@ class IDDFSSolver(BaseSolver):
         self.max_depth = max_depth
 
     def solve(self, start: CubeState) -> List[str]:
+        stats = self.stats
+        stats.reset()
         if start.is_solved():
             return []
 
         for depth_limit in range(1, self.max_depth + 1):
-            result = self._dfs(start, depth_limit)
+            if depth_limit > 1:
+                stats.new_bound(depth_limit - 1, depth_limit)
+            it = stats.start_iteration(depth_limit)
+            try:
+                result = self._dfs(start, depth_limit, it)
+            finally:
+                stats.end_iteration()
             if result is not None:
                 return result
         raise RuntimeError("No solution found within depth limit")
@@ -28,23 +37,39 @@ class IDDFSSolver(BaseSolver):
         self,
         start: CubeState,
         depth_limit: int,
+        it: Iteration,
     ) -> Optional[List[str]]:
-        stack: List[tuple[CubeState, List[str]]] = [(start.copy(), [])]
-
-        while stack:
-            state, path = stack.pop()
-            if state.is_solved():
-                return path
-            if len(path) >= depth_limit:
-                continue
-
-            prev = path[-1] if path else None
-            for move in MOVE_NAMES:
-                if prev is not None and is_redundant(prev, move):
+        stack: List[tuple[PackedCubeState, List[str]]] = [
+            (PackedCubeState.from_cube_state(start), [])
+        ]
+        stats = self.stats
+        track = stats.tracking
+        per_depth = stats.nodes_per_depth
+        done = stats.nodes
+        report_at = stats.next_report - done if stats.on_nodes else float("inf")
+        # Counted per expanded node (root + its children), not per pop.
+        nodes = 1
+        if track:
+            per_depth[0] += 1
+
+        try:
+            while stack:
+                state, path = stack.pop()
+                if state.is_solved():
+                    return path
+                if len(path) >= depth_limit:
                     continue
 
-                new_state = state.copy()
-                apply_move(new_state, move)
-                stack.append((new_state, path + [move]))
+                moves = ALLOWED_AFTER[path[-1] if path else None]
+                nodes += len(moves)
+                if track:
+                    per_depth[len(path) + 1] += len(moves)
+                    if nodes >= report_at:
+                        stats.report(done + nodes)
+                        report_at = stats.next_report - done
+                for move in moves:
+                    stack.append((state.moved(move), path + [move]))
 
-        return None
+            return None
+        finally:
+            it.nodes += nodes
@@ -0,0 +1,154 @@
+"""
+Parallel IDA*: each bound iteration is split across a process pool.
+
+The tree is expanded breadth-first to `split_depth` (1-3) in the parent,
+and every canonical move prefix of that length becomes one work
+unit: a bounded `IDAStarSolver.search_subtree` run below the prefix
+state. Units are dispatched one at a time to the pool, the smallest
+over-bound f of all units becomes the next bound, and as soon as any
+unit returns a solution the pool is terminated, cancelling the rest.
+
+Solutions shorter than `split_depth` are found by the breadth-first
+expansion itself. Because every iteration uses the same bound sequence
+as the serial solver, the reported solution length is the same (optimal
+for an admissible heuristic); which of several equally short solutions
+is returned may differ.
+
+The heuristic is given as a picklable factory (e.g. the `CornerPDB`
+class or a module-level function) and built once per worker process.
+"""
+
+from __future__ import annotations
+import multiprocessing
+from typing import Callable, List, Optional, Tuple
+
+from .ida_star_solver import Heuristic, IDAStarSolver
+from .search_stats import SearchStats
+from ..cube.cube_state import CubeState
+from ..cube.packed_state import PackedCubeState
+from ..utils.move_pruning import ALLOWED_AFTER
+
+
+HeuristicFactory = Callable[[], Heuristic]
+
+
+# Per-process worker state, set by _init_worker.
+_WORKER: Optional[IDAStarSolver] = None
+
+
+def _init_worker(
+    heuristic_factory: HeuristicFactory,
+    max_depth: int,
+    tt_bytes: int,
+    detailed: bool = False,
+) -> None:
+    global _WORKER
+    _WORKER = IDAStarSolver(
+        heuristic=heuristic_factory(), max_depth=max_depth, tt_bytes=tt_bytes
+    )
+    _WORKER.stats = SearchStats(detailed=detailed)
+
+
+def _run_unit(
+    task: Tuple[str, List[str], int]
+) -> Tuple[int | List[str], SearchStats]:
+    facelets, prefix, bound = task
+    node = PackedCubeState.from_string(facelets)
+    for move in prefix:
+        node = node.moved(move)
+    _WORKER.stats.reset()
+    t = _WORKER.search_subtree(node, prefix, bound)
+    return t, _WORKER.stats
+
+
+class ParallelIDAStarSolver(IDAStarSolver):
+    def __init__(
+        self,
+        heuristic_factory: HeuristicFactory,
+        max_depth: int = 40,
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+        tt_bytes: int = 16 << 20,
+    ):
+        """
+        heuristic_factory : zero-argument callable returning a heuristic.
+        workers           : pool size (None: every core).
+        split_depth       : prefix length of a work unit, 1..3
+                            (18 / 243 / 3,240 units).
+        tt_bytes          : transposition table budget per worker.
+        """
+        if not 1 <= split_depth <= 3:
+            raise ValueError("split_depth must be 1, 2 or 3")
+        super().__init__(
+            heuristic=heuristic_factory(), max_depth=max_depth, tt_bytes=0
+        )
+        self.tt_bytes = tt_bytes
+        self.heuristic_factory = heuristic_factory
+        self.workers = workers
+        self.split_depth = split_depth
+
+        # For instrumentation (optional)
+        self.work_units: int = 0
+
+    def _split(
+        self, root: PackedCubeState
+    ) -> Tuple[Optional[List[str]], List[List[str]]]:
+        """(shallow solution, []) or (None, move prefixes of split_depth)."""
+        frontier: List[Tuple[List[str], PackedCubeState]] = [([], root)]
+        for _ in range(self.split_depth):
+            deeper: List[Tuple[List[str], PackedCubeState]] = []
+            for path, node in frontier:
+                for move in ALLOWED_AFTER[path[-1] if path else None]:
+                    child = node.moved(move)
+                    if child.is_solved():
+                        return path + [move], []
+                    deeper.append((path + [move], child))
+            frontier = deeper
+        return None, [path for path, _ in frontier]
+
+    def solve(self, start: CubeState) -> List[str]:
+        self.nodes_expanded = 0
+        stats = self.stats
+        stats.reset()
+        if start.is_solved():
+            return []
+
+        root = PackedCubeState.from_cube_state(start)
+        shallow, prefixes = self._split(root)
+        if shallow is not None:
+            return shallow
+        self.work_units = len(prefixes)
+
+        facelets = root.to_string()
+        bound = max(self.heuristic(root), self.split_depth)
+        with multiprocessing.Pool(
+            processes=self.workers,
+            initializer=_init_worker,
+            initargs=(
+                self.heuristic_factory, self.max_depth, self.tt_bytes,
+                stats.detailed,
+            ),
+        ) as pool:
+            while bound <= self.max_depth:
+                min_over = float("inf")
+                tasks = [(facelets, prefix, bound) for prefix in prefixes]
+                it = stats.start_iteration(bound)
+                try:
+                    for t, unit in pool.imap_unordered(_run_unit, tasks):
+                        stats.merge(unit, fold=True)
+                        if stats.on_nodes and stats.nodes >= stats.next_report:
+                            stats.report(stats.nodes)
+                        if isinstance(t, list):
+                            # Leaving the block terminates the other workers.
+                            return t
+                        if t < min_over:
+                            min_over = t
+                finally:
+                    self.nodes_expanded = it.nodes
+                    stats.end_iteration()
+                if min_over == float("inf"):
+                    break
+                stats.new_bound(bound, int(min_over))
+                bound = int(min_over)
+
+        raise RuntimeError("IDA* failed to find solution within depth bound")
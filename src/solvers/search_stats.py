@@ -0,0 +1,199 @@
+"""
+Search statistics shared by every solver.
+
+Each `BaseSolver` has a `stats` attribute (a `SearchStats`) that its
+`solve` resets and fills:
+
+- `iterations`: one `Iteration` per bound (IDA*), depth limit (IDDFS),
+  BFS layer (bidirectional), phase-1 depth (two-phase) or phase
+  (Thistlethwaite), with the bound, nodes expanded, wall time,
+  transposition-table hits and the nodes pruned by the table or by the
+  bound;
+- `nodes_per_depth` and `h_histogram`: node counts by depth below the
+  root and by heuristic value;
+- `effective_branching_factor` of the last iteration.
+
+Per-iteration records cost nothing measurable and are always kept. The
+per-node collections (`nodes_per_depth`, `h_histogram`) and the
+`on_nodes` callback run inside the search loop, so they are only active
+when asked for (`detailed=True` or an `on_nodes` callback); otherwise
+the loop pays one local flag test per node. The coordinate solvers
+(two-phase, Thistlethwaite) only record iterations; two-phase checks
+`on_nodes` every 4,096 nodes.
+
+Callbacks feed an external metrics pipeline while a solve runs:
+
+    solver.stats = SearchStats(
+        on_iteration=lambda stats, bound: ...,      # iteration starts
+        on_bound=lambda stats, old, new: ...,       # bound is raised
+        on_nodes=lambda stats, nodes: ..., every=100_000,
+    )
+"""
+
+from __future__ import annotations
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Iteration:
+    bound: int
+    nodes: int = 0
+    time_s: float = 0.0
+    tt_hits: int = 0
+    tt_prunes: int = 0
+    bound_prunes: int = 0
+
+
+class SearchStats:
+    def __init__(
+        self,
+        detailed: bool = False,
+        on_iteration: Optional[Callable[["SearchStats", int], Any]] = None,
+        on_bound: Optional[Callable[["SearchStats", int, int], Any]] = None,
+        on_nodes: Optional[Callable[["SearchStats", int], Any]] = None,
+        every: int = 100_000,
+    ):
+        """
+        detailed     : collect nodes per depth and the heuristic histogram.
+        on_iteration : called with (stats, bound) when an iteration starts.
+        on_bound     : called with (stats, old, new) when the bound is raised.
+        on_nodes     : called with (stats, nodes so far) every `every` nodes.
+        """
+        if every < 1:
+            raise ValueError("every must be positive")
+        self.detailed = detailed
+        self.on_iteration = on_iteration
+        self.on_bound = on_bound
+        self.on_nodes = on_nodes
+        self.every = every
+        self.reset()
+
+    @property
+    def tracking(self) -> bool:
+        """Does the search loop need to do per-node work?"""
+        return self.detailed or self.on_nodes is not None
+
+    def reset(self) -> None:
+        """Forget the last solve (configuration and callbacks are kept)."""
+        self.iterations: List[Iteration] = []
+        self.nodes_per_depth: Dict[int, int] = defaultdict(int)
+        self.h_histogram: Dict[int, int] = defaultdict(int)
+        # Node count at which on_nodes fires next.
+        self.next_report = self.every
+        self._started = 0.0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Callbacks are usually closures; they stay in the parent process.
+        state = dict(self.__dict__)
+        state.update(on_iteration=None, on_bound=None, on_nodes=None)
+        return state
+
+    # ---- recording (called by the solvers) ----
+
+    def start_iteration(self, bound: int) -> Iteration:
+        it = Iteration(bound)
+        self.iterations.append(it)
+        if self.on_iteration is not None:
+            self.on_iteration(self, bound)
+        self._started = time.perf_counter()
+        return it
+
+    def end_iteration(self) -> None:
+        self.iterations[-1].time_s += time.perf_counter() - self._started
+
+    def new_bound(self, old: int, new: int) -> None:
+        if self.on_bound is not None:
+            self.on_bound(self, old, new)
+
+    def report(self, nodes: int) -> None:
+        """Fire on_nodes for the `nodes` expanded so far and schedule the next."""
+        while self.next_report <= nodes:
+            self.next_report += self.every
+        if self.on_nodes is not None:
+            self.on_nodes(self, nodes)
+
+    def merge(self, other: "SearchStats", fold: bool = False) -> None:
+        """Add the counts of another solver's stats to these.
+
+        With `fold` the other's iterations are added into the current
+        iteration (a parallel work unit of the same bound); otherwise they
+        are appended after it (e.g. a fallback solver).
+        """
+        if fold:
+            it = self.iterations[-1]
+            for o in other.iterations:
+                it.nodes += o.nodes
+                it.tt_hits += o.tt_hits
+                it.tt_prunes += o.tt_prunes
+                it.bound_prunes += o.bound_prunes
+        else:
+            self.iterations.extend(other.iterations)
+        for d, n in other.nodes_per_depth.items():
+            self.nodes_per_depth[d] += n
+        for h, n in other.h_histogram.items():
+            self.h_histogram[h] += n
+
+    # ---- summaries ----
+
+    @property
+    def nodes(self) -> int:
+        return sum(it.nodes for it in self.iterations)
+
+    @property
+    def time_s(self) -> float:
+        return sum(it.time_s for it in self.iterations)
+
+    @property
+    def tt_hits(self) -> int:
+        return sum(it.tt_hits for it in self.iterations)
+
+    @property
+    def tt_prunes(self) -> int:
+        return sum(it.tt_prunes for it in self.iterations)
+
+    @property
+    def bound_prunes(self) -> int:
+        return sum(it.bound_prunes for it in self.iterations)
+
+    @property
+    def effective_branching_factor(self) -> Optional[float]:
+        """b such that b + b^2 + ... + b^d = N for the last iteration.
+
+        N is its node count and d its bound; None when undefined.
+        """
+        if not self.iterations:
+            return None
+        last = self.iterations[-1]
+        d, n = last.bound, last.nodes
+        if d < 1 or n < 1:
+            return None
+
+        def total(b: float) -> float:
+            return d * b if b == 1 else b * (b**d - 1) / (b - 1)
+
+        # b^d <= N bounds the root from above.
+        lo, hi = 0.0, max(1.0, n ** (1 / d))
+        for _ in range(100):
+            mid = (lo + hi) / 2
+            if total(mid) < n:
+                lo = mid
+            else:
+                hi = mid
+        return (lo + hi) / 2
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly summary."""
+        return {
+            "nodes": self.nodes,
+            "time_s": self.time_s,
+            "tt_hits": self.tt_hits,
+            "tt_prunes": self.tt_prunes,
+            "bound_prunes": self.bound_prunes,
+            "effective_branching_factor": self.effective_branching_factor,
+            "iterations": [asdict(it) for it in self.iterations],
+            "nodes_per_depth": dict(sorted(self.nodes_per_depth.items())),
+            "h_histogram": dict(sorted(self.h_histogram.items())),
+        }
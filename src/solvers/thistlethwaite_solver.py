@@ -0,0 +1,241 @@
+"""
+Thistlethwaite's four-phase solver.
+
+The cube is walked down the subgroup chain
+
+    G0 = <U, D, R, L, F, B>
+    G1 = <U, D, R, L, F2, B2>      edges oriented
+    G2 = <U, D, R2, L2, F2, B2>    + corners oriented, E-slice edges in E
+    G3 = <U2, D2, R2, L2, F2, B2>  + corners in their H-coset, M edges in M
+    G4 = {solved}
+
+Each phase is a short IDA* over integer coordinates, pruned by exact
+distance tables of small coordinate products (2,048 / 2,187 + 495 /
+207,900 / 3 x 2,304 + 13,824 entries). Together with the coordinate move
+tables they are built in about a tenth of a second on a cold start; the
+distance tables are never written to disk, so there is nothing to ship
+or load. The
+first and third phases use exact distances and walk straight down;
+the second and fourth combine projections and typically search a few
+thousand nodes. Each phase is solved optimally, so a solution is never
+longer than 7 + 10 + 13 + 15 = 45 moves.
+
+The G2 -> G3 phase needs one non-standard coordinate. Square moves only
+permute corners inside the group H (order 96) they generate, so G3 is
+reached when the corner permutation lies in H. `CornerSquareCoset`
+numbers the 420 right cosets H*p of S8, which together with the
+positions of the M-slice edges identifies the coset of G3.
+"""
+
+from __future__ import annotations
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .base_solver import BaseSolver
+from .search_stats import Iteration
+from ..cube.coordinates import (
+    CORNER_ORIENT,
+    EDGE_ORIENT,
+    MOVE_INDEX,
+    PHASE2_MOVES,
+    SQUARE_MOVES,
+    UD_SLICE,
+    Coordinate,
+    CornerSquareCoset,
+    EdgeCombination,
+    SliceEdgePermutation,
+    SquareCornerPermutation,
+)
+from ..cube.cube_state import CubeState
+from ..cube.cubie import CubieCube, MOVE_CUBES
+from ..cube.move_generator import MOVE_NAMES
+from ..heuristics.coordinate_bfs import (
+    BYTE_UNKNOWN,
+    CoordinateProduct,
+    bfs_distances,
+)
+from ..utils.move_pruning import CANONICAL_NEXT, MOVE_FACE, START
+from ..utils.validator import validate_solution
+
+
+G1_MOVES: Tuple[str, ...] = tuple(
+    m for m in MOVE_NAMES if m[0] in "UDRL" or m in ("F2", "B2")
+)
+G2_MOVES: Tuple[str, ...] = PHASE2_MOVES
+G3_MOVES: Tuple[str, ...] = SQUARE_MOVES
+
+# Edges UF, UB, DF, DB (M slice) and UR, UL, DR, DL (S slice).
+M_SLICE_EDGES: Tuple[int, ...] = (1, 3, 5, 7)
+S_SLICE_EDGES: Tuple[int, ...] = (0, 2, 4, 6)
+E_SLICE_EDGES: Tuple[int, ...] = (8, 9, 10, 11)
+
+
+CORNER_SQUARE_COSET = CornerSquareCoset()
+SQUARE_CORNER_PERM = SquareCornerPermutation()
+M_SLICE = EdgeCombination(M_SLICE_EDGES, name="m_slice")
+M_SLICE_PERM = SliceEdgePermutation(M_SLICE_EDGES, "m_slice_perm")
+S_SLICE_PERM = SliceEdgePermutation(S_SLICE_EDGES, "s_slice_perm")
+E_SLICE_PERM = SliceEdgePermutation(E_SLICE_EDGES, "e_slice_perm")
+
+
+class _Phase:
+    """IDA* from one subgroup to the next over small coordinate products.
+
+    `heuristics` lists groups of coordinate positions that together
+    cover every coordinate of the phase. A node is the product index of
+    each group; a group's move table advances it and its distance table
+    is a lower bound on the moves left in the phase (the largest one
+    prunes). The phase is done when every group is solved.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        coords: Sequence[Coordinate],
+        moves: Sequence[str],
+        heuristics: Sequence[Sequence[int]],
+    ):
+        self.name = name
+        self.moves = tuple(moves)
+        self.spaces = [
+            CoordinateProduct([coords[i] for i in group], self.moves)
+            for group in heuristics
+        ]
+        if {i for group in heuristics for i in group} != set(range(len(coords))):
+            raise ValueError("heuristics must cover every coordinate")
+        # Canonical-sequence automaton state -> (move number, face).
+        phase_move = {MOVE_INDEX[m]: j for j, m in enumerate(self.moves)}
+        self.after = [
+            [(phase_move[i], MOVE_FACE[i]) for i in nxt if i in phase_move]
+            for nxt in CANONICAL_NEXT
+        ]
+        self.goal: List[int] = []
+        self._groups: List[Tuple[memoryview, bytes]] = []
+
+    def build(self) -> None:
+        """Move and distance tables of every group, built in milliseconds.
+
+        The largest group product has a few hundred thousand entries, so
+        nothing is stored on disk.
+        """
+        if self._groups:
+            return
+        n = len(self.moves)
+        for space in self.spaces:
+            # Mixed-radix product of the coordinates' move tables.
+            table = np.zeros((1, n), dtype=np.int32)
+            for c in space.coords:
+                cols = np.asarray(c.move_table())[:, [c.column(m) for m in self.moves]]
+                table = (table[:, None, :] * c.size + cols[None, :, :]).reshape(-1, n)
+            dist = bytes(bfs_distances(space, unknown=BYTE_UNKNOWN))
+            self._groups.append((memoryview(table.ravel()), dist))
+            self.goal.append(space.solved)
+
+    def values(self, cube: CubieCube) -> List[int]:
+        values = []
+        for space in self.spaces:
+            index = 0
+            for c in space.coords:
+                index = index * c.size + c.from_cubie(cube)
+            values.append(index)
+        return values
+
+    def lower_bound(self, values: Sequence[int]) -> int:
+        self.build()
+        return max(dist[v] for (_, dist), v in zip(self._groups, values))
+
+    def solve(self, cube: CubieCube, it: Iteration) -> List[str]:
+        """Shortest move sequence taking `cube` into the next subgroup."""
+        values = self.values(cube)
+        path: List[int] = []
+        bound = self.lower_bound(values)
+        while not self._search(values, bound, START, path, it):
+            bound += 1
+            it.bound = bound
+        return [self.moves[j] for j in path]
+
+    def _search(
+        self,
+        values: List[int],
+        togo: int,
+        last_face: int,
+        path: List[int],
+        it: Iteration,
+    ) -> bool:
+        it.nodes += 1
+        if togo == 0:
+            return values == self.goal
+        n = len(self.moves)
+        groups = self._groups
+        for j, face in self.after[last_face]:
+            child = []
+            for (table, dist), v in zip(groups, values):
+                nxt = table[v * n + j]
+                if dist[nxt] >= togo:
+                    break
+                child.append(nxt)
+            else:
+                path.append(j)
+                if self._search(child, togo - 1, face, path, it):
+                    return True
+                path.pop()
+        return False
+
+
+PHASES: Tuple[_Phase, ...] = (
+    _Phase("g0_g1", [EDGE_ORIENT], MOVE_NAMES, [(0,)]),
+    _Phase("g1_g2", [CORNER_ORIENT, UD_SLICE], G1_MOVES, [(0,), (1,)]),
+    _Phase("g2_g3", [CORNER_SQUARE_COSET, M_SLICE], G2_MOVES, [(0, 1)]),
+    _Phase(
+        "g3_solved",
+        [SQUARE_CORNER_PERM, M_SLICE_PERM, S_SLICE_PERM, E_SLICE_PERM],
+        G3_MOVES,
+        [(0, 1), (0, 2), (0, 3), (1, 2, 3)],
+    ),
+)
+
+
+def _merge_same_face(moves: List[str]) -> List[str]:
+    """Join consecutive turns of one face (they can meet at phase borders)."""
+    quarter = {"": 1, "2": 2, "'": 3}
+    suffix = {1: "", 2: "2", 3: "'"}
+    out: List[str] = []
+    for m in moves:
+        if out and out[-1][0] == m[0]:
+            turns = (quarter[out[-1][1:]] + quarter[m[1:]]) % 4
+            out.pop()
+            if turns:
+                out.append(m[0] + suffix[turns])
+        else:
+            out.append(m)
+    return out
+
+
+class ThistlethwaiteSolver(BaseSolver):
+    def __init__(self) -> None:
+        # For instrumentation (optional)
+        self.phase_lengths: List[int] = []
+
+    def solve(self, start: CubeState) -> List[str]:
+        cube = CubieCube.from_facelets(start)
+        self.phase_lengths = []
+        stats = self.stats
+        stats.reset()
+        solution: List[str] = []
+        for phase in PHASES:
+            # One iteration per phase; its bound ends as the phase length.
+            it = stats.start_iteration(phase.lower_bound(phase.values(cube)))
+            try:
+                moves = phase.solve(cube, it)
+            finally:
+                stats.end_iteration()
+            for m in moves:
+                cube = cube.multiply(MOVE_CUBES[m])
+            self.phase_lengths.append(len(moves))
+            solution.extend(moves)
+
+        solution = _merge_same_face(solution)
+        if not validate_solution(start, solution):
+            raise RuntimeError("Thistlethwaite phases did not solve the cube")
+        return solution
@@ -0,0 +1,107 @@
+"""
+Fixed-size transposition table for IDA*.
+
+Entries are (64-bit key, g) pairs in preallocated flat arrays sized from
+a byte budget (10 bytes per entry), so memory stays constant however
+many nodes an iteration expands. Keys are the state's 64-bit hash
+(`PackedCubeState` caches it); a key collision can prune a node wrongly,
+which at 64 bits is negligible for tables of this size.
+
+Slots are grouped in buckets of two:
+
+- slot 0 is depth-preferred: it keeps the entry with the smallest g,
+  whose subtree is the largest and most expensive to re-search;
+- slot 1 is always-replace, so recent transpositions are still caught.
+
+`clear()` is O(1): every entry carries the generation it was written in
+and entries from older generations count as empty.
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Dict
+
+
+KEY_MASK = (1 << 64) - 1
+ENTRY_BYTES = 8 + 1 + 1  # key, g, generation
+
+
+class TranspositionTable:
+    def __init__(self, max_bytes: int = 16 << 20):
+        self.buckets = max(1, max_bytes // (2 * ENTRY_BYTES))
+        self.capacity = 2 * self.buckets
+        self._keys = array("Q", bytes(8 * self.capacity))
+        self._g = bytearray(self.capacity)
+        self._gen = bytearray(self.capacity)
+        self._current = 1
+
+        # For instrumentation (optional)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * ENTRY_BYTES
+
+    def clear(self) -> None:
+        """Forget every entry (counters are kept; see `reset_stats`)."""
+        self._current += 1
+        if self._current > 0xFF:
+            self._gen[:] = bytes(self.capacity)
+            self._current = 1
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "capacity": self.capacity,
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, key: int) -> int | None:
+        """Stored g for `key`, or None."""
+        key &= KEY_MASK
+        i = (key % self.buckets) << 1
+        gen = self._current
+        for j in (i, i + 1):
+            if self._gen[j] == gen and self._keys[j] == key:
+                return self._g[j]
+        return None
+
+    def check_and_store(self, key: int, g: int) -> bool:
+        """True if `key` was already reached with g' <= g (prune it).
+
+        Otherwise records (key, g) and returns False.
+        """
+        key &= KEY_MASK
+        keys, gs, gens = self._keys, self._g, self._gen
+        gen = self._current
+        i = (key % self.buckets) << 1
+
+        for j in (i, i + 1):
+            if gens[j] == gen and keys[j] == key:
+                self.hits += 1
+                if g >= gs[j]:
+                    return True
+                gs[j] = g
+                return False
+        self.misses += 1
+
+        if gens[i] != gen or g <= gs[i]:
+            # New entry takes the depth-preferred slot; its old occupant
+            # is demoted to the always-replace slot.
+            if gens[i] == gen:
+                if gens[i + 1] == gen:
+                    self.evictions += 1
+                keys[i + 1], gs[i + 1], gens[i + 1] = keys[i], gs[i], gen
+            keys[i], gs[i], gens[i] = key, g, gen
+        else:
+            if gens[i + 1] == gen:
+                self.evictions += 1
+            keys[i + 1], gs[i + 1], gens[i + 1] = key, g, gen
+        return False
@@ -0,0 +1,288 @@
+"""
+Kociemba's two-phase solver.
+
+Phase 1 searches from the start cube to the subgroup
+
+    G1 = <U, D, R2, L2, F2, B2>
+
+(all twists and flips solved, UD-slice edges in the slice), using the
+corner orientation, edge orientation and UD-slice coordinates. Phase 2
+solves the G1 cube with G1 moves only, using the corner permutation,
+U/D-edge permutation and slice permutation coordinates.
+
+Both phases are IDA* over integer coordinates: a node is a few ints,
+advanced by move-table lookups and bounded by pruning tables
+(distance tables over pairs of coordinates, built on first use and then
+memory-mapped from `data/pruning_tables/`).
+
+The search does not stop at the first solution: every phase-1 solution
+of increasing length is completed in phase 2 as short as possible, and
+the best total is kept until the time limit is hit or no shorter
+solution can exist under the length bound. The time limit bounds the
+whole solve, both phases included: when it expires the best solution
+so far is returned, or `TimeoutError` is raised if there is none yet.
+"""
+
+from __future__ import annotations
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .base_solver import BaseSolver
+from ..cube.coordinates import (
+    CORNER_ORIENT,
+    CORNER_PERM,
+    EDGE_ORIENT,
+    MOVE_INDEX,
+    PHASE2_MOVES,
+    SLICE_PERM,
+    UD_EDGE_PERM,
+    UD_SLICE,
+)
+from ..cube.cube_state import CubeState
+from ..cube.cubie import CubieCube, MOVE_CUBES
+from ..cube.move_generator import MOVE_NAMES
+from ..heuristics.coordinate_bfs import CoordinateProduct, cached_distances
+
+
+N_MOVES = len(MOVE_NAMES)
+N_MOVES2 = len(PHASE2_MOVES)
+
+# Face index (U R F D L B = 0..5) of every move, in table-column order.
+_FACE = [MOVE_NAMES.index(m[0]) // 3 for m in MOVE_NAMES]
+_FACE2 = [MOVE_NAMES.index(m[0]) // 3 for m in PHASE2_MOVES]
+_IS_PHASE2 = [m in PHASE2_MOVES for m in MOVE_NAMES]
+
+
+def _skip_after(last_face: int, face: int) -> bool:
+    """Same face twice, or an opposite-face pair in non-canonical order."""
+    return face == last_face or face == last_face - 3
+
+
+def _perm_rank(perm: Sequence[int]) -> int:
+    """Lexicographic rank of a permutation of 0..n-1."""
+    n = len(perm)
+    rank = 0
+    for i in range(n - 1):
+        p = perm[i]
+        rank = rank * (n - i) + p - sum(1 for q in perm[:i] if q < p)
+    return rank
+
+
+def _flat(table: np.ndarray, columns: Sequence[int]) -> List[int]:
+    return np.asarray(table)[:, list(columns)].ravel().tolist()
+
+
+class _Tables:
+    """Move and pruning tables as flat Python lists / bytes for fast indexing."""
+
+    _instance: Optional["_Tables"] = None
+
+    def __init__(self) -> None:
+        all_cols = range(N_MOVES)
+        p2_cols = [MOVE_INDEX[m] for m in PHASE2_MOVES]
+
+        self.co_move = _flat(CORNER_ORIENT.move_table(), all_cols)
+        self.eo_move = _flat(EDGE_ORIENT.move_table(), all_cols)
+        self.sl_move = _flat(UD_SLICE.move_table(), all_cols)
+        self.cp_move = _flat(CORNER_PERM.move_table(), p2_cols)
+        self.ud_move = _flat(UD_EDGE_PERM.move_table(), range(N_MOVES2))
+        self.sp_move = _flat(SLICE_PERM.move_table(), range(N_MOVES2))
+
+        self.slice_twist = bytes(np.asarray(cached_distances(
+            "phase1_slice_twist", [UD_SLICE, CORNER_ORIENT]
+        )))
+        self.slice_flip = bytes(np.asarray(cached_distances(
+            "phase1_slice_flip", [UD_SLICE, EDGE_ORIENT]
+        )))
+        self.cperm_sperm = bytes(np.asarray(cached_distances(
+            "phase2_cperm_sperm",
+            CoordinateProduct([CORNER_PERM, SLICE_PERM], PHASE2_MOVES),
+        )))
+        self.eperm_sperm = bytes(np.asarray(cached_distances(
+            "phase2_eperm_sperm",
+            CoordinateProduct([UD_EDGE_PERM, SLICE_PERM], PHASE2_MOVES),
+        )))
+
+    @classmethod
+    def get(cls) -> "_Tables":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+
+class _Timeout(Exception):
+    pass
+
+
+class TwoPhaseSolver(BaseSolver):
+    def __init__(self, max_length: int = 24, time_limit: float = 1.0):
+        """
+        max_length : longest acceptable solution (moves).
+        time_limit : seconds the whole solve may take. The best solution
+                     found by then is returned; with none, `solve`
+                     raises TimeoutError.
+        """
+        self.max_length = max_length
+        self.time_limit = time_limit
+
+        # For instrumentation (optional)
+        self.nodes_expanded: int = 0
+        self.solutions_found: int = 0
+
+        self._t = _Tables.get()
+        self._best: Optional[List[str]] = None
+        self._deadline = 0.0
+
+    def solve(self, start: CubeState) -> List[str]:
+        cube = CubieCube.from_facelets(start)
+        self.nodes_expanded = 0
+        self.solutions_found = 0
+        stats = self.stats
+        stats.reset()
+        if cube.is_solved():
+            return []
+
+        t = self._t
+        self._cube = cube
+        self._best = None
+        self._deadline = time.perf_counter() + self.time_limit
+
+        co = CORNER_ORIENT.from_cubie(cube)
+        eo = EDGE_ORIENT.from_cubie(cube)
+        sl = UD_SLICE.from_cubie(cube)
+        h = max(t.slice_twist[sl * 2187 + co], t.slice_flip[sl * 2048 + eo])
+
+        try:
+            for depth1 in range(h, self.max_length + 1):
+                if self._best is not None and depth1 >= len(self._best):
+                    break
+                if depth1 > h:
+                    stats.new_bound(depth1 - 1, depth1)
+                it = stats.start_iteration(depth1)
+                before = self.nodes_expanded
+                try:
+                    self._phase1(co, eo, sl, h, depth1, -1, [])
+                finally:
+                    it.nodes = self.nodes_expanded - before
+                    stats.end_iteration()
+        except _Timeout:
+            if self._best is None:
+                raise TimeoutError(
+                    f"Two-phase search found no solution within {self.time_limit}s"
+                ) from None
+
+        if self._best is None:
+            raise RuntimeError(
+                "Two-phase search found no solution within max_length"
+            )
+        return self._best
+
+    def _check_time(self) -> None:
+        stats = self.stats
+        if stats.on_nodes and self.nodes_expanded >= stats.next_report:
+            stats.report(self.nodes_expanded)
+        if time.perf_counter() > self._deadline:
+            raise _Timeout
+
+    def _phase1(
+        self,
+        co: int,
+        eo: int,
+        sl: int,
+        h: int,
+        togo: int,
+        last_face: int,
+        path: List[int],
+    ) -> None:
+        self.nodes_expanded += 1
+        if togo == 0:
+            self._start_phase2(path, last_face)
+            return
+        if not self.nodes_expanded & 0xFFF:
+            self._check_time()
+
+        t = self._t
+        base = N_MOVES
+        for m in range(N_MOVES):
+            face = _FACE[m]
+            if _skip_after(last_face, face):
+                continue
+            # Inside G1 already: a G1 move would only rediscover a
+            # shorter phase-1 solution.
+            if h == 0 and _IS_PHASE2[m]:
+                continue
+            nco = t.co_move[co * base + m]
+            neo = t.eo_move[eo * base + m]
+            nsl = t.sl_move[sl * base + m]
+            nh = t.slice_twist[nsl * 2187 + nco]
+            if nh >= togo:
+                continue
+            nh2 = t.slice_flip[nsl * 2048 + neo]
+            if nh2 > nh:
+                nh = nh2
+            if nh >= togo:
+                continue
+            path.append(m)
+            self._phase1(nco, neo, nsl, nh, togo - 1, face, path)
+            path.pop()
+
+    def _start_phase2(self, path: List[int], last_face: int) -> None:
+        self._check_time()
+        cube = self._cube
+        for m in path:
+            cube = cube.multiply(MOVE_CUBES[MOVE_NAMES[m]])
+        cp = _perm_rank(cube.cp)
+        ud = _perm_rank(cube.ep[:8])
+        sp = _perm_rank([e - 8 for e in cube.ep[8:]])
+
+        t = self._t
+        limit = self.max_length
+        if self._best is not None:
+            limit = min(limit, len(self._best) - 1)
+        limit -= len(path)
+
+        h = max(t.cperm_sperm[cp * 24 + sp], t.eperm_sperm[ud * 24 + sp])
+        path2: List[int] = []
+        for depth2 in range(h, limit + 1):
+            if self._phase2(cp, ud, sp, depth2, last_face, path2):
+                self._best = [MOVE_NAMES[m] for m in path] + [
+                    PHASE2_MOVES[m] for m in path2
+                ]
+                self.solutions_found += 1
+                return
+
+    def _phase2(
+        self,
+        cp: int,
+        ud: int,
+        sp: int,
+        togo: int,
+        last_face: int,
+        path: List[int],
+    ) -> bool:
+        self.nodes_expanded += 1
+        if togo == 0:
+            return cp == 0 and ud == 0 and sp == 0
+        if not self.nodes_expanded & 0xFFF:
+            self._check_time()
+
+        t = self._t
+        base = N_MOVES2
+        for m in range(N_MOVES2):
+            face = _FACE2[m]
+            if _skip_after(last_face, face):
+                continue
+            ncp = t.cp_move[cp * base + m]
+            nsp = t.sp_move[sp * base + m]
+            if t.cperm_sperm[ncp * 24 + nsp] >= togo:
+                continue
+            nud = t.ud_move[ud * base + m]
+            if t.eperm_sperm[nud * 24 + nsp] >= togo:
+                continue
+            path.append(m)
+            if self._phase2(ncp, nud, nsp, togo - 1, face, path):
+                return True
+            path.pop()
+        return False
@@ -1,4 +1,13 @@
-from .move_pruning import is_redundant
-from .validator import validate_solution
+from .lazy import attach
 
-__all__ = ["is_redundant", "validate_solution"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "ALLOWED_AFTER": ".move_pruning",
+        "atomic_write": ".atomic",
+        "allowed_moves": ".move_pruning",
+        "is_redundant": ".move_pruning",
+        "SolveProfiler": ".profiling",
+        "validate_solution": ".validator",
+    },
+)
@@ -0,0 +1,46 @@
+"""
+Atomic file writes for the cached tables.
+
+Move tables, pruning tables and pattern databases are written once and
+then memory-mapped by any process (and any user) that needs them, so a
+reader must never see a partial file and the finished file must be as
+readable as one created with `open()`:
+
+    with atomic_write(path, suffix=".npy.tmp") as f:
+        np.save(f, table)
+
+The data goes to a temporary file in the target directory, which is
+renamed over `path` only when the block completes. `tempfile.mkstemp`
+creates files with mode 0600; the temporary file is switched to the
+usual 0666 & ~umask before the rename.
+"""
+
+from __future__ import annotations
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+
+def _default_mode() -> int:
+    """0666 filtered through the process umask, as `open()` would create."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_write(path: str, suffix: str = ".tmp") -> Iterator[BinaryIO]:
+    """Binary file object whose contents replace `path` on success."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            os.fchmod(f.fileno(), _default_mode())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,49 @@
+"""
+Lazy package exports.
+
+The package `__init__`s re-export their public names, but importing
+every submodule up front drags in NumPy, the coordinate tables and (for
+`src.visualization`) matplotlib even for a plain IDDFS / IDA* solve.
+`attach` gives a package a module-level `__getattr__` that imports the
+defining submodule the first time a name is used:
+
+    __getattr__, __dir__, __all__ = attach(
+        __name__, {"IDAStarSolver": ".ida_star_solver", ...}
+    )
+
+`from src.solvers import IDAStarSolver` then only loads
+`src.solvers.ida_star_solver` (and what it imports).
+"""
+
+from __future__ import annotations
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+def attach(
+    package: str,
+    exports: Dict[str, str],
+    submodules: Sequence[str] = (),
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """(__getattr__, __dir__, __all__) for `package`.
+
+    exports    : public name -> relative module that defines it.
+    submodules : subpackages/modules exposed as attributes themselves.
+    """
+    names = list(exports) + list(submodules)
+
+    def __getattr__(name: str) -> Any:
+        if name in exports:
+            value = getattr(import_module(exports[name], package), name)
+        elif name in submodules:
+            value = import_module("." + name, package)
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        # Cache it so the next lookup does not come back here.
+        setattr(import_module(package), name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(import_module(package))) | set(names))
+
+    return __getattr__, __dir__, names
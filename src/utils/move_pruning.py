@@ -1,32 +1,74 @@
 """
 Move pruning helpers.
 
-- Forbid immediate inverses (e.g. R followed by R').
-- Forbid repeating the same face more than once in a row (e.g. R then R2).
+Search only needs *canonical* move sequences:
+
+- never turn the same face twice in a row (R R2 == R', R R' == nothing);
+- of two commuting opposite faces (U/D, R/L, F/B), only allow the pair
+  in one order: U D, never D U.
+
+That is a finite-state automaton whose state is the face of the last
+move (or `START` before any move). `ALLOWED_AFTER` maps the last move
+name (None at the root) to the moves that may follow it, precomputed
+once, so a search loop just iterates the tuple for its node. With
+the opposite-face rule the branching factor drops from 15 to ~13.35
+without losing any state.
 """
 
 from __future__ import annotations
+from typing import Dict, Optional, Tuple
 
+from ..cube.move_generator import MOVE_NAMES
 
-def _face(move: str) -> str:
-    return move[0]
 
+FACES = "URFDLB"
 
-def _inverse(move: str) -> str:
-    if len(move) == 1:
-        return move + "'"
-    if move[1] == "'":
-        return move[0]
-    if move[1] == "2":
-        return move  # self-inverse
-    raise ValueError(f"Invalid move: {move}")
+# Automaton state before any move has been made.
+START = len(FACES)
 
+# Face index (U R F D L B = 0..5) of each move, in MOVE_NAMES order.
+MOVE_FACE: Tuple[int, ...] = tuple(FACES.index(m[0]) for m in MOVE_NAMES)
 
-def is_redundant(prev: str, curr: str) -> bool:
-    """Return True if curr immediately undoes or duplicates prev."""
-    if curr == _inverse(prev):
-        return True
-    if _face(prev) == _face(curr):
-        # Avoid sequences like R then R2 or R then R'
+
+def _follows(last_face: int, face: int) -> bool:
+    """May a turn of `face` follow a turn of `last_face`?"""
+    if last_face == START:
         return True
-    return False
+    # Same face, or an opposite pair in D-U / L-R / B-F order.
+    return face != last_face and face != last_face - 3
+
+
+# Automaton state -> indices (into MOVE_NAMES) of the allowed moves.
+CANONICAL_NEXT: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(i for i, face in enumerate(MOVE_FACE) if _follows(state, face))
+    for state in range(START + 1)
+)
+
+# Last move name (None before any move) -> allowed next move names.
+ALLOWED_AFTER: Dict[Optional[str], Tuple[str, ...]] = {
+    None: tuple(MOVE_NAMES[i] for i in CANONICAL_NEXT[START]),
+    **{
+        m: tuple(MOVE_NAMES[i] for i in CANONICAL_NEXT[MOVE_FACE[j]])
+        for j, m in enumerate(MOVE_NAMES)
+    },
+}
+
+_FORBIDDEN = {
+    (prev, curr)
+    for prev in MOVE_NAMES
+    for curr in MOVE_NAMES
+    if curr not in ALLOWED_AFTER[prev]
+}
+
+
+def allowed_moves(last_move: Optional[str]) -> Tuple[str, ...]:
+    """Moves that may follow `last_move` in a canonical sequence."""
+    return ALLOWED_AFTER[last_move]
+
+
+def is_redundant(prev: str, curr: str) -> bool:
+    """Return True if curr may not follow prev in a canonical sequence.
+
+    Hot loops should iterate `ALLOWED_AFTER[prev]` instead.
+    """
+    return (prev, curr) in _FORBIDDEN
@@ -0,0 +1,224 @@
+"""
+Profiling hooks for solver runs.
+
+`SolveProfiler` is a context manager around any `BaseSolver.solve` call
+(or a whole batch of them):
+
+    with SolveProfiler("profiles/ida", solver, memory=True):
+        solver.solve(cube)
+
+and writes, next to the given prefix:
+
+    ida.prof          cProfile stats (snakeviz, `python -m pstats`,
+                      flameprof, gprof2dot)
+    ida.folded        sampled call stacks in collapsed format, one
+                      "frame;frame;frame count" line per stack
+                      (flamegraph.pl, speedscope, inferno)
+    ida.timeline.csv  node-expansion timeline of the watched solvers:
+                      time, event, bound, nodes (iteration starts and
+                      every `sample_every` nodes, via `solver.stats`)
+    ida.txt           top functions by cumulative time and, with
+                      `memory=True`, the top tracemalloc allocators
+
+The stack sampler is a background thread reading the profiled thread's
+frame every `interval` seconds; it only sees Python frames, and its
+resolution is bounded by the interpreter's switch interval (5 ms by
+default). Timings taken while profiling are inflated by cProfile (and
+much more by tracemalloc) and should not be compared with plain runs.
+"""
+
+from __future__ import annotations
+import cProfile
+import csv
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _StackSampler(threading.Thread):
+    """Counts the collapsed Python stacks of one thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} "
+                    f"({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def finish(self) -> None:
+        self._done.set()
+        self.join()
+
+
+class SolveProfiler:
+    def __init__(
+        self,
+        prefix: str,
+        solver: Any = None,
+        memory: bool = False,
+        top: int = 25,
+        sample_every: int = 10_000,
+        interval: float = 0.001,
+    ):
+        """
+        prefix       : output path without extension; directories are created.
+        solver       : solver whose node expansion is put on the timeline
+                       (more can be added with `watch`).
+        memory       : also trace allocations with tracemalloc.
+        top          : functions / allocation sites listed in the report.
+        sample_every : nodes between timeline samples.
+        interval     : seconds between call-stack samples.
+        """
+        self.prefix = prefix
+        self.memory = memory
+        self.top = top
+        self.sample_every = sample_every
+        self.interval = interval
+
+        self.files: Dict[str, str] = {}
+        self.timeline: List[Tuple[float, str, int, int]] = []
+        self._watched: List[Tuple[Any, Tuple]] = []
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._started_tracing = False
+        self._t0 = 0.0
+        if solver is not None:
+            self.watch(solver)
+
+    def watch(self, solver: Any) -> Any:
+        """Record `solver`'s iterations and node counts; returns the solver.
+
+        Its existing callbacks keep firing (an existing `on_nodes` keeps
+        its own `every`); they are restored by `stop`.
+        """
+        stats = solver.stats
+        saved = (stats.on_iteration, stats.on_nodes, stats.every)
+        on_iteration, on_nodes = saved[0], saved[1]
+
+        def iteration(s, bound: int) -> None:
+            self._sample("iteration", bound, s.nodes)
+            if on_iteration is not None:
+                on_iteration(s, bound)
+
+        def nodes(s, count: int) -> None:
+            self._sample("nodes", s.iterations[-1].bound if s.iterations else 0, count)
+            if on_nodes is not None:
+                on_nodes(s, count)
+
+        stats.on_iteration = iteration
+        stats.on_nodes = nodes
+        if on_nodes is None:
+            stats.every = self.sample_every
+        self._watched.append((stats, saved))
+        return solver
+
+    def _sample(self, event: str, bound: int, nodes: int) -> None:
+        if self._profile is not None:
+            self.timeline.append((time.perf_counter() - self._t0, event, bound, nodes))
+
+    # ---- start / stop ----
+
+    def start(self) -> "SolveProfiler":
+        if self._profile is not None:
+            raise RuntimeError("Profiler already running")
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._started_tracing = True
+        self._sampler = _StackSampler(threading.get_ident(), self.interval)
+        self._sampler.start()
+        self._t0 = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return self
+
+    def stop(self) -> Dict[str, str]:
+        """Stop profiling and write the output files; returns their paths."""
+        if self._profile is None:
+            raise RuntimeError("Profiler is not running")
+        self._profile.disable()
+        elapsed = time.perf_counter() - self._t0
+        self._sampler.finish()
+        snapshot = None
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                ]
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        for stats, (on_iteration, on_nodes, every) in self._watched:
+            stats.on_iteration, stats.on_nodes = on_iteration, on_nodes
+            stats.every = every
+        self._watched = []
+
+        directory = os.path.dirname(self.prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        files = {
+            "prof": self.prefix + ".prof",
+            "folded": self.prefix + ".folded",
+            "timeline": self.prefix + ".timeline.csv",
+            "report": self.prefix + ".txt",
+        }
+
+        self._profile.dump_stats(files["prof"])
+        with open(files["folded"], "w") as f:
+            for stack, count in sorted(self._sampler.counts.items()):
+                f.write(f"{stack} {count}\n")
+        with open(files["timeline"], "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["time_s", "event", "bound", "nodes"])
+            writer.writerows((f"{t:.6f}", e, b, n) for t, e, b, n in self.timeline)
+
+        out = io.StringIO()
+        out.write(f"Profiled for {elapsed:.3f}s\n\n")
+        pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(
+            self.top
+        )
+        if snapshot is not None:
+            out.write(
+                f"Top {self.top} allocation sites (traced peak "
+                f"{peak / 2**20:.1f} MiB):\n"
+            )
+            for stat in snapshot.statistics("lineno")[: self.top]:
+                frame = stat.traceback[0]
+                out.write(
+                    f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  "
+                    f"{frame.filename}:{frame.lineno}\n"
+                )
+        with open(files["report"], "w") as f:
+            f.write(out.getvalue())
+
+        self._profile = None
+        self.files = files
+        return files
+
+    def __enter__(self) -> "SolveProfiler":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -1,4 +1,11 @@
-from .cube_viewer import plot_cube
-from .animator import animate_solution
+from ..utils.lazy import attach
 
-__all__ = ["plot_cube", "animate_solution"]
+# matplotlib is only imported once one of these is used.
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "plot_cube": ".cube_viewer",
+        "animate_solution": ".animator",
+        "animate_cube_3d": ".cube_viewer_3d",
+    },
+)
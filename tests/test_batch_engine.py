@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.cube.batch_engine import (
+    apply_move_batch,
+    apply_moves_batch,
+    array_to_states,
+    edge_mask_batch,
+    expand_batch,
+    is_solved_batch,
+    pack_rows,
+    solved_batch,
+    states_to_array,
+    unique_rows,
+    unpack_rows,
+    validate_solution_batch,
+)
+from src.cube.cube_state import CubeState
+from src.cube.move_generator import MOVE_NAMES
+from src.cube.scrambler import apply_random_scramble
+from src.heuristics.edge_orient_pdb import EdgeOrientPDB
+
+
+def _scrambled(n, length=10):
+    cubes = []
+    for _ in range(n):
+        cube = CubeState.solved()
+        apply_random_scramble(cube, length=length)
+        cubes.append(cube)
+    return cubes
+
+
+def test_batch_moves_match_packed_moves():
+    cubes = _scrambled(5)
+    arr = states_to_array(cubes)
+    for m in MOVE_NAMES:
+        expected = [c.moved(m) for c in array_to_states(arr)]
+        assert array_to_states(apply_move_batch(arr, m)) == expected
+
+    children = expand_batch(arr)
+    assert children.shape == (5, 18, 54)
+    assert np.array_equal(children[:, 4], apply_move_batch(arr, MOVE_NAMES[4]))
+
+
+def test_is_solved_and_validate_solution_batch():
+    arr = solved_batch(3)
+    assert is_solved_batch(arr).all()
+    scrambled = apply_moves_batch(arr, ["R", "U", "F2"])
+    assert not is_solved_batch(scrambled).any()
+
+    solutions = [["F2", "U'", "R'"], ["F2", "U'"], ["X"]]
+    assert validate_solution_batch(scrambled, solutions).tolist() == [True, False, False]
+
+
+def test_pack_rows_roundtrip_and_dedup():
+    arr = states_to_array(_scrambled(4))
+    assert np.array_equal(unpack_rows(pack_rows(arr)), arr)
+    assert len(unique_rows(np.concatenate([arr, arr[:2]]))) == 4
+
+
+def test_edge_mask_batch_matches_pdb_encode():
+    cubes = _scrambled(6)
+    pdb = EdgeOrientPDB()
+    expected = [pdb.encode(c) for c in cubes]
+    assert edge_mask_batch(states_to_array(cubes)).tolist() == expected
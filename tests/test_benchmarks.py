@@ -0,0 +1,77 @@
+import copy
+
+from benchmarks import micro
+from benchmarks.suite import (
+    compare,
+    corpus_checksum,
+    generate_corpus,
+    load_corpus,
+    percentiles,
+    run_suite,
+)
+
+
+def test_corpus_is_fixed_and_reproducible():
+    corpus = load_corpus()
+    # Published corpora are immutable; add a new version instead.
+    assert corpus["version"] == 1
+    assert corpus_checksum(corpus) == "c86621939cfa3c7b"
+    for depth, scrambles in corpus["buckets"].items():
+        assert all(len(s.split()) == int(depth) for s in scrambles)
+    regenerated = generate_corpus(1, corpus["seed"])
+    assert corpus_checksum(regenerated) == corpus_checksum(corpus)
+
+
+def test_percentiles():
+    p = percentiles([4, 1, 3, 2])
+    assert (p["min"], p["p50"], p["max"], p["mean"]) == (1, 2.5, 4, 2.5)
+    assert percentiles([]) is None
+
+
+def test_suite_run_and_compare():
+    report = run_suite(
+        load_corpus(),
+        solvers=["ida/edge_orient", "thistlethwaite"],
+        depths=[4],
+        limit=2,
+        verbose=False,
+    )
+    # Every solver reports whole-solve node counts.
+    assert report["results"]["thistlethwaite"]["4"]["nodes"]["p50"] > 0
+    bucket = report["results"]["ida/edge_orient"]["4"]
+    assert (bucket["n"], bucket["solved"], bucket["errors"]) == (2, 2, [])
+    assert bucket["length"]["max"] <= 4
+    assert bucket["nodes"]["p50"] > 0 and bucket["peak_rss_mb"]["p50"] > 0
+    assert compare(report, report) == []
+
+    worse = copy.deepcopy(report)
+    worse["results"]["ida/edge_orient"]["4"]["nodes"]["p90"] *= 2
+    worse["results"]["ida/edge_orient"]["4"]["solved"] = 1
+    regressions = compare(report, worse)
+    assert len(regressions) == 2
+    assert any("nodes p90" in r for r in regressions)
+
+    older = dict(report, results_version=1)
+    assert "results version differs" in compare(older, report)[0]
+
+
+def test_micro_cases_cover_every_representation():
+    for rep in micro.REPRESENTATIONS.values():
+        names = {c.name for c in micro.state_cases(rep)}
+        assert {"apply_move/cw", "apply_move/half", "hash", "is_solved"} <= names
+        assert "h/korf_heuristic" in names
+    # The immutable cubie cube has no copy(); its case is skipped.
+    cubie = micro.state_cases(micro.REPRESENTATIONS["cubie"])
+    assert "copy" not in {c.name for c in cubie}
+
+    # Moves applied in place do not change the state other cases measure.
+    cases = micro.state_cases(micro.REPRESENTATIONS["cube_state"])
+    micro.measure(cases[0], target_ms=1, repeat=2)
+    scrambled = {c.name: c.namespace["start"].to_string() for c in cases}
+    assert scrambled["apply_move/cw"] != scrambled["hash"] == scrambled["copy"]
+
+    results = micro.run(
+        ["packed"], name_filter="apply_move", target_ms=1, repeat=3, verbose=False
+    )
+    assert [r.case for r in results] == [f"apply_move/{k}" for k in micro.MOVE_TYPES]
+    assert all(r.ns_per_op > 0 and len(r.samples) == 3 for r in results)
@@ -19,3 +19,37 @@ def test_move_changes_state():
     cube = CubeState.solved()
     apply_move(cube, "U")
     assert not cube.is_solved()
+
+
+def test_packed_state_round_trip_and_hashing():
+    from src.cube.packed_state import PackedCubeState
+
+    cube = CubeState.solved()
+    for m in ["R", "U'", "F2", "B"]:
+        apply_move(cube, m)
+
+    packed = PackedCubeState.from_cube_state(cube)
+    assert packed.to_cube_state() == cube
+    assert packed.to_string() == cube.to_string()
+    assert packed.copy() is packed
+    assert not packed.is_solved()
+
+    again = PackedCubeState.solved().moved("R").moved("U'").moved("F2").moved("B")
+    assert again == packed
+    assert len({packed, again}) == 1
+    assert again.moved("B'").moved("F2").moved("U").moved("R'").is_solved()
+
+
+def test_packed_is_solved_accepts_any_face_colours():
+    from src.cube.packed_state import PackedCubeState
+    from src.utils.validator import validate_solution
+
+    # Solved, but with other letters and the whole cube turned.
+    recoloured = CubeState.from_string("".join(c * 9 for c in "WRGYOB"))
+    rotated = CubeState.from_string("".join(f * 9 for f in "FRDBLU"))
+    for cube in (recoloured, rotated):
+        packed = PackedCubeState.from_cube_state(cube)
+        assert cube.is_solved() and packed.is_solved()
+        assert validate_solution(cube, [])
+        assert not packed.moved("R").is_solved()
+        assert validate_solution(cube, ["R", "R'"])
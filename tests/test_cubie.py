@@ -0,0 +1,95 @@
+import pytest
+
+from src.cube.cube_state import CubeState
+from src.cube.cubie import CubieCube, MOVE_CUBES
+from src.cube.move_generator import MOVE_NAMES, apply_move
+from src.cube.scrambler import random_scramble
+
+
+def test_solved_round_trip():
+    cube = CubieCube.from_facelets(CubeState.solved())
+    assert cube.is_solved()
+    assert cube.to_cube_state() == CubeState.solved()
+
+
+def test_cubie_moves_match_facelet_moves():
+    facelets = CubeState.solved()
+    cubies = CubieCube.solved()
+    for m in random_scramble(30) + MOVE_NAMES:
+        apply_move(facelets, m)
+        cubies = cubies.moved(m)
+        assert CubieCube.from_facelets(facelets) == cubies
+        assert cubies.to_string() == facelets.to_string()
+
+
+def test_move_cubes_are_valid_quarter_turns():
+    u = MOVE_CUBES["U"]
+    assert u.cp == (3, 0, 1, 2, 4, 5, 6, 7)
+    assert u.multiply(MOVE_CUBES["U'"]).is_solved()
+    assert MOVE_CUBES["R2"] == MOVE_CUBES["R"].multiply(MOVE_CUBES["R"])
+
+
+def test_invalid_facelets_rejected():
+    s = list(CubeState.solved().to_string())
+    # Swap the two stickers of the UF edge -> a single flipped edge.
+    s[7], s[19] = s[19], s[7]
+    with pytest.raises(ValueError):
+        CubieCube.from_facelets("".join(s))
+
+
+def test_coordinate_move_tables_agree_with_cubie_moves(tmp_path):
+    from src.cube import coordinates
+
+    coords = [
+        coordinates.CornerOrientation(),
+        coordinates.EdgeOrientation(),
+        coordinates.CornerPermutation(),
+        coordinates.UDSlice(),
+        coordinates.EdgeSubset((8, 9, 10, 11)),
+    ]
+    cube = CubieCube.solved()
+    for m in random_scramble(25):
+        for coord in coords:
+            table = coord.move_table(str(tmp_path))
+            expected = coord.from_cubie(cube.moved(m))
+            assert table[coord.from_cubie(cube), coordinates.MOVE_INDEX[m]] == expected
+        cube = cube.moved(m)
+
+    # A second instance memory-maps the cached file instead of rebuilding.
+    reloaded = coordinates.CornerPermutation().move_table(str(tmp_path))
+    assert reloaded.shape == (40320, 18)
+    assert (reloaded == coords[2].build_move_table()).all()
+
+
+def test_cached_tables_are_readable_by_other_users(tmp_path):
+    import os
+    import stat
+
+    import numpy as np
+
+    from src.cube.coordinates import save_atomic
+
+    old = os.umask(0o022)
+    try:
+        path = str(tmp_path / "tables" / "t.npy")
+        save_atomic(path, np.arange(4))
+    finally:
+        os.umask(old)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert (np.load(path) == np.arange(4)).all()
+    assert os.listdir(tmp_path / "tables") == ["t.npy"]
+
+
+def test_corner_square_coset_tables_honour_table_dir(tmp_path):
+    import os
+
+    from src.cube.coordinates import SQUARE_MOVES, CornerSquareCoset
+
+    coset = CornerSquareCoset()
+    table = coset.move_table(str(tmp_path))
+    assert os.listdir(tmp_path) == ["corner_square_coset.npy"]
+    assert table.shape == (coset.size, 18) and table.max() < coset.size
+    # Square moves keep the coset; every other move leaves it.
+    solved = coset.solved
+    for j, m in enumerate(coset.moves):
+        assert (table[solved, j] == solved) == (m in SQUARE_MOVES)
@@ -20,3 +20,218 @@ def test_heuristics_nonzero_on_scrambled():
     apply_move(cube, "U")
     cp = CornerPermPDB()
     assert cp.h(cube) >= 0
+
+
+def test_nibble_packing_round_trip():
+    import numpy as np
+    from src.heuristics.pattern_database import pack_nibbles, unpack_nibbles
+
+    dist = np.array([0, 1, 15, 7, 11], dtype=np.uint8)
+    packed = pack_nibbles(dist)
+    assert packed.size == 3
+    assert (unpack_nibbles(packed, 5) == dist).all()
+
+
+def test_corner_pdb_is_admissible(tmp_path):
+    from src.heuristics.corner_pdb import CornerPDB
+
+    # No table on disk -> orientation/permutation fallback.
+    pdb = CornerPDB(db_path=str(tmp_path / "corner_pdb.pdb"))
+    assert not pdb.loaded
+    cube = CubeState.solved()
+    assert pdb.h(cube) == 0
+    for n, m in enumerate(["R", "U'", "F2"], start=1):
+        apply_move(cube, m)
+        assert 1 <= pdb.h(cube) <= n
+
+
+def test_edge_subset_pdb_and_max_combination(tmp_path):
+    from src.heuristics.combined import MaxHeuristic
+    from src.heuristics.corner_pdb import CornerPDB
+    from src.heuristics.edge_subset_pdb import EdgeSubsetPDB, bfs_distances
+
+    # A 3-edge PDB is small enough to build exhaustively here.
+    small = EdgeSubsetPDB((0, 1, 2), db_path=str(tmp_path / "edges.pdb"))
+    small.set_distances(bfs_distances(small.space()))
+    assert small.loaded
+
+    corners = CornerPDB(db_path=str(tmp_path / "corners.pdb"))
+    h = MaxHeuristic(small, corners)
+
+    cube = CubeState.solved()
+    assert h(cube) == 0
+    for n, m in enumerate(["U", "R2", "F'", "L"], start=1):
+        apply_move(cube, m)
+        assert h(cube) == max(small.h(cube), corners.h(cube))
+        assert 1 <= h(cube) <= n
+
+
+def test_pdb_builder_resumes_from_checkpoint(tmp_path):
+    import numpy as np
+    from src.cube.coordinates import CORNER_ORIENT, UD_SLICE
+    from src.heuristics.coordinate_bfs import CoordinateProduct, bfs_distances
+    from src.heuristics.pdb_builder import PDBBuilder
+
+    space = CoordinateProduct([UD_SLICE, CORNER_ORIENT])
+    prefix = str(tmp_path / "slice_twist")
+    partial = PDBBuilder(space, checkpoint_path=prefix, verbose=False).run(max_depth=4)
+    assert partial.max() == 15 and (partial < 15).any()
+
+    # A new builder picks up after layer 4 instead of starting over.
+    resumed = PDBBuilder(space, checkpoint_path=prefix, verbose=False)
+    assert resumed._resume()[1] == 4
+    assert np.array_equal(resumed.run(), bfs_distances(space))
+    resumed.remove_checkpoint()
+    assert not list(tmp_path.iterdir())
+
+
+def test_nibble_pdb_build(tmp_path):
+    import numpy as np
+    from src.heuristics.coordinate_bfs import bfs_distances
+    from src.heuristics.edge_subset_pdb import EdgeSubsetPDB
+    from src.heuristics.pattern_database import unpack_nibbles
+
+    pdb = EdgeSubsetPDB((0, 4, 8), db_path=str(tmp_path / "edges.pdb"))
+    pdb.build(verbose=False)
+    assert pdb.loaded
+    expected = bfs_distances(pdb.space())
+    assert np.array_equal(unpack_nibbles(pdb.table, pdb.size), expected)
+    assert EdgeSubsetPDB((0, 4, 8), db_path=pdb.db_path).loaded
+
+
+def test_pdb_builder_parallel_matches_serial(tmp_path):
+    import numpy as np
+    from src.cube.coordinates import CORNER_ORIENT, UD_SLICE
+    from src.heuristics.coordinate_bfs import CoordinateProduct, bfs_distances
+    from src.heuristics.pdb_builder import PDBBuilder
+
+    space = CoordinateProduct([UD_SLICE, CORNER_ORIENT])
+    serial = bfs_distances(space)
+    shared = PDBBuilder(space, verbose=False, workers=2).run()
+    assert np.array_equal(shared, serial)
+
+    prefix = str(tmp_path / "slice_twist")
+    checkpointed = PDBBuilder(space, checkpoint_path=prefix, verbose=False, workers=2)
+    assert np.array_equal(checkpointed.run(), serial)
+
+
+def test_pdb_file_round_trip_and_lazy_load(tmp_path):
+    import os
+    import stat
+
+    import numpy as np
+    import pytest
+    from src.heuristics.edge_subset_pdb import EdgeSubsetPDB, bfs_distances
+    from src.heuristics.pdb_format import open_pdb, read_header, verify_pdb
+
+    path = str(tmp_path / "edges.pdb")
+    pdb = EdgeSubsetPDB((0, 1, 2), db_path=path)
+    pdb.set_distances(bfs_distances(pdb.space()))
+    pdb.save(params={"max_depth": 7})
+
+    header = read_header(path)
+    assert (header.entry_width, header.count) == (4, pdb.size)
+    assert header.encoding == "edge_subset:0,1,2"
+    assert header.params == {"max_depth": 7}
+    assert header.offset % 64 == 0 and verify_pdb(path)
+    # Shared with other users and services, like a file made by open().
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+    # Nothing is mapped until the first lookup.
+    reopened = EdgeSubsetPDB((0, 1, 2), db_path=path)
+    assert reopened._table is None
+    cube = CubeState.solved()
+    apply_move(cube, "U")
+    assert reopened.h(cube) == pdb.h(cube) == 1
+    assert isinstance(reopened._table, np.memmap)
+
+    # A table for other edges is refused, a flipped byte is detected.
+    with pytest.raises(ValueError):
+        EdgeSubsetPDB((0, 1, 3), db_path=path).h(cube)
+    with open(path, "r+b") as f:
+        f.seek(header.offset + 5)
+        f.write(b"\xff")
+    assert not verify_pdb(path)
+    with pytest.raises(ValueError):
+        open_pdb(path)
+    with pytest.raises(ValueError):
+        EdgeSubsetPDB((0, 1, 2), db_path=path).h(cube)
+    unchecked = EdgeSubsetPDB((0, 1, 2), db_path=path)
+    unchecked.verify_on_load = False
+    assert unchecked.loaded
+    open_pdb(path, verify=False)
+
+    # Anything past the payload is refused too.
+    with open(path, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError):
+        read_header(path)
+
+
+def test_convert_pickled_edge_orient_pdb(tmp_path):
+    import pickle
+
+    import pytest
+    from src.heuristics.convert_pdb import convert
+
+    old = tmp_path / "edge_orient_pdb.pkl"
+    with open(old, "wb") as f:
+        pickle.dump({0: 0, 0b1111: 1}, f)
+    pdb = convert(str(old))
+    assert pdb.db_path == str(tmp_path / "edge_orient_pdb.pdb")
+    assert pdb.header.params["max_depth"] == 1
+
+    loaded = EdgeOrientPDB(db_path=pdb.db_path)
+    assert loaded.lookup(0b1111) == 1
+    assert loaded.lookup(0b0111) == loaded.unknown
+    assert loaded.h(CubeState.solved()) == 0
+
+    # Keyed by raw masks (before the symmetry reduction): folded onto
+    # the canonical mask 15, which 23 and 105 are symmetric to.
+    with open(old, "wb") as f:
+        pickle.dump({0: 0, 23: 2, 105: 2}, f)
+    assert convert(str(old)).lookup(15) == 2
+
+    for entries in ([(0, 0)], {15: 1}, {0: 0, 15: 1, 23: 2}, {0: 0, 1 << 16: 1}):
+        with open(old, "wb") as f:
+            pickle.dump(entries, f)
+        with pytest.raises(ValueError):
+            convert(str(old))
+
+
+def _h_in_worker(args):
+    pdb, cube = args
+    return pdb.h(cube), pdb.table.flags.writeable, pdb.shared.kind
+
+
+def test_pdb_registry_shares_tables_with_workers(tmp_path):
+    import multiprocessing
+    import os
+    import pickle
+    from src.heuristics.edge_subset_pdb import EdgeSubsetPDB, bfs_distances
+    from src.heuristics.pdb_registry import PDBRegistry
+
+    pdb = EdgeSubsetPDB((0, 1, 2, 3), db_path=str(tmp_path / "edges.pdb"))
+    pdb.set_distances(bfs_distances(pdb.space()))
+    on_disk = EdgeOrientPDB()
+    cube = CubeState.solved()
+    for m in ["U", "R2", "F'"]:
+        apply_move(cube, m)
+    expected = [pdb.h(cube), on_disk.h(cube)]
+    assert len(pickle.dumps(pdb)) > pdb.table.nbytes
+
+    with PDBRegistry() as registry:
+        shm_ref, file_ref = registry.publish(pdb, on_disk)
+        assert (shm_ref.kind, file_ref.kind) == ("shm", "file")
+        assert len(pickle.dumps(pdb)) < 1000
+
+        with multiprocessing.Pool(2) as pool:
+            got = pool.map(_h_in_worker, [(pdb, cube), (on_disk, cube)])
+        assert got == [(expected[0], False, "shm"), (expected[1], False, "file")]
+
+    # Segments are gone once the registry closes; the owner keeps working.
+    if os.path.isdir("/dev/shm"):
+        assert not os.path.exists("/dev/shm/" + shm_ref.name)
+    assert pdb.h(cube) == expected[0]
@@ -20,3 +20,34 @@ def test_double_move_self_inverse():
 def test_move_sequence_validation():
     assert is_valid_move_sequence(["U", "R2", "F'", "L"])
     assert not is_valid_move_sequence(["X", "U2"])
+
+
+def test_permutation_engine_matches_reference():
+    from src.cube.move_generator import MOVE_NAMES, _apply_move_reference
+    from src.cube.scrambler import random_scramble
+
+    fast = CubeState.solved()
+    slow = CubeState.solved()
+    for m in random_scramble(40) + MOVE_NAMES:
+        apply_move(fast, m)
+        _apply_move_reference(slow, m)
+        assert fast == slow
+
+
+def test_canonical_sequences_reach_each_state_once():
+    from src.cube.packed_state import PackedCubeState
+    from src.utils.move_pruning import ALLOWED_AFTER
+
+    # Distinct states at distance 1, 2, 3 (HTM): 18, 243, 3240.
+    layer = [(PackedCubeState.solved(), None)]
+    seen = {PackedCubeState.solved()}
+    for expected in (18, 243, 3240):
+        nxt = []
+        for state, last in layer:
+            for m in ALLOWED_AFTER[last]:
+                child = state.moved(m)
+                nxt.append((child, m))
+                seen.add(child)
+        assert len(nxt) == expected
+        layer = nxt
+    assert len(seen) == 1 + 18 + 243 + 3240
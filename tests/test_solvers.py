@@ -1,3 +1,5 @@
+import pytest
+
 from src.cube.cube_state import CubeState
 from src.cube.scrambler import apply_random_scramble
 from src.solvers.iddfs_solver import IDDFSSolver
@@ -26,3 +28,371 @@ def test_ida_star_on_random_small_scramble():
     solver = IDAStarSolver(heuristic=heuristic.h, max_depth=10)
     solution = solver.solve(cube)
     assert validate_solution(cube, solution)
+
+
+def test_ida_star_with_corner_pdb(tmp_path):
+    from src.heuristics.corner_pdb import CornerPDB
+
+    cube = CubeState.solved()
+    apply_random_scramble(cube, length=5)
+    heuristic = CornerPDB(db_path=str(tmp_path / "corner_pdb.pdb"))
+    solver = IDAStarSolver(heuristic=heuristic.h, max_depth=10)
+    solution = solver.solve(cube)
+    assert len(solution) <= 5
+    assert validate_solution(cube, solution)
+
+
+def test_two_phase_on_random_state():
+    from src.cube.move_generator import apply_move_sequence
+    from src.solvers.two_phase_solver import TwoPhaseSolver
+
+    # Fixed: the time limit now also bounds the search for a first solution.
+    scramble = "D2 R' B U2 L F' D R2 B' U L2 F D' B2 R U' F2 L' D B R' U2 F L2 D' R"
+    cube = CubeState.solved()
+    apply_move_sequence(cube, scramble.split())
+    solver = TwoPhaseSolver(max_length=26, time_limit=1.0)
+    solution = solver.solve(cube)
+    assert len(solution) <= 26
+    assert validate_solution(cube, solution)
+    assert solver.solve(CubeState.solved()) == []
+
+
+def test_two_phase_time_limit_bounds_the_whole_solve():
+    import time
+
+    from src.solvers.two_phase_solver import TwoPhaseSolver
+
+    cube = CubeState.solved()
+    apply_random_scramble(cube, length=30)
+    with pytest.raises(TimeoutError):
+        TwoPhaseSolver(time_limit=0).solve(cube)
+
+    # A tight length bound makes the first solution hard to find.
+    solver = TwoPhaseSolver(max_length=20, time_limit=0.2)
+    started = time.perf_counter()
+    try:
+        assert validate_solution(cube, solver.solve(cube))
+    except TimeoutError:
+        pass
+    assert time.perf_counter() - started < 1.0
+
+
+def test_thistlethwaite_on_random_states():
+    from src.solvers.thistlethwaite_solver import ThistlethwaiteSolver
+
+    solver = ThistlethwaiteSolver()
+    for _ in range(3):
+        cube = CubeState.solved()
+        apply_random_scramble(cube, length=30)
+        solution = solver.solve(cube)
+        assert len(solution) <= 45
+        assert len(solver.phase_lengths) == 4
+        assert validate_solution(cube, solution)
+        bounds = [it.bound for it in solver.stats.iterations]
+        assert bounds == solver.phase_lengths
+
+    # Small enough to build on every cold start instead of shipping.
+    from src.solvers.thistlethwaite_solver import PHASES
+
+    assert sum(len(dist) for p in PHASES for _, dist in p._groups) < 250_000
+
+
+def _small_ida_solver():
+    return IDAStarSolver(heuristic=CornerPermPDB().h, max_depth=10)
+
+
+def _slow_iddfs_solver():
+    return IDDFSSolver(max_depth=20)
+
+
+def test_solve_many_in_input_order():
+    from src.solvers.batch import solve_many
+
+    cubes = []
+    for length in (1, 3, 4, 2):
+        cube = CubeState.solved()
+        apply_random_scramble(cube, length=length)
+        cubes.append(cube)
+
+    results = solve_many(cubes, _small_ida_solver, workers=2)
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    for cube, r in zip(cubes, results):
+        assert r.ok and r.nodes_expanded is not None
+        assert validate_solution(cube, r.solution)
+        assert r.nodes_expanded == r.stats["nodes"]
+        assert r.nodes_expanded == sum(it["nodes"] for it in r.stats["iterations"])
+
+    # Solvers without an own node counter report whole-solve counts too.
+    from src.solvers.thistlethwaite_solver import ThistlethwaiteSolver
+
+    [r] = solve_many(cubes[2:3], ThistlethwaiteSolver, workers=1)
+    assert r.ok and len(r.stats["iterations"]) == 4
+    # IDA* expands a node per move at least; merging at phase borders
+    # only shortens.
+    assert r.nodes_expanded >= len(r.solution)
+
+
+def test_solve_many_timeout_does_not_stall_batch():
+    from src.cube.move_generator import apply_move_sequence
+    from src.solvers.batch import solve_many
+
+    hard = CubeState.solved()
+    apply_move_sequence(hard, ["R", "U", "F", "L", "D", "B", "R2", "U'", "F2", "L'"])
+    easy = CubeState.solved()
+    apply_random_scramble(easy, length=1)
+
+    results = solve_many([hard, easy], _slow_iddfs_solver, workers=1, timeout=0.2)
+    assert not results[0].ok and "timed out" in results[0].error
+    assert results[0].elapsed < 2.0
+    assert results[1].ok and validate_solution(easy, results[1].solution)
+
+
+class _SwallowingSolver(IDDFSSolver):
+    """Catches every Exception while it searches, as careless code might."""
+
+    def solve(self, start):
+        while True:
+            try:
+                return super().solve(start)
+            except Exception:
+                pass
+
+
+def _swallowing_solver():
+    return _SwallowingSolver(max_depth=20)
+
+
+def _broken_factory():
+    raise ValueError("no tables")
+
+
+def test_solve_many_timeout_survives_except_exception():
+    from src.cube.move_generator import apply_move_sequence
+    from src.solvers.batch import solve_many
+
+    hard = CubeState.solved()
+    apply_move_sequence(hard, ["R", "U", "F", "L", "D", "B", "R2", "U'", "F2", "L'"])
+    [r] = solve_many([hard], _swallowing_solver, workers=1, timeout=0.2)
+    assert not r.ok and "timed out" in r.error
+
+
+def test_solve_many_reports_factory_errors_per_item():
+    from src.solvers.batch import solve_many
+
+    cubes = [CubeState.solved()] * 3
+    for workers in (1, 2):
+        results = solve_many(cubes, _broken_factory, workers=workers)
+        assert [r.index for r in results] == [0, 1, 2]
+        for r in results:
+            assert not r.ok and "ValueError: no tables" in r.error
+
+
+def _corner_perm_heuristic():
+    return CornerPermPDB().h
+
+
+def test_parallel_ida_star_matches_serial_length():
+    from src.solvers.parallel_ida_star_solver import ParallelIDAStarSolver
+
+    for length in (1, 5):
+        cube = CubeState.solved()
+        apply_random_scramble(cube, length=length)
+        serial = IDAStarSolver(heuristic=_corner_perm_heuristic(), max_depth=10)
+        parallel = ParallelIDAStarSolver(
+            _corner_perm_heuristic, max_depth=10, workers=2
+        )
+        solution = parallel.solve(cube)
+        assert validate_solution(cube, solution)
+        assert len(solution) == len(serial.solve(cube))
+        if length > parallel.split_depth:
+            last = parallel.stats.iterations[-1]
+            assert last.nodes == parallel.nodes_expanded > 0
+
+
+def test_transposition_table_bounded():
+    from src.solvers.transposition import TranspositionTable
+
+    tt = TranspositionTable(max_bytes=200)
+    assert tt.nbytes <= 200
+    assert not tt.check_and_store(7, 3)
+    assert tt.check_and_store(7, 3)  # same g: prune
+    assert not tt.check_and_store(7, 2)  # cheaper: keep searching
+    assert tt.get(7) == 2
+    assert (tt.hits, tt.misses) == (2, 1)
+
+    for key in range(1000):
+        tt.check_and_store(key, 5)
+    assert tt.evictions > 0
+    tt.clear()
+    assert tt.get(7) is None
+
+
+def test_ida_star_with_tiny_transposition_table():
+    cube = CubeState.solved()
+    apply_random_scramble(cube, length=5)
+    heuristic = CornerPermPDB().h
+    big = IDAStarSolver(heuristic=heuristic, max_depth=10).solve(cube)
+    small = IDAStarSolver(heuristic=heuristic, max_depth=10, tt_bytes=100).solve(cube)
+    assert validate_solution(cube, small)
+    assert len(small) == len(big)
+
+
+def test_ida_star_steps_visit_every_child_and_restore_the_node():
+    from src.cube.packed_state import PackedCubeState
+    from src.solvers.ida_star_solver import _STEPS
+    from src.utils.move_pruning import ALLOWED_AFTER
+
+    node = PackedCubeState.solved().moved("R").moved("U'")
+    buf = bytearray(node.data)
+    for last, moves in ALLOWED_AFTER.items():
+        steps = _STEPS[last]
+        assert len(steps) == len(moves) + 1
+        for move, step in zip(moves, steps):
+            buf[:] = step(buf)
+            assert bytes(buf) == node.moved(move).data
+        buf[:] = steps[-1](buf)
+        assert bytes(buf) == node.data
+
+
+def test_bidirectional_matches_ida_star_length():
+    from src.solvers.bidirectional_solver import BidirectionalSolver
+
+    cube = CubeState.solved()
+    apply_random_scramble(cube, length=6)
+    solver = BidirectionalSolver()
+    solution = solver.solve(cube)
+    assert validate_solution(cube, solution)
+    assert not solver.used_fallback
+    ida = IDAStarSolver(heuristic=CornerPermPDB().h, max_depth=10)
+    assert len(solution) == len(ida.solve(cube))
+
+
+def test_bidirectional_searches_recoloured_cubes():
+    from src.solvers.bidirectional_solver import BidirectionalSolver
+
+    scrambled = CubeState.solved()
+    apply_random_scramble(scrambled, length=5)
+    recoloured = CubeState.from_string(
+        scrambled.to_string().translate(str.maketrans("URFDLB", "WRGYOB"))
+    )
+    solver = BidirectionalSolver()
+    solution = solver.solve(recoloured)
+    assert not solver.used_fallback
+    assert validate_solution(recoloured, solution)
+    assert len(solution) == len(solver.solve(scrambled))
+
+
+def test_bidirectional_falls_back_past_memory_cap():
+    from src.solvers.bidirectional_solver import BidirectionalSolver
+
+    cube = CubeState.solved()
+    apply_random_scramble(cube, length=4)
+    solver = BidirectionalSolver(max_states=50, heuristic=CornerPermPDB().h)
+    solution = solver.solve(cube)
+    assert solver.used_fallback
+    assert validate_solution(cube, solution)
+    # BFS layers, then the fallback's IDA* iterations.
+    assert solver.stats.nodes > solver.nodes_expanded
+
+
+def test_solver_imports_skip_numpy_and_matplotlib():
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from src.solvers import IDAStarSolver, IDDFSSolver\n"
+        "import src, src.visualization, src.heuristics\n"
+        "assert 'numpy' not in sys.modules and 'matplotlib' not in sys.modules\n"
+        "assert src.solvers.IDAStarSolver is IDAStarSolver\n"
+        "assert 'MaxHeuristic' in dir(src.heuristics)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def test_search_stats_record_every_iteration():
+    from src.solvers.search_stats import SearchStats
+
+    cube = CubeState.solved()
+    apply_random_scramble(cube, length=5)
+    events = []
+    solver = IDAStarSolver(heuristic=CornerPermPDB().h, max_depth=10)
+    solver.stats = SearchStats(
+        detailed=True,
+        on_iteration=lambda stats, bound: events.append(("start", bound)),
+        on_bound=lambda stats, old, new: events.append(("bound", old, new)),
+        on_nodes=lambda stats, nodes: events.append(("nodes", nodes)),
+        every=100,
+    )
+    solution = solver.solve(cube)
+    stats = solver.stats
+    bounds = [it.bound for it in stats.iterations]
+    assert bounds == sorted(bounds) and bounds[-1] >= len(solution)
+    assert [e[1] for e in events if e[0] == "start"] == bounds
+    assert len([e for e in events if e[0] == "bound"]) == len(bounds) - 1
+    reported = [e[1] for e in events if e[0] == "nodes"]
+    assert len(reported) == stats.nodes // 100 and reported == sorted(reported)
+
+    # Unlike nodes_expanded, the stats cover every iteration.
+    assert stats.iterations[-1].nodes == solver.nodes_expanded
+    assert sum(stats.nodes_per_depth.values()) == stats.nodes
+    assert sum(stats.h_histogram.values()) == stats.nodes
+    assert stats.bound_prunes > 0 and stats.tt_hits >= stats.tt_prunes
+    assert 1 < stats.effective_branching_factor < 18
+    assert stats.as_dict()["nodes"] == stats.nodes
+
+    # Without details nothing is collected per node, the totals match.
+    plain = IDAStarSolver(heuristic=CornerPermPDB().h, max_depth=10)
+    plain.solve(cube)
+    assert plain.stats.nodes == stats.nodes and not plain.stats.h_histogram
+
+
+def test_iddfs_stats_count_nodes_per_depth():
+    from src.solvers.search_stats import SearchStats
+
+    cube = CubeState.solved()
+    for move in ("R", "U"):
+        cube.apply_move(move)
+    solver = IDDFSSolver(max_depth=4)
+    solver.stats = SearchStats(detailed=True)
+    solver.solve(cube)
+    stats = solver.stats
+    assert [it.bound for it in stats.iterations] == [1, 2]
+    # Depth limit 1 visits the root and its 18 children.
+    assert stats.iterations[0].nodes == 19
+    assert stats.nodes_per_depth[0] == 2
+
+
+def test_solve_profiler_writes_profiles(tmp_path):
+    import pstats
+
+    from src.solvers.search_stats import SearchStats
+    from src.utils.profiling import SolveProfiler
+
+    cube = CubeState.solved()
+    apply_random_scramble(cube, length=5)
+    solver = IDAStarSolver(heuristic=CornerPermPDB().h, max_depth=10)
+
+    def on_bound(stats, old, new):
+        pass
+
+    solver.stats = SearchStats(on_bound=on_bound)
+    prefix = str(tmp_path / "out" / "ida")
+    with SolveProfiler(prefix, solver, memory=True, sample_every=50) as prof:
+        solver.solve(cube)
+
+    assert set(prof.files) == {"prof", "folded", "timeline", "report"}
+    functions = {f[2] for f in pstats.Stats(prof.files["prof"]).stats}
+    assert "_search" in functions
+    with open(prof.files["timeline"]) as f:
+        rows = f.read().splitlines()
+    assert rows[0] == "time_s,event,bound,nodes"
+    assert sum(",iteration," in r for r in rows) == len(solver.stats.iterations)
+    with open(prof.files["report"]) as f:
+        assert "allocation sites" in f.read()
+    # Callbacks and sampling rate are back to what they were.
+    stats = solver.stats
+    assert stats.on_bound is on_bound and stats.on_nodes is None
+    assert stats.every == 100_000
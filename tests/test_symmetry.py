@@ -0,0 +1,72 @@
+from src.cube.cube_state import CubeState
+from src.cube.packed_state import PackedCubeState
+from src.cube.scrambler import apply_random_scramble, random_scramble
+from src.cube.symmetry import (
+    INVERSE,
+    SYMMETRIES,
+    SYM_MULT,
+    UD_SYMMETRIES,
+    canonical,
+    conjugate,
+    conjugate_moves,
+)
+from src.heuristics.edge_orient_pdb import EdgeOrientPDB
+from src.utils.validator import validate_solution
+
+
+def _scrambled(length=12):
+    cube = CubeState.solved()
+    apply_random_scramble(cube, length=length)
+    return PackedCubeState.from_cube_state(cube)
+
+
+def test_symmetry_group():
+    assert len(SYMMETRIES) == 48
+    assert sum(s.mirror for s in SYMMETRIES) == 24
+    assert len(UD_SYMMETRIES) == 16
+    solved = PackedCubeState.solved()
+    state = _scrambled()
+    for s in SYMMETRIES:
+        assert conjugate(solved, s) == solved
+        back = SYMMETRIES[INVERSE[s.index]]
+        assert conjugate(conjugate(state, s), back) == state
+        t = SYMMETRIES[(s.index * 7) % 48]
+        st = SYMMETRIES[SYM_MULT[s.index][t.index]]
+        assert conjugate(conjugate(state, s), t) == conjugate(state, st)
+
+
+def test_conjugation_commutes_with_moves():
+    for s in SYMMETRIES:
+        moves = random_scramble(10)
+        state = PackedCubeState.solved()
+        for m in moves:
+            state = state.moved(m)
+        image = PackedCubeState.solved()
+        for m in conjugate_moves(moves, s):
+            image = image.moved(m)
+        assert conjugate(state, s) == image
+
+
+def test_canonical_representative_and_solution_mapping():
+    moves = random_scramble(8)
+    state = PackedCubeState.solved()
+    for m in moves:
+        state = state.moved(m)
+    rep, sym = canonical(state)
+    for s in SYMMETRIES:
+        assert canonical(conjugate(state, s))[0] == rep
+
+    # Solve the representative, map the solution back.
+    inverse = {"": "'", "'": "", "2": "2"}
+    rep_solution = [m[0] + inverse[m[1:]] for m in reversed(conjugate_moves(moves, sym))]
+    solution = conjugate_moves(rep_solution, SYMMETRIES[INVERSE[sym.index]])
+    assert validate_solution(state.to_cube_state(), solution)
+
+
+def test_edge_orient_pdb_key_is_symmetry_invariant():
+    pdb = EdgeOrientPDB()
+    state = _scrambled()
+    key = pdb.canonical_key(state)
+    for s in UD_SYMMETRIES:
+        assert pdb.canonical_key(conjugate(state, s)) == key
+        assert pdb.h(conjugate(state, s)) == pdb.h(state)